@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from .forms import TokenRevokingAdminPasswordChangeForm
 from .models import User
 from django.apps import apps
 
@@ -33,6 +34,7 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('is_active', 'is_staff', 'is_superuser', 'date_joined')
     search_fields = ('email', 'username', 'first_name', 'last_name')
     ordering = ('-date_joined',)
+    change_password_form = TokenRevokingAdminPasswordChangeForm
     
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Additional Info', {
@@ -15,13 +15,13 @@ from django.db import IntegrityError
 import logging
 import re
 
+from core.pagination import keyset_page
+from .dashboard_summary import TOP_MATCHES, dashboard_match_data, get_summary, top_matches_queryset
+
 logger = logging.getLogger(__name__)
 
 # Dynamically load models
 User = get_user_model()
-Resume = apps.get_model('resumes', 'Resume')
-JobApplication = apps.get_model('jobs', 'JobApplication')
-JobMatch = apps.get_model('jobs', 'JobMatch')
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -31,12 +31,7 @@ def profile_api_view(request):
     """
     try:
         user = request.user
-        
-        # Get user resume
-        user_resume = Resume.objects.filter(user=user, is_active=True).first()
-        
-        # Get job applications
-        job_applications = JobApplication.objects.filter(user=user).order_by('-applied_date')[:10]
+        summary = get_summary(user)
         
         # Prepare user data
         user_data = {
@@ -52,36 +47,18 @@ def profile_api_view(request):
         
         # Prepare resume data
         resume_data = None
-        if user_resume:
+        if summary.resume:
             resume_data = {
-                'id': user_resume.id,
-                'original_filename': user_resume.original_filename,
-                'status': user_resume.status,
-                'created_at': user_resume.created_at.isoformat(),
-                'extracted_skills': user_resume.extracted_skills or [],
-                'experience_level': user_resume.experience_level,
-                'analysis_summary': user_resume.analysis_summary,
-                'file_url': user_resume.file.url if user_resume.file else None,
+                key: summary.resume[key]
+                for key in ('id', 'original_filename', 'status', 'created_at', 'extracted_skills',
+                            'experience_level', 'analysis_summary', 'file_url')
             }
         
-        # Prepare applications data
-        applications_data = []
-        for app in job_applications:
-            applications_data.append({
-                'id': app.id,
-                'job_title': app.job.title,
-                'company_name': app.job.company_name,
-                'match_score': app.match_score,
-                'applied_date': app.applied_date.isoformat(),
-                'status': app.status,
-                'job_id': app.job.id,
-            })
-        
         return Response({
             'success': True,
             'user': user_data,
             'resume': resume_data,
-            'job_applications': applications_data,
+            'job_applications': summary.applications,
         })
         
     except Exception as e:
@@ -98,47 +75,52 @@ def dashboard_api_view(request):
     JWT-protected dashboard data API endpoint
     """
     try:
-        user = request.user
-        
-        # Get user resume
-        user_resume = Resume.objects.filter(user=user, is_active=True).first()
+        summary = get_summary(request.user)
         
-        if not user_resume:
+        if not summary.resume:
             return Response({
                 'success': True,
                 'has_resume': False,
                 'message': 'Please upload your resume to access dashboard features.'
             })
         
-        # Get recent job matches
-        job_matches = JobMatch.objects.filter(
-            resume=user_resume,
-            match_score__gte=50
-        ).select_related('job').order_by('-match_score')[:6]
+        # Best job matches, keyset-paginated with ?cursor= (page size 6 by default)
+        try:
+            page_size = int(request.query_params.get('page_size', TOP_MATCHES))
+        except ValueError:
+            page_size = TOP_MATCHES
+        cursor = request.query_params.get('cursor')
+        with_total = request.query_params.get('with_total') == 'true'
         
-        # Prepare job matches data
-        matches_data = []
-        for match in job_matches:
-            matches_data.append({
-                'id': match.job.id,
-                'title': match.job.title,
-                'company': match.job.company_name,
-                'location': match.job.location,
-                'match_score': match.match_score,
-                'description': match.job.description[:200] + '...' if len(match.job.description) > 200 else match.job.description,
-                'published_at': match.job.published_at.isoformat() if match.job.published_at else None,
-            })
+        if cursor or with_total or page_size != TOP_MATCHES:
+            # Pages past the first come from JobMatch itself
+            job_matches = keyset_page(
+                top_matches_queryset(summary.resume['id']),
+                cursor,
+                page_size=page_size,
+                with_total=with_total,
+            )
+            matches_data = [dashboard_match_data(match) for match in job_matches]
+            next_cursor, previous_cursor = job_matches.next_cursor, job_matches.previous_cursor
+            approximate_total = job_matches.total
+        else:
+            matches_data = summary.top_matches
+            next_cursor, previous_cursor = summary.top_matches_next_cursor or None, None
+            approximate_total = None
         
         return Response({
             'success': True,
             'has_resume': True,
             'resume': {
-                'id': user_resume.id,
-                'status': user_resume.status,
-                'skills_count': len(user_resume.extracted_skills or []),
+                'id': summary.resume['id'],
+                'status': summary.resume['status'],
+                'skills_count': summary.resume['skills_count'],
             },
             'job_matches': matches_data,
             'total_matches': len(matches_data),
+            'next_cursor': next_cursor,
+            'previous_cursor': previous_cursor,
+            'approximate_total': approximate_total,
         })
         
     except Exception as e:
@@ -0,0 +1,158 @@
+"""
+Materialized per-user dashboard summary.
+
+The dashboard and profile APIs show the same things: the active resume, the
+best job matches with their jobs and the most recent applications. Instead of
+rebuilding that from live queries on every load it is kept in one
+UserDashboardSummary row per user:
+
+    mark_summary_stale   - bump data_version (one UPDATE), on every change to
+                           a resume or an application
+    refresh_summary      - rebuild the row; after a resume is analyzed, after
+                           JobMatch rows are written in bulk and after an
+                           application changes
+    get_summary          - the row by its unique user index, rebuilt first
+                           only when stale
+
+A row is fresh when built_version equals data_version and schema_version is
+SUMMARY_SCHEMA_VERSION. Bump SUMMARY_SCHEMA_VERSION when the payload changes.
+"""
+
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.pagination import keyset_page
+from core.request_timing import SUMMARY, stage
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SCHEMA_VERSION = 1
+TOP_MATCHES = 6
+MIN_MATCH_SCORE = 50
+RECENT_APPLICATIONS = 10
+
+
+def _user_id(user) -> int:
+    return getattr(user, 'pk', user)
+
+
+def _resume_data(resume) -> dict:
+    skills = resume.extracted_skills or []
+    return {
+        'id': resume.id,
+        'original_filename': resume.original_filename,
+        'status': resume.status,
+        'created_at': resume.created_at.isoformat() if resume.created_at else None,
+        'extracted_skills': skills,
+        'skills_count': len(skills),
+        'experience_level': resume.experience_level,
+        'analysis_summary': resume.analysis_summary,
+        'file_url': resume.file.url if resume.file else None,
+        'confidence_score': resume.confidence_score,
+        'job_titles': resume.job_titles or [],
+        'education': resume.education or [],
+        'work_experience': resume.work_experience or [],
+    }
+
+
+def dashboard_match_data(match) -> dict:
+    """One JobMatch as the dashboard API shows it"""
+    job = match.job
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company_name,
+        'location': job.location,
+        'match_score': match.match_score,
+        'description': job.description[:200] + '...' if len(job.description) > 200 else job.description,
+        'published_at': job.published_at.isoformat() if job.published_at else None,
+    }
+
+
+def _application_data(application) -> dict:
+    return {
+        'id': application.id,
+        'job_id': application.job_id,
+        'job_title': application.job.title,
+        'company_name': application.job.company_name,
+        'match_score': application.match_score,
+        'applied_date': application.applied_date.isoformat() if application.applied_date else None,
+        'status': application.status,
+    }
+
+
+def top_matches_queryset(resume):
+    """The resume's dashboard-worthy matches, for keyset_page"""
+    JobMatch = apps.get_model('jobs', 'JobMatch')
+    return JobMatch.objects.filter(resume=resume, match_score__gte=MIN_MATCH_SCORE).select_related('job')
+
+
+def is_fresh(summary) -> bool:
+    return summary.built_version == summary.data_version and summary.schema_version == SUMMARY_SCHEMA_VERSION
+
+
+def mark_summary_stale(user) -> None:
+    """Invalidate a user's summary; the next read or refresh rebuilds it"""
+    UserDashboardSummary = apps.get_model('accounts', 'UserDashboardSummary')
+    UserDashboardSummary.objects.filter(user_id=_user_id(user)).update(data_version=F('data_version') + 1)
+
+
+@stage(SUMMARY)
+def refresh_summary(user):
+    """Rebuild a user's summary row from live data and return it"""
+    UserDashboardSummary = apps.get_model('accounts', 'UserDashboardSummary')
+    Resume = apps.get_model('resumes', 'Resume')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+
+    user_id = _user_id(user)
+    summary, _ = UserDashboardSummary.objects.get_or_create(user_id=user_id)
+    # Changes landing while this builds leave built_version behind data_version
+    observed_version = summary.data_version
+
+    resume = Resume.objects.filter(user_id=user_id, is_active=True).first()
+    top_matches, next_cursor = [], ''
+    if resume:
+        page = keyset_page(top_matches_queryset(resume), page_size=TOP_MATCHES)
+        top_matches = [dashboard_match_data(match) for match in page]
+        next_cursor = page.next_cursor or ''
+    applications = JobApplication.objects.filter(user_id=user_id).select_related('job').order_by('-applied_date')
+
+    values = {
+        'resume': _resume_data(resume) if resume else None,
+        'top_matches': top_matches,
+        'top_matches_next_cursor': next_cursor,
+        'applications': [_application_data(app) for app in applications[:RECENT_APPLICATIONS]],
+        'built_version': observed_version,
+        'schema_version': SUMMARY_SCHEMA_VERSION,
+        'refreshed_at': timezone.now(),
+    }
+    UserDashboardSummary.objects.filter(pk=summary.pk).update(**values)
+    for field, value in values.items():
+        setattr(summary, field, value)
+    return summary
+
+
+def get_summary(user):
+    """A user's summary: one indexed read, plus a rebuild when it is missing or stale"""
+    UserDashboardSummary = apps.get_model('accounts', 'UserDashboardSummary')
+    summary = UserDashboardSummary.objects.filter(user_id=_user_id(user)).first()
+    if summary is None or not is_fresh(summary):
+        summary = refresh_summary(user)
+    return summary
+
+
+def refresh_summary_on_commit(user) -> None:
+    """Refresh once the current transaction commits; failures leave the row stale"""
+    user_id = _user_id(user)
+
+    def refresh():
+        try:
+            refresh_summary(user_id)
+        except Exception as e:
+            logger.warning(f"Failed to refresh dashboard summary for user {user_id}: {e}")
+
+    transaction.on_commit(refresh)
@@ -1,5 +1,5 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import AdminPasswordChangeForm, SetPasswordForm, UserCreationForm
 from django.core.exceptions import ValidationError
 from .models import User
 
@@ -71,3 +71,21 @@ class UserProfileEditForm(forms.ModelForm):
             'phone': forms.TextInput(attrs={'class': 'form-control'}),
             'profile_picture': forms.FileInput(attrs={'class': 'form-control'}),
         }
+
+
+class _RevokeTokensOnSave:
+    """Password form mixin: tokens issued before the new password stop working"""
+
+    def save(self, commit=True):
+        user = super().save(commit=commit)
+        if commit:
+            user.revoke_tokens()
+        return user
+
+
+class TokenRevokingSetPasswordForm(_RevokeTokensOnSave, SetPasswordForm):
+    pass
+
+
+class TokenRevokingAdminPasswordChangeForm(_RevokeTokensOnSave, AdminPasswordChangeForm):
+    pass
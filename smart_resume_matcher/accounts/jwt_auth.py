@@ -0,0 +1,165 @@
+"""
+JWT authentication fast path.
+
+A request's access token is validated once, by JWTAuthenticationMiddleware
+(authenticate_request), and the outcome kept on the request:
+
+    request.jwt_raw_token  - the encoded token the request presented
+    request.jwt_token      - the validated AccessToken (claims in .payload)
+    request.jwt_user       - the user it names
+    request.jwt_error      - why a presented token was rejected
+
+jwt_login_required, the JSON APIs' jwt_authenticate_user and DRF (through
+CachedJWTAuthentication) reuse that instead of validating again.
+
+The user a token names is read from USER_CACHE, keyed by user id and the
+token's token_version claim, so a warm request costs the signature check and
+no query. Saving a user drops their entries (accounts.signals); other
+processes' local copies expire within JWT_USER_CACHE_TTL. Resetting a password,
+or changing it in the admin, bumps User.token_version (User.revoke_tokens),
+which rejects tokens issued before it.
+"""
+
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from core.request_timing import AUTH, stage
+from core.tiered_cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION_CLAIM = 'token_version'
+
+# Users as dicts of their concrete fields, minus the password hash
+USER_CACHE = TieredCache('jwt_user', timeout=settings.JWT_USER_CACHE_TTL)
+_UNCACHED_FIELDS = {'password'}
+
+
+def _user_key(user_id, version) -> str:
+    return f'{user_id}:{version}'
+
+
+def _user_fields(user) -> dict:
+    return {
+        field.attname: field.get_prep_value(getattr(user, field.attname))
+        for field in user._meta.concrete_fields if field.attname not in _UNCACHED_FIELDS
+    }
+
+
+def _user_from_fields(fields: dict):
+    # Fields left out are deferred and load on first access
+    return get_user_model().from_db(DEFAULT_DB_ALIAS, list(fields), list(fields.values()))
+
+
+def forget_token_user(user) -> None:
+    """Drop a user's cached lookups, for the current and the previous token version"""
+    user_id = getattr(user, api_settings.USER_ID_FIELD)
+    for version in {user.token_version, max(user.token_version - 1, 0)}:
+        USER_CACHE.delete(_user_key(user_id, version))
+
+
+def get_token_user(validated_token):
+    """The active user a validated token names, from USER_CACHE when possible"""
+    try:
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken('Token contained no recognizable user identification')
+    # Tokens issued before the claim existed carry version 0, as do users created before it
+    version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+
+    fields = USER_CACHE.get(_user_key(user_id, version))
+    if fields is not None:
+        return _user_from_fields(fields)
+
+    User = get_user_model()
+    try:
+        user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+    if not user.is_active:
+        raise AuthenticationFailed('User is inactive', code='user_inactive')
+    if user.token_version != version:
+        raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+    USER_CACHE.set(_user_key(user_id, version), _user_fields(user))
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    DRF authentication reusing the middleware's validation of the same token
+    and looking users up through USER_CACHE.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+
+        django_request = getattr(request, '_request', request)
+        if (getattr(django_request, 'jwt_token', None) is not None
+                and django_request.jwt_raw_token == raw_token.decode()):
+            return django_request.jwt_user, django_request.jwt_token
+
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # The revoke claim is checked against the password hash, which is never cached
+            return super().get_user(validated_token)
+        return get_token_user(validated_token)
+
+
+def token_from_request(request) -> Optional[str]:
+    """
+    The raw access token a request presents: Authorization (or X-Authorization)
+    Bearer header, access_token cookie, X-Access-Token header or access_token
+    query parameter, in that order.
+    """
+    auth_header = request.META.get('HTTP_AUTHORIZATION') or request.META.get('HTTP_X_AUTHORIZATION')
+    if auth_header and auth_header.startswith('Bearer '):
+        return auth_header.split(' ')[1]
+    return (
+        request.COOKIES.get('access_token')
+        or request.META.get('HTTP_X_ACCESS_TOKEN')
+        or request.GET.get('access_token')
+    )
+
+
+@stage(AUTH)
+def authenticate_request(request):
+    """
+    Validate the request's access token, once per request, and remember the
+    outcome on it. Returns the user, or None when there is no token or it was
+    rejected (see request.jwt_error).
+    """
+    if hasattr(request, 'jwt_token'):
+        return request.jwt_user
+
+    request.jwt_raw_token = token_from_request(request)
+    request.jwt_token = request.jwt_user = request.jwt_error = None
+    if not request.jwt_raw_token:
+        return None
+
+    try:
+        authenticator = CachedJWTAuthentication()
+        validated_token = authenticator.get_validated_token(request.jwt_raw_token)
+        request.jwt_user = authenticator.get_user(validated_token)
+        request.jwt_token = validated_token
+    except (InvalidToken, TokenError, AuthenticationFailed) as e:
+        logger.debug(f"JWT authentication failed: {e}")
+        request.jwt_error = e
+    except Exception as e:
+        logger.warning(f"Unexpected error in JWT authentication: {e}")
+        request.jwt_error = e
+    return request.jwt_user
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_user_profile_picture'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDashboardSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume', models.JSONField(blank=True, null=True)),
+                ('top_matches', models.JSONField(blank=True, default=list)),
+                ('top_matches_next_cursor', models.CharField(blank=True, max_length=255)),
+                ('applications', models.JSONField(blank=True, default=list)),
+                ('data_version', models.PositiveIntegerField(default=0)),
+                ('built_version', models.PositiveIntegerField(blank=True, null=True)),
+                ('schema_version', models.PositiveSmallIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Dashboard Summary',
+                'verbose_name_plural': 'User Dashboard Summaries',
+            },
+        ),
+    ]
@@ -10,6 +10,8 @@ class User(AbstractUser):
     is_email_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Carried in issued JWTs; tokens with an older version are rejected
+    token_version = models.PositiveIntegerField(default=0)
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []  # Remove username from required fields since we use email
@@ -20,6 +22,12 @@ class User(AbstractUser):
             self.username = self.email
         super().save(*args, **kwargs)
 
+    def revoke_tokens(self):
+        """Reject every JWT issued so far; called by the password change and reset forms"""
+        # Not in set_password: check_password rehashes through it when the hasher changes
+        self.token_version += 1
+        self.save(update_fields=['token_version'])
+
     def __str__(self):
         return self.email
         
@@ -111,4 +119,29 @@ class UserProfile(models.Model):
     def clean(self):
         from django.core.exceptions import ValidationError
         if self.min_salary and self.max_salary and self.min_salary > self.max_salary:
-            raise ValidationError('Minimum salary cannot be greater than maximum salary.')
\ No newline at end of file
+            raise ValidationError('Minimum salary cannot be greater than maximum salary.')
+
+class UserDashboardSummary(models.Model):
+    """
+    Materialized dashboard/profile summary, one row per user (see accounts.dashboard_summary).
+    Stale when built_version lags data_version or schema_version is outdated.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='dashboard_summary')
+
+    resume = models.JSONField(null=True, blank=True)  # Active resume, None without one
+    top_matches = models.JSONField(default=list, blank=True)
+    top_matches_next_cursor = models.CharField(max_length=255, blank=True)
+    applications = models.JSONField(default=list, blank=True)  # Most recent first
+
+    # Bumped by every change to the summarized data; built_version is the value it was built from
+    data_version = models.PositiveIntegerField(default=0)
+    built_version = models.PositiveIntegerField(null=True, blank=True)
+    schema_version = models.PositiveSmallIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'User Dashboard Summary'
+        verbose_name_plural = 'User Dashboard Summaries'
+
+    def __str__(self):
+        return f"Dashboard summary for user {self.user_id}"
@@ -5,6 +5,7 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from .jwt_auth import TOKEN_VERSION_CLAIM
 
 User = get_user_model()
 
@@ -24,6 +25,13 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         if 'username' in self.fields:
             del self.fields['username']
     
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Checked (and used as the user cache key) by accounts.jwt_auth
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+    
     def validate(self, attrs):
         """
         Override validate to handle email authentication and add user information
@@ -87,7 +95,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             
             # Add latest resume information if it exists
             if hasattr(user, 'resumes'):
-                latest_resume = user.resumes.filter(status='completed').first()
+                latest_resume = user.resumes.filter(status__in=user.resumes.model.ANALYZED_STATUSES).first()
                 if latest_resume:
                     data['user']['latest_resume'] = {
                         'id': latest_resume.id,
@@ -149,7 +157,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
     def get_latest_resume(self, obj):
         """Get latest resume information"""
         if hasattr(obj, 'resumes'):
-            latest_resume = obj.resumes.filter(status='completed').first()
+            latest_resume = obj.resumes.filter(status__in=obj.resumes.model.ANALYZED_STATUSES).first()
             if latest_resume:
                 return {
                     'id': latest_resume.id,
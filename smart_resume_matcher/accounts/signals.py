@@ -1,8 +1,10 @@
 # accounts/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.apps import apps
 from .models import User
+from .dashboard_summary import mark_summary_stale, refresh_summary_on_commit
+from .jwt_auth import forget_token_user
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -13,4 +15,28 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+# JWT-authenticated requests read users from a cache
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    forget_token_user(instance)
+
+@receiver(post_save, sender='resumes.Resume')
+def resume_saved(sender, instance, **kwargs):
+    mark_summary_stale(instance.user_id)
+    # Analysis saves a resume many times; rebuild once it is done
+    if instance.status in instance.ANALYZED_STATUSES:
+        refresh_summary_on_commit(instance.user_id)
+
+@receiver(post_save, sender='jobs.JobApplication')
+def application_saved(sender, instance, **kwargs):
+    mark_summary_stale(instance.user_id)
+    refresh_summary_on_commit(instance.user_id)
+
+# Deletes may be cascades from the user itself, so only invalidate; the next read rebuilds
+@receiver(post_delete, sender='resumes.Resume')
+@receiver(post_delete, sender='jobs.JobApplication')
+def summarized_row_deleted(sender, instance, **kwargs):
+    mark_summary_stale(instance.user_id)
@@ -1,3 +1,123 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
 
-# Create your tests here.
+from accounts.api_views import dashboard_api_view
+from accounts.dashboard_summary import get_summary, is_fresh
+from accounts.decorators import jwt_login_required
+from accounts.middleware import JWTAuthenticationMiddleware
+from accounts.serializers import CustomTokenObtainPairSerializer
+from accounts.models import UserDashboardSummary
+from core.testing import LOCMEM_CACHES
+from jobs.models import Job, JobApplication, JobMatch
+from resumes.models import Resume
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DashboardSummaryTests(TestCase):
+    """The dashboard is served from one UserDashboardSummary row, rebuilt only when stale"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='viewer', email='viewer@example.com', password='secret-pass-123'
+        )
+        cls.resume = Resume.objects.create(
+            user=cls.user, original_filename='cv.pdf', extracted_skills=['python', 'django']
+        )
+        cls.jobs = []
+        for i in range(8):
+            job = Job.objects.create(
+                hh_id=f'hh-{i}', title=f'Python developer {i}', company_name='Acme',
+                description='Python and Django', location='Almaty'
+            )
+            JobMatch.objects.create(user=cls.user, job=job, resume=cls.resume, match_score=60 + i)
+            cls.jobs.append(job)
+
+    def _dashboard(self, **params):
+        request = APIRequestFactory().get('/api/dashboard/', params)
+        force_authenticate(request, user=self.user)
+        return dashboard_api_view(request)
+
+    def test_fresh_summary_is_one_query(self):
+        get_summary(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._dashboard()
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data['resume']['skills_count'], 2)
+        self.assertEqual([match['match_score'] for match in response.data['job_matches']], [67, 66, 65, 64, 63, 62])
+        self.assertIsNotNone(response.data['next_cursor'])
+
+        second_page = self._dashboard(cursor=response.data['next_cursor'])
+        self.assertEqual([match['match_score'] for match in second_page.data['job_matches']], [61, 60])
+
+    def test_changes_bump_the_version(self):
+        summary = get_summary(self.user)
+
+        self.resume.extracted_skills = ['python']
+        self.resume.save()
+        self.assertFalse(is_fresh(UserDashboardSummary.objects.get(pk=summary.pk)))
+        self.assertEqual(get_summary(self.user).resume['skills_count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobApplication.objects.create(user=self.user, job=self.jobs[0], resume=self.resume)
+        summary = UserDashboardSummary.objects.get(pk=summary.pk)
+        self.assertTrue(is_fresh(summary))
+        self.assertEqual([app['job_id'] for app in summary.applications], [self.jobs[0].id])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JWTFastPathTests(TestCase):
+    """A token is validated once per request and its user comes from the cache when warm"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='holder', email='holder@example.com', password='secret-pass-123'
+        )
+
+    def _get(self, token):
+        request = RequestFactory().get('/jobs/', HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT='application/json')
+        view = jwt_login_required(lambda request: HttpResponse(request.user.email))
+        return JWTAuthenticationMiddleware(view)(request)
+
+    def _token(self):
+        return str(CustomTokenObtainPairSerializer.get_token(self.user).access_token)
+
+    def test_warm_request_has_no_queries(self):
+        token = self._token()
+        self.assertEqual(self._get(token).content, b'holder@example.com')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get(token)
+
+        self.assertEqual(response.content, b'holder@example.com')
+        self.assertEqual(len(queries), 0)
+
+    def test_password_reset_revokes_tokens(self):
+        from accounts.forms import TokenRevokingSetPasswordForm
+
+        token = self._token()
+        self.assertEqual(self._get(token).status_code, 200)
+
+        form = TokenRevokingSetPasswordForm(self.user, {
+            'new_password1': 'another-pass-456', 'new_password2': 'another-pass-456',
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        self.assertEqual(self._get(token).status_code, 401)
+        self.assertEqual(self._get(self._token()).status_code, 200)
+
+    def test_password_rehash_keeps_tokens(self):
+        token = self._token()
+        # check_password rehashes through set_password when the hasher changes
+        self.user.set_password('secret-pass-123')
+        self.user.save(update_fields=['password'])
+
+        self.assertEqual(self._get(token).status_code, 200)
@@ -95,7 +95,7 @@ def profile_view(request):
     
     # Calculate statistics
     total_resumes = resumes.count()
-    completed_resumes = resumes.filter(status='completed').count()
+    completed_resumes = resumes.filter(status__in=Resume.ANALYZED_STATUSES).count()
     pending_resumes = resumes.filter(status='pending').count()
     failed_resumes = resumes.filter(status='failed').count()
     
@@ -1,6 +1,8 @@
 # config/celery.py
 import os
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
+from kombu import Queue
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
@@ -14,11 +16,73 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# Dedicated queues so slow HH.ru or LLM calls never hold up CPU work.
+# Pool type and concurrency are set per worker in the Procfile:
+#   hh_io, llm_io, email  -> threads pool, high concurrency
+#   extract_cpu, match_cpu -> prefork pool, one process per core
+# Time limits are (soft, hard) seconds per task on that queue.
+QUEUE_TIME_LIMITS = {
+    'hh_io': (120, 180),
+    'extract_cpu': (120, 180),
+    'llm_io': (60, 90),  # Groq requests time out after 30s
+    'match_cpu': (300, 360),
+    'email': (30, 60),
+}
+
+TASK_QUEUES = {
+    'jobs.tasks.search_and_match_jobs_task': 'hh_io',
+    'jobs.tasks.weekly_job_search_for_all_users': 'match_cpu',
+    'jobs.tasks.weekly_job_search_batch': 'match_cpu',
+    'jobs.tasks.apply_retention_policies_task': 'match_cpu',
+    'jobs.tasks.sync_job_skills_task': 'extract_cpu',
+    'resumes.tasks.analyze_resume_task': 'extract_cpu',
+    'resumes.tasks.run_resume_analysis_task': 'extract_cpu',
+    'resumes.tasks.enrich_resume_analysis_task': 'llm_io',
+    'resumes.tasks.finalize_stale_provisional_task': 'extract_cpu',
+    'resumes.tasks.rematch_resume_jobs_task': 'match_cpu',
+    'resumes.tasks.generate_job_matches_task': 'match_cpu',
+    'notifications.tasks.send_email_notification': 'email',
+    'notifications.tasks.send_welcome_email': 'email',
+    'notifications.tasks.send_resume_analyzed_email': 'email',
+    'notifications.tasks.send_job_matches_email': 'email',
+}
+
+app.conf.task_queues = [Queue(name) for name in QUEUE_TIME_LIMITS]
+app.conf.task_default_queue = 'match_cpu'
+app.conf.task_routes = {name: {'queue': queue} for name, queue in TASK_QUEUES.items()}
+app.conf.task_annotations = {
+    name: {
+        'soft_time_limit': QUEUE_TIME_LIMITS[queue][0],
+        'time_limit': QUEUE_TIME_LIMITS[queue][1],
+    }
+    for name, queue in TASK_QUEUES.items()
+}
+
+# Long CPU tasks: don't let one worker hoard messages, and redeliver on crash.
+# IO workers raise their prefetch on the command line.
+app.conf.worker_prefetch_multiplier = 1
+app.conf.task_acks_late = True
+
 # Beat schedule for periodic tasks
 app.conf.beat_schedule = {
     'weekly-job-search': {
         'task': 'jobs.tasks.weekly_job_search_for_all_users',
         'schedule': 604800.0,  # Run every week (7 days * 24 hours * 60 minutes * 60 seconds)
     },
+    'finalize-stale-provisional': {
+        'task': 'resumes.tasks.finalize_stale_provisional_task',
+        'schedule': 300.0,  # Every 5 minutes; see RESUME_PROVISIONAL_DEADLINE
+    },
+    'daily-retention': {
+        'task': 'jobs.tasks.apply_retention_policies_task',
+        'schedule': 86400.0,  # Daily; each run stops at RETENTION_TIME_BUDGET, under the match_cpu time limit
+    },
 }
 
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def shutdown_thread_pools(**kwargs):
+    """Stop the shared io/cpu thread pools when a worker (or prefork child) exits"""
+    from core.executors import shutdown_executors
+    shutdown_executors()
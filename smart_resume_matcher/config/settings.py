@@ -55,7 +55,9 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # ServeStatic is WhiteNoise's async-capable fork, so static files do not go through a thread under uvicorn
+    'servestatic.middleware.ServeStaticMiddleware',
+    'core.request_timing.RequestTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -126,7 +128,7 @@ STATICFILES_DIRS = [
 ]
 
 # Static files storage for production - simplified for Railway
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+STATICFILES_STORAGE = 'servestatic.storage.CompressedStaticFilesStorage'
 
 # Media files
 MEDIA_URL = '/media/'
@@ -138,7 +140,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.jwt_auth.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -215,3 +217,92 @@ GROQ_API_KEY = config('GROQ_API_KEY', default='dummy-key')
 GROQ_API_URL = config('GROQ_API_URL', default='https://api.groq.com/openai/v1/chat/completions')
 HH_API_BASE_URL = config('HH_API_BASE_URL', default='https://api.hh.ru')
 HH_API_USER_AGENT = config('HH_API_USER_AGENT', default='Smart Resume Matcher (contact@example.com)')
+
+# Approximate token budget for resume text pasted into LLM analysis prompts
+RESUME_PROMPT_TOKEN_BUDGET = config('RESUME_PROMPT_TOKEN_BUDGET', default=1500, cast=int)
+
+# Write a local (non-LLM) analysis first and enrich it with the LLM in the background
+RESUME_TWO_PHASE_ANALYSIS = config('RESUME_TWO_PHASE_ANALYSIS', default=True, cast=bool)
+# Seconds a provisional analysis waits for enrichment before it is promoted to final as it is
+RESUME_PROVISIONAL_DEADLINE = config('RESUME_PROVISIONAL_DEADLINE', default=15 * 60, cast=int)
+
+# Celery broker; when unset, resume analysis runs on a bounded in-process pool
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='')
+RESUME_ANALYSIS_WORKERS = config('RESUME_ANALYSIS_WORKERS', default=2, cast=int)
+RESUME_ANALYSIS_QUEUE_LIMIT = config('RESUME_ANALYSIS_QUEUE_LIMIT', default=20, cast=int)
+
+# Weekly job search fan-out: users per Celery group and the window (seconds) batches are spread over
+WEEKLY_JOB_SEARCH_BATCH_SIZE = config('WEEKLY_JOB_SEARCH_BATCH_SIZE', default=50, cast=int)
+WEEKLY_JOB_SEARCH_WINDOW = config('WEEKLY_JOB_SEARCH_WINDOW', default=6 * 60 * 60, cast=int)
+
+# Shared cache for progress events and dispatch locks; per-process memory cache otherwise
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+# Shared tier of core.tiered_cache: Redis, else a file cache all workers on the host share, holding up to
+# TIERED_CACHE_MAX_ENTRIES values (one file each) before a third are culled
+CACHES['shared'] = dict(CACHES['default']) if REDIS_URL else {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': config('TIERED_CACHE_DIR', default=str(BASE_DIR / 'cache')),
+    'OPTIONS': {'MAX_ENTRIES': config('TIERED_CACHE_MAX_ENTRIES', default=20000, cast=int)},
+}
+
+# Web worker processes (gunicorn reads the same variable); more than one needs REDIS_URL for progress streaming
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+
+# How long resume progress events are kept for the SSE stream (seconds)
+RESUME_PROGRESS_TTL = config('RESUME_PROGRESS_TTL', default=3600, cast=int)
+
+# Job scoring worker processes (0 = one per CPU, 1 = score in-process, the default for web processes) and jobs per chunk
+MATCH_SCORING_WORKERS = config('MATCH_SCORING_WORKERS', default=1, cast=int)
+MATCH_SCORING_CHUNK_SIZE = config('MATCH_SCORING_CHUNK_SIZE', default=50, cast=int)
+
+# Shared thread pools (core.executors): network calls and regex/PDF analysis steps
+EXECUTOR_IO_WORKERS = config('EXECUTOR_IO_WORKERS', default=8, cast=int)
+EXECUTOR_CPU_WORKERS = config('EXECUTOR_CPU_WORKERS', default=4, cast=int)
+
+# Match score memo (jobs.score_memo): in-process LRU entries in front of the MatchScoreMemo table
+SCORE_MEMO_LRU_SIZE = config('SCORE_MEMO_LRU_SIZE', default=10000, cast=int)
+
+# Retention (jobs.retention): matches kept per resume, age in days before searches are compacted, inactive jobs
+# archived and score memos expired (0 disables a policy), rows per chunk, pause between chunks and time budget per run (seconds)
+RETENTION_MATCHES_PER_RESUME = config('RETENTION_MATCHES_PER_RESUME', default=300, cast=int)
+RETENTION_SEARCH_DAYS = config('RETENTION_SEARCH_DAYS', default=30, cast=int)
+RETENTION_INACTIVE_JOB_DAYS = config('RETENTION_INACTIVE_JOB_DAYS', default=90, cast=int)
+RETENTION_MEMO_DAYS = config('RETENTION_MEMO_DAYS', default=30, cast=int)
+RETENTION_CHUNK_SIZE = config('RETENTION_CHUNK_SIZE', default=500, cast=int)
+RETENTION_CHUNK_PAUSE = config('RETENTION_CHUNK_PAUSE', default=0.1, cast=float)
+RETENTION_TIME_BUDGET = config('RETENTION_TIME_BUDGET', default=240, cast=int)
+# Durable directory for archived jobs (a mounted volume or network share, not the container disk); the jobs policy
+# does not run until it is set
+RETENTION_ARCHIVE_DIR = config('RETENTION_ARCHIVE_DIR', default='')
+
+# Tiered cache (core.tiered_cache): per-process LRU entries and how long (seconds) they shadow the shared tier
+TIERED_CACHE_LOCAL_SIZE = config('TIERED_CACHE_LOCAL_SIZE', default=2048, cast=int)
+TIERED_CACHE_LOCAL_TTL = config('TIERED_CACHE_LOCAL_TTL', default=60, cast=int)
+# Stampede protection: refresh lock lifetime and how long other callers wait for the holder (seconds)
+TIERED_CACHE_LOCK_TIMEOUT = config('TIERED_CACHE_LOCK_TIMEOUT', default=60, cast=int)
+TIERED_CACHE_LOCK_WAIT = config('TIERED_CACHE_LOCK_WAIT', default=30, cast=int)
+
+# HH.ru search results in the tiered cache: fresh for HH_SEARCH_CACHE_TTL, served stale for HH_SEARCH_CACHE_STALE_TTL more
+HH_SEARCH_CACHE_TTL = config('HH_SEARCH_CACHE_TTL', default=600, cast=int)
+HH_SEARCH_CACHE_STALE_TTL = config('HH_SEARCH_CACHE_STALE_TTL', default=1800, cast=int)
+
+# JWT-authenticated users (accounts.jwt_auth) are cached by id and token version for this many seconds
+JWT_USER_CACHE_TTL = config('JWT_USER_CACHE_TTL', default=60, cast=int)
+
+# Request timings (core.request_timing): Server-Timing header on staff users' responses (off by default, it exposes
+# internal timings), and requests slower than this (ms) are logged at INFO
+REQUEST_TIMING_HEADER = config('REQUEST_TIMING_HEADER', default=False, cast=bool)
+REQUEST_TIMING_SLOW_MS = config('REQUEST_TIMING_SLOW_MS', default=1000, cast=int)
@@ -22,11 +22,14 @@ from accounts.jwt_views import (
     verify_token_view,
 )
 from accounts.api_views import register_api_view
-from core.views import home_view
+from accounts.forms import TokenRevokingSetPasswordForm
+from core.views import (
+    home_view, executor_stats_api, cache_stats_api, request_timing_stats_api, analysis_store_stats_api,
+)
 from accounts.views import register_view, login_view, logout_view, profile_view, edit_profile_view, jwt_login_view, jwt_demo_view, simple_login_view
 from accounts.jwt_compatible_views import jwt_profile_view, jwt_home_view, jwt_resume_upload_view
 from resumes.views import resume_upload_view
-from resumes.api import resume_upload_api, resume_status_api, resume_list_api, resume_analysis_api
+from resumes.api import resume_upload_api, resume_status_api, resume_list_api, resume_analysis_api, resume_progress_stream_api
 
 # Simple handler for Chrome DevTools requests
 def chrome_devtools_handler(request):
@@ -70,7 +73,7 @@ urlpatterns = [
     path('logout/', logout_view, name='logout'),
     path('password-reset/', auth_views.PasswordResetView.as_view(template_name='registration/password_reset_form.html'), name='password_reset'),
     path('password-reset/done/', auth_views.PasswordResetDoneView.as_view(template_name='registration/password_reset_done.html'), name='password_reset_done'),
-    path('password-reset-confirm/<uidb64>/<token>/', auth_views.PasswordResetConfirmView.as_view(template_name='registration/password_reset_confirm.html'), name='password_reset_confirm'),
+    path('password-reset-confirm/<uidb64>/<token>/', auth_views.PasswordResetConfirmView.as_view(template_name='registration/password_reset_confirm.html', form_class=TokenRevokingSetPasswordForm), name='password_reset_confirm'),
     path('password-reset-complete/', auth_views.PasswordResetCompleteView.as_view(template_name='registration/password_reset_complete.html'), name='password_reset_complete'),
     
     # User Profile URLs
@@ -98,9 +101,16 @@ urlpatterns = [
     # Resume API URLs
     path('api/resume/upload/', resume_upload_api, name='api_resume_upload'),
     path('api/resume/status/<int:resume_id>/', resume_status_api, name='api_resume_status'),
+    path('api/resume/progress/<int:resume_id>/', resume_progress_stream_api, name='api_resume_progress'),
     path('api/resume/list/', resume_list_api, name='api_resume_list'),
     path('api/resume/analysis/<int:resume_id>/', resume_analysis_api, name='api_resume_analysis'),
     
+    # Monitoring
+    path('api/system/executors/', executor_stats_api, name='api_executor_stats'),
+    path('api/system/cache/', cache_stats_api, name='api_cache_stats'),
+    path('api/system/timings/', request_timing_stats_api, name='api_request_timing_stats'),
+    path('api/system/analysis-store/', analysis_store_stats_api, name='api_analysis_store_stats'),
+    
     # Chrome DevTools handler (suppress 404 errors)
     path('.well-known/appspecific/com.chrome.devtools.json', chrome_devtools_handler),
     
@@ -0,0 +1,168 @@
+"""
+Process-wide thread pools for blocking work.
+
+Two named pools replace the per-instance and per-call ThreadPoolExecutors the
+analyzer, matcher and HH clients used to create:
+
+    io  - network calls (HH.ru / HH.kz fetches)
+    cpu - regex-heavy analysis steps and PDF parsing
+
+Pools are created lazily on first use, sized from EXECUTOR_IO_WORKERS and
+EXECUTOR_CPU_WORKERS, and shut down at interpreter exit and Celery worker
+shutdown. Forked children (prefork workers, scoring processes) start with no
+pools and create their own on demand.
+
+Tasks run in a copy of the submitter's context (contextvars), so per-request
+state such as core.request_timing follows them onto the pool.
+
+Tasks running on a pool must not block on other tasks submitted to the same
+pool, or a saturated pool deadlocks.
+"""
+
+import atexit
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+IO = 'io'
+CPU = 'cpu'
+
+DEFAULT_POOL_SIZES = {
+    IO: 8,
+    CPU: 4,
+}
+
+POOL_SETTINGS = {
+    IO: 'EXECUTOR_IO_WORKERS',
+    CPU: 'EXECUTOR_CPU_WORKERS',
+}
+
+
+class ManagedExecutor(Executor):
+    """
+    ThreadPoolExecutor wrapper that counts queued, active and finished tasks.
+    Usable anywhere an Executor is, including loop.run_in_executor().
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{name}-pool')
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            self._queued += 1
+        try:
+            context = contextvars.copy_context()
+            return self._executor.submit(context.run, self._run, fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    def _run(self, fn: Callable, *args, **kwargs):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        else:
+            with self._lock:
+                self._completed += 1
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'name': self.name,
+                'max_workers': self.max_workers,
+                'queued': self._queued,
+                'active': self._active,
+                'completed': self._completed,
+                'failed': self._failed,
+            }
+
+
+_pools: Dict[str, ManagedExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_size(name: str) -> int:
+    return max(1, getattr(settings, POOL_SETTINGS[name], DEFAULT_POOL_SIZES[name]))
+
+
+def get_executor(name: str) -> ManagedExecutor:
+    """Named process-wide pool ('io' or 'cpu'), created on first use"""
+    if name not in POOL_SETTINGS:
+        raise ValueError(f"Unknown executor pool: {name}")
+
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = ManagedExecutor(name, _pool_size(name))
+                _pools[name] = pool
+    return pool
+
+
+def io_executor() -> ManagedExecutor:
+    return get_executor(IO)
+
+
+def cpu_executor() -> ManagedExecutor:
+    return get_executor(CPU)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every pool created in this process"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down all pools; later get_executor() calls create new ones"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        try:
+            pool.shutdown(wait=wait)
+        except Exception as e:
+            logger.warning(f"Error shutting down {pool.name} executor: {e}")
+
+
+def _reset_after_fork() -> None:
+    # Pool threads do not survive fork; drop the parent's pools without joining them
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+atexit.register(shutdown_executors)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
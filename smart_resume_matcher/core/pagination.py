@@ -0,0 +1,132 @@
+"""
+Keyset (cursor) pagination for score-ordered listings.
+
+Paginator issues a COUNT(*) and then OFFSET queries, so page n reads and
+discards every row before it. Keyset pagination orders by (score, id)
+descending and continues from the last row of the previous page with a
+range condition instead, which the (resume, match_score, id) index answers
+directly: deep pages cost the same as the first.
+
+Cursors are opaque signed tokens holding the boundary row's (score, id) and
+the direction. Tampered or malformed cursors fall back to the first page.
+Totals are optional and approximate: counting stops at APPROXIMATE_TOTAL_CAP.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from django.core import signing
+from django.db.models import Q, QuerySet
+
+logger = logging.getLogger(__name__)
+
+CURSOR_SALT = 'core.pagination.cursor'
+APPROXIMATE_TOTAL_CAP = 1000
+MAX_PAGE_SIZE = 100
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+@dataclass
+class KeysetPage:
+    """One page of results plus the cursors for its neighbours"""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_exact: bool = True
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __bool__(self) -> bool:
+        return bool(self.items)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+
+def encode_cursor(score: float, pk: Any, direction: str = NEXT) -> str:
+    return signing.dumps({'s': score, 'i': pk, 'd': direction}, salt=CURSOR_SALT)
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict]:
+    """Cursor payload, or None for a missing or invalid cursor"""
+    if not cursor:
+        return None
+    try:
+        payload = signing.loads(cursor, salt=CURSOR_SALT)
+        float(payload['s'])
+        if payload['d'] not in (NEXT, PREVIOUS):
+            raise ValueError(payload['d'])
+        return payload
+    except (signing.BadSignature, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring invalid pagination cursor: {e}")
+        return None
+
+
+def approximate_count(queryset: QuerySet, cap: int = APPROXIMATE_TOTAL_CAP) -> int:
+    """COUNT over at most cap rows; a result equal to cap means 'cap or more'"""
+    return queryset.order_by()[:cap].count()
+
+
+def keyset_page(queryset: QuerySet, cursor: Optional[str] = None, page_size: int = 10,
+                score_field: str = 'match_score', with_total: bool = False) -> KeysetPage:
+    """
+    Page of queryset ordered by (score_field, pk) descending, starting after
+    (or, for previous-page cursors, before) the cursor's boundary row.
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    position = decode_cursor(cursor)
+
+    descending = queryset.order_by(f'-{score_field}', '-pk')
+    if position is None:
+        rows = list(descending[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        has_next, has_previous = has_more, False
+    elif position['d'] == NEXT:
+        score, pk = position['s'], position['i']
+        rows = list(descending.filter(
+            Q(**{f'{score_field}__lt': score}) | Q(**{score_field: score, 'pk__lt': pk})
+        )[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        has_next, has_previous = has_more, True
+    else:
+        # Walk backwards from the boundary in ascending order, then restore page order
+        score, pk = position['s'], position['i']
+        rows = list(queryset.order_by(score_field, 'pk').filter(
+            Q(**{f'{score_field}__gt': score}) | Q(**{score_field: score, 'pk__gt': pk})
+        )[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next, has_previous = True, has_more
+
+    page = KeysetPage(items=rows)
+    if rows:
+        if has_next:
+            last = rows[-1]
+            page.next_cursor = encode_cursor(getattr(last, score_field), last.pk, NEXT)
+        if has_previous:
+            first = rows[0]
+            page.previous_cursor = encode_cursor(getattr(first, score_field), first.pk, PREVIOUS)
+
+    if with_total:
+        page.total = approximate_count(queryset)
+        page.total_is_exact = page.total < APPROXIMATE_TOTAL_CAP
+    return page
@@ -0,0 +1,68 @@
+"""
+Bounded top-k selection.
+
+Rankers push (key, item) pairs into a TopK instead of collecting every scored
+item and sorting the full list. Only the k best are kept, on a min-heap whose
+root is the current k-th best key. Scorers can check may_enter() with an upper
+bound on an item's score and skip the expensive part of scoring when the item
+cannot make the cut.
+"""
+
+import heapq
+import itertools
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def _score_of(key: Any) -> float:
+    # Keys are either a score or a tuple whose first element is the score
+    return key[0] if isinstance(key, tuple) else key
+
+
+class TopK(Generic[T]):
+    """Keeps the k items with the largest keys"""
+
+    def __init__(self, k: int):
+        self.k = max(k, 0)
+        self._heap: List[Tuple[Any, int, T]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def full(self) -> bool:
+        return len(self._heap) >= self.k
+
+    @property
+    def floor(self) -> Optional[float]:
+        """Score of the current k-th best item, or None while not full"""
+        if not self.full or not self._heap:
+            return None
+        return _score_of(self._heap[0][0])
+
+    def may_enter(self, score_bound: float) -> bool:
+        """False when an item scoring at most score_bound cannot be kept"""
+        if self.k == 0:
+            return False
+        floor = self.floor
+        return floor is None or score_bound >= floor
+
+    def push(self, key: Any, item: T) -> bool:
+        """Offer an item; returns whether it was kept"""
+        if self.k == 0:
+            return False
+        # The counter keeps items themselves out of comparisons on equal keys
+        entry = (key, next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def items(self) -> List[T]:
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[0], reverse=True)]
@@ -0,0 +1,310 @@
+"""
+Per-request stage timings.
+
+RequestTimingMiddleware times every request and splits the time by stage:
+
+    db       - SQL queries (time and count), through a connection execute wrapper
+    hh       - HH.ru / HH.kz HTTP calls
+    llm      - Groq completions
+    pdf      - PDF text extraction
+    scoring  - CPU match scoring
+    auth     - JWT validation and the token user lookup
+    summary  - dashboard summary rebuilds
+
+Code marks its stages with stage(), as a context manager or a decorator
+(sync or async functions):
+
+    with stage('hh'):
+        response = requests.get(...)
+
+    @stage('scoring')
+    def calculate_match_score(...): ...
+
+Stages are recorded into the current request through a context variable, so
+work on the shared executors (which copy the caller's context) and in
+sync_to_async threads counts toward the request that started it; outside a
+request stage() does nothing. Durations are summed across threads, and stages
+may overlap (a query run while scoring counts in both), but a stage nested in
+itself is only counted once.
+
+Each response gets a key=value log line (INFO when slower than
+REQUEST_TIMING_SLOW_MS, DEBUG otherwise), and per-view histograms of each
+stage are kept in memory for timing_stats(). With REQUEST_TIMING_HEADER on,
+staff users' responses also carry a Server-Timing header.
+
+Streaming responses (the SSE progress stream) are recorded when the stream
+closes, so their total covers the whole stream; they get no header, since it
+is sent before the time is known.
+"""
+
+import asyncio
+import bisect
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+DB = 'db'
+HH = 'hh'
+LLM = 'llm'
+PDF = 'pdf'
+SCORING = 'scoring'
+AUTH = 'auth'
+SUMMARY = 'summary'
+TOTAL = 'total'
+
+# Order of the Server-Timing entries and the log line; other stage names follow
+STAGES = (DB, HH, LLM, PDF, SCORING, AUTH, SUMMARY)
+
+# Histogram bucket upper bounds (milliseconds); the last bucket is unbounded
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class RequestTimings:
+    """Stage durations (seconds) and counts for one request; safe to record from any thread"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[name] += seconds
+            self.counts[name] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {'ms': total milliseconds, 'count': n}}, known stages first"""
+        with self._lock:
+            names = [name for name in STAGES if name in self.durations]
+            names += sorted(name for name in self.durations if name not in STAGES)
+            return {
+                name: {'ms': self.durations[name] * 1000, 'count': self.counts[name]}
+                for name in names
+            }
+
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar('request_timings', default=None)
+_active: contextvars.ContextVar[frozenset] = contextvars.ContextVar('request_timing_stages', default=frozenset())
+
+
+class stage:
+    """Time a block, or every call of a function, as the named stage of the current request"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tokens = []
+
+    def __enter__(self):
+        timings = _current.get()
+        active = _active.get()
+        if timings is None or self.name in active:
+            self._tokens.append(None)
+        else:
+            self._tokens.append((timings, _active.set(active | {self.name}), time.perf_counter()))
+        return self
+
+    def __exit__(self, *exc_info):
+        token = self._tokens.pop()
+        if token is not None:
+            timings, active_token, started = token
+            timings.add(self.name, time.perf_counter() - started)
+            _active.reset(active_token)
+        return False
+
+    def __call__(self, func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(self.name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(self.name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def _record_query(execute, sql, params, many, context):
+    # Installed on every connection; only requests being timed pay for it
+    if _current.get() is None:
+        return execute(sql, params, many, context)
+    with stage(DB):
+        return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def _install_query_timer(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+# Histograms
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def _percentile(self, fraction: float) -> float:
+        # Upper bound of the bucket holding the percentile; max_ms for the unbounded one
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(BUCKETS_MS[index], self.max_ms) if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        bounds = [f'le_{bound}' for bound in BUCKETS_MS] + ['le_inf']
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'p50_ms': round(self._percentile(0.5), 2),
+            'p95_ms': round(self._percentile(0.95), 2),
+            'max_ms': round(self.max_ms, 2),
+            'buckets': dict(zip(bounds, self.buckets)),
+        }
+
+
+_histograms: Dict[str, Dict[str, _Histogram]] = defaultdict(lambda: defaultdict(_Histogram))
+_histograms_lock = threading.Lock()
+
+
+def _observe(view: str, total_ms: float, stages: Dict[str, Dict[str, float]]) -> None:
+    with _histograms_lock:
+        view_histograms = _histograms[view]
+        view_histograms[TOTAL].add(total_ms)
+        for name, recorded in stages.items():
+            view_histograms[name].add(recorded['ms'])
+
+
+def timing_stats() -> Dict[str, Any]:
+    """Per-view histograms of request time and each stage's time, in this process"""
+    with _histograms_lock:
+        return {
+            view: {name: histogram.as_dict() for name, histogram in view_histograms.items()}
+            for view, view_histograms in sorted(_histograms.items())
+        }
+
+
+def clear_timing_stats() -> None:
+    with _histograms_lock:
+        _histograms.clear()
+
+
+# Middleware
+
+class RequestTimingMiddleware:
+    """Times each request by stage; adds Server-Timing, logs, and feeds timing_stats()"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, timings)
+        return response
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, timings)
+        return response
+
+    def _finish(self, request, response, timings: RequestTimings) -> None:
+        if response.streaming:
+            # Time the stream until its last chunk is sent or the client goes away
+            response.streaming_content = self._timed_stream(request, response, timings)
+            return
+        self._record(request, response, timings, header=True)
+
+    def _timed_stream(self, request, response, timings: RequestTimings):
+        """response.streaming_content, recording the request when it ends or is closed"""
+        content = response.streaming_content
+        if response.is_async:
+            async def stream():
+                try:
+                    async for chunk in content:
+                        yield chunk
+                finally:
+                    self._record(request, response, timings)
+        else:
+            def stream():
+                try:
+                    yield from content
+                finally:
+                    self._record(request, response, timings)
+        return stream()
+
+    @staticmethod
+    def _header_allowed(request) -> bool:
+        if not getattr(settings, 'REQUEST_TIMING_HEADER', False):
+            return False
+        user = getattr(request, 'jwt_user', None) or getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+    def _record(self, request, response, timings: RequestTimings, header: bool = False) -> None:
+        try:
+            total_ms = (time.perf_counter() - timings.started) * 1000
+            stages = timings.snapshot()
+            resolver_match = getattr(request, 'resolver_match', None)
+            view = resolver_match.view_name if resolver_match else 'unresolved'
+
+            if header and self._header_allowed(request):
+                entries = [f'{name};dur={recorded["ms"]:.1f}' for name, recorded in stages.items()]
+                entries.append(f'{TOTAL};dur={total_ms:.1f}')
+                response['Server-Timing'] = ', '.join(entries)
+
+            fields = ' '.join(
+                f'{name}_ms={recorded["ms"]:.1f} {name}_count={recorded["count"]}'
+                for name, recorded in stages.items()
+            )
+            line = (f"request view={view} method={request.method} status={response.status_code} "
+                    f"total_ms={total_ms:.1f} {fields}").rstrip()
+            if total_ms >= getattr(settings, 'REQUEST_TIMING_SLOW_MS', 1000):
+                logger.info(line)
+            else:
+                logger.debug(line)
+
+            _observe(view, total_ms, stages)
+        except Exception as e:
+            logger.warning(f"Failed to record request timings: {e}")
@@ -0,0 +1,10 @@
+"""
+Test helpers shared by the apps' test modules.
+"""
+
+# In-memory default and shared tiers, so tests never read or write the file
+# cache (or Redis) that other runs and the dev server use
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-shared'},
+}
@@ -1,3 +1,249 @@
-from django.test import TestCase
+import dataclasses
+from datetime import datetime, timezone
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core.request_timing import RequestTimingMiddleware, clear_timing_stats, stage, timing_stats
+from core.testing import LOCMEM_CACHES
+from core.tiered_cache import TieredCache, cache_stats, clear_local_cache, dumps, loads, register_dataclass
+
+
+@register_dataclass
+@dataclasses.dataclass
+class _CachedPoint:
+    label: str
+    coords: tuple
+    seen: datetime
+    derived: int = dataclasses.field(init=False, default=0)
+
+
+@dataclasses.dataclass
+class _UnregisteredPoint:
+    label: str
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RequestTimingTests(TestCase):
+    """Requests are timed by stage into Server-Timing and the per-view histograms"""
+
+    def setUp(self):
+        clear_timing_stats()
+
+    def _request(self, user=None):
+        request = RequestFactory().get('/jobs/')
+        request.user = user or AnonymousUser()
+        return request
+
+    @override_settings(REQUEST_TIMING_HEADER=True)
+    def test_stages_are_recorded(self):
+        def view(request):
+            get_user_model().objects.count()
+            with stage('hh'):
+                with stage('hh'):
+                    pass
+            return HttpResponse('ok')
+
+        staff = get_user_model().objects.create_user(
+            username='staff', email='staff@example.com', password='secret-pass-123', is_staff=True
+        )
+        response = RequestTimingMiddleware(view)(self._request(staff))
+
+        entries = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertEqual(entries, ['db', 'hh', 'total'])
+        stats = timing_stats()['unresolved']
+        self.assertEqual(stats['total']['count'], 1)
+        # A stage nested in itself counts once
+        self.assertEqual(stats['hh']['count'], 1)
+
+    def test_header_is_staff_only_and_off_by_default(self):
+        middleware = RequestTimingMiddleware(lambda request: HttpResponse('ok'))
+        staff = get_user_model().objects.create_user(
+            username='staff', email='staff@example.com', password='secret-pass-123', is_staff=True
+        )
+        self.assertNotIn('Server-Timing', middleware(self._request(staff)))
+        with override_settings(REQUEST_TIMING_HEADER=True):
+            self.assertNotIn('Server-Timing', middleware(self._request()))
+            self.assertIn('Server-Timing', middleware(self._request(staff)))
+
+    def test_streams_are_recorded_when_closed(self):
+        from django.http import StreamingHttpResponse
+
+        response = RequestTimingMiddleware(
+            lambda request: StreamingHttpResponse(iter(['event\n']))
+        )(self._request())
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(timing_stats(), {})
+
+        self.assertEqual(b''.join(response), b'event\n')
+        self.assertEqual(timing_stats()['unresolved']['total']['count'], 1)
+
+        # A client that disconnects mid-stream is recorded when the server closes the response
+        response = RequestTimingMiddleware(
+            lambda request: StreamingHttpResponse(iter(['first\n', 'second\n']))
+        )(self._request())
+        self.assertEqual(next(iter(response)), b'first\n')
+        response.close()
+        self.assertEqual(timing_stats()['unresolved']['total']['count'], 2)
+
+    def test_async_streams_are_recorded_when_drained(self):
+        from asgiref.sync import async_to_sync
+        from django.http import StreamingHttpResponse
+
+        async def events():
+            yield 'event\n'
+
+        response = RequestTimingMiddleware(
+            lambda request: StreamingHttpResponse(events())
+        )(self._request())
+        self.assertTrue(response.is_async)
+        self.assertEqual(timing_stats(), {})
+
+        async def drain():
+            return [chunk async for chunk in response]
+
+        self.assertEqual(async_to_sync(drain)(), [b'event\n'])
+        self.assertEqual(timing_stats()['unresolved']['total']['count'], 1)
+
+    def test_stage_outside_a_request_is_a_no_op(self):
+        with stage('scoring'):
+            get_user_model().objects.count()
+        self.assertEqual(timing_stats(), {})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TieredCacheTests(TestCase):
+    """Values round-trip through JSON and each namespace counts its own hits"""
+
+    def setUp(self):
+        clear_local_cache()
+        caches['shared'].clear()
+
+    def test_values_round_trip(self):
+        point = _CachedPoint('office', (43.2, 76.9), datetime(2026, 1, 2, 3, 4, tzinfo=timezone.utc))
+        point.derived = 7
+        value = {'points': [point], 'pair': ('a', 1), 'at': point.seen, 'tags': ['x']}
+
+        restored = loads(dumps(value))
+        self.assertEqual(restored, value)
+        self.assertIsInstance(restored['points'][0], _CachedPoint)
+        self.assertEqual(restored['points'][0].derived, 7)
+        self.assertIsInstance(restored['pair'], tuple)
+
+        with self.assertRaises(TypeError):
+            dumps(_UnregisteredPoint('home'))
+
+    def test_namespace_stats(self):
+        cache = TieredCache('stats_test', timeout=60)
+        self.assertIsNone(cache.get('key'))
+        cache.set('key', {'n': 1})
+        self.assertEqual(cache.get('key'), {'n': 1})
+        clear_local_cache()
+        self.assertEqual(cache.get('key'), {'n': 1})
+        # Another namespace's traffic is counted apart
+        TieredCache('other_stats_test').get('key')
+
+        stats = cache_stats()['namespaces']['stats_test']
+        self.assertEqual(
+            (stats['misses'], stats['sets'], stats['local_hits'], stats['shared_hits']), (1, 1, 1, 1)
+        )
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+        staff = get_user_model().objects.create_user(
+            username='staff', email='staff@example.com', password='secret-pass-123', is_staff=True
+        )
+        self.client.force_login(staff)
+        namespaces = self.client.get(reverse('api_cache_stats')).json()['cache']['namespaces']
+        self.assertEqual(namespaces['stats_test']['sets'], 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StampedeTests(TestCase):
+    """One caller computes an expired value; the rest wait for it or are served the stale one"""
+
+    def setUp(self):
+        clear_local_cache()
+        caches['shared'].clear()
+        self.cache = TieredCache('stampede_test', timeout=60, stale_ttl=600)
+        self.full_key = self.cache.make_key('key')
+
+    def _expired(self, value, delta=0.0):
+        self.cache._write(self.full_key, value, -1, delta)
+        clear_local_cache()
+
+    def test_stale_value_is_served_while_another_caller_refreshes(self):
+        from unittest import mock
+
+        self._expired('old')
+        token = self.cache._lock(self.full_key)
+        compute = mock.Mock(return_value='new')
+        self.assertEqual(self.cache.get_or_compute('key', compute), 'old')
+        compute.assert_not_called()
+
+        self.cache._unlock(self.full_key, token)
+        self.assertEqual(self.cache.get_or_compute('key', compute), 'new')
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    @override_settings(TIERED_CACHE_LOCK_WAIT=5)
+    def test_waiters_get_the_lock_holders_value(self):
+        import threading
+        from unittest import mock
+
+        token = self.cache._lock(self.full_key)
+        compute = mock.Mock(return_value='waited')
+        result = {}
+        waiter = threading.Thread(target=lambda: result.setdefault('value', self.cache.get_or_compute('key', compute)))
+        waiter.start()
+        self.cache._write(self.full_key, 'computed', 60)
+        self.cache._unlock(self.full_key, token)
+        waiter.join()
+
+        self.assertEqual(result['value'], 'computed')
+        compute.assert_not_called()
+
+    def test_early_refresh_near_expiry(self):
+        from unittest import mock
+
+        # Fresh for another minute, but slow to compute: a near-1 draw refreshes early
+        self.cache._write(self.full_key, 'old', 60, delta=30.0)
+        with mock.patch('core.tiered_cache.random.random', return_value=0.999999):
+            self.assertEqual(self.cache.get_or_compute('key', lambda: 'new'), 'new')
+        with mock.patch('core.tiered_cache.random.random', return_value=0.0):
+            self.assertEqual(self.cache.get_or_compute('key', lambda: 'newer'), 'new')
+        self.assertEqual(cache_stats()['namespaces']['stampede_test']['early_refreshes'], 1)
+
+    def test_async_compute(self):
+        from asgiref.sync import async_to_sync
+
+        async def compute():
+            return {'n': 1}
+
+        self.assertEqual(async_to_sync(self.cache.aget_or_compute)('key', compute), {'n': 1})
+        self.assertEqual(self.cache.get('key'), {'n': 1})
+
+    def test_file_cache_lock_is_exclusive_and_expires(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir},
+        }):
+            token = self.cache._lock(self.full_key)
+            self.assertIsNotNone(token)
+            self.assertIsNone(self.cache._lock(self.full_key))
+            self.cache._unlock(self.full_key, token)
+
+            stale = self.cache._lock(self.full_key)
+            lock_dir = os.path.join(cache_dir, 'locks')
+            for name in os.listdir(lock_dir):
+                os.utime(os.path.join(lock_dir, name), (0, 0))
+            taken = self.cache._lock(self.full_key)
+            self.assertNotIn(taken, (None, stale))
+            # The overrun holder's release leaves the new lock alone
+            self.cache._unlock(self.full_key, stale)
+            self.assertIsNone(self.cache._lock(self.full_key))
@@ -0,0 +1,536 @@
+"""
+Two-level cache for analysis and matching results.
+
+    local   - a bounded per-process LRU (TIERED_CACHE_LOCAL_SIZE entries);
+              entries live at most TIERED_CACHE_LOCAL_TTL seconds so a
+              worker soon sees what another worker wrote
+    shared  - the CACHES['shared'] backend: Redis when REDIS_URL is set,
+              else a file cache that every worker on the host shares
+
+Values are stored as JSON text, never pickled. Dataclasses registered with
+register_dataclass, tuples and datetimes round-trip through type tags; anything
+else must be plain JSON. Keys are "<namespace>:<version>:<key>", so bumping a
+namespace's version orphans its old entries, and hits and misses are counted
+per namespace (cache_stats).
+
+Expensive values go through get_or_compute (or aget_or_compute for
+coroutines), which guards against stampedes:
+
+    per-key lock   - one caller computes a missing or expired value; the
+                     others wait for it. The lock is an atomic add() on Redis
+                     (or any other backend), and a lock file created with
+                     O_CREAT | O_EXCL next to the file cache, whose add() is a
+                     separate existence check and write
+    early refresh  - a caller may recompute shortly before expiry, with a
+                     probability that grows as expiry nears and with how long
+                     the value took to compute
+    stale serving  - entries outlive their timeout by stale_ttl seconds;
+                     while one caller refreshes, the rest get the stale value
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+
+logger = logging.getLogger(__name__)
+
+SHARED_ALIAS = 'shared'
+MAX_KEY_LENGTH = 200
+
+_DATACLASS_TAG = '__dataclass__'
+_TUPLE_TAG = '__tuple__'
+_DATETIME_TAG = '__datetime__'
+
+_dataclasses: Dict[str, type] = {}
+_MISSING = object()
+_NO_LOCK = object()
+
+STAT_EVENTS = (
+    'local_hits', 'shared_hits', 'stale_hits', 'misses', 'early_refreshes',
+    'lock_waits', 'sets', 'errors',
+)
+
+
+def _dataclass_name(cls: type) -> str:
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def register_dataclass(cls: type) -> type:
+    """Class decorator: allow instances of this dataclass in cached values"""
+    _dataclasses[_dataclass_name(cls)] = cls
+    return cls
+
+
+def _encode(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        name = _dataclass_name(type(value))
+        if name not in _dataclasses:
+            raise TypeError(f"Dataclass {name} is not registered for caching")
+        return {
+            _DATACLASS_TAG: name,
+            'fields': {field.name: _encode(getattr(value, field.name)) for field in dataclasses.fields(value)},
+        }
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_encode(item) for item in value]}
+    if isinstance(value, (list, set, frozenset)):
+        return [_encode(item) for item in value]
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        # numpy scalars
+        return value.item()
+    return value
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    if _DATACLASS_TAG in obj:
+        cls = _dataclasses.get(obj[_DATACLASS_TAG])
+        if cls is None:
+            raise ValueError(f"Unknown cached dataclass {obj[_DATACLASS_TAG]}")
+        init_fields = {field.name for field in dataclasses.fields(cls) if field.init}
+        instance = cls(**{name: value for name, value in obj['fields'].items() if name in init_fields})
+        for name, value in obj['fields'].items():
+            if name not in init_fields:
+                setattr(instance, name, value)
+        return instance
+    if _TUPLE_TAG in obj:
+        return tuple(obj[_TUPLE_TAG])
+    if _DATETIME_TAG in obj:
+        return datetime.fromisoformat(obj[_DATETIME_TAG])
+    return obj
+
+
+def dumps(value: Any) -> str:
+    """Serialize a cacheable value to JSON text"""
+    return json.dumps(_encode(value), ensure_ascii=False, separators=(',', ':'))
+
+
+def loads(text: str) -> Any:
+    """Inverse of dumps"""
+    return json.loads(text, object_hook=_decode_object)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires: Optional[float]  # Epoch seconds the value is fresh until; None = no expiry
+    delta: float  # Seconds the value took to compute
+
+    def is_fresh(self, now: float) -> bool:
+        return self.expires is None or now < self.expires
+
+    def refresh_early(self, now: float, beta: float) -> bool:
+        """Probabilistic early expiration: likelier as expiry nears and for slow computations"""
+        if self.expires is None or not self.delta:
+            return False
+        return now - self.delta * beta * math.log(1.0 - random.random()) >= self.expires
+
+
+def _pack(value: Any, timeout: Optional[int], delta: float) -> str:
+    expires = time.time() + timeout if timeout is not None else None
+    return json.dumps({'v': _encode(value), 'e': expires, 'd': delta}, ensure_ascii=False, separators=(',', ':'))
+
+
+def _unpack(text: str) -> _Entry:
+    data = json.loads(text, object_hook=_decode_object)
+    return _Entry(data['v'], data['e'], data['d'])
+
+
+class _LocalLRU:
+    """Thread-safe LRU of serialized values with per-entry expiry"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, text = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def set(self, key: str, text: str, ttl: float) -> None:
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_local_lru: Optional[_LocalLRU] = None
+_local_lock = threading.Lock()
+_stats: Dict[str, Counter] = defaultdict(Counter)
+_stats_lock = threading.Lock()
+
+
+def _local() -> _LocalLRU:
+    global _local_lru
+    if _local_lru is None:
+        with _local_lock:
+            if _local_lru is None:
+                _local_lru = _LocalLRU(getattr(settings, 'TIERED_CACHE_LOCAL_SIZE', 2048))
+    return _local_lru
+
+
+def _shared():
+    return caches[SHARED_ALIAS if SHARED_ALIAS in settings.CACHES else 'default']
+
+
+def _lock_path(backend: FileBasedCache, lock_key: str) -> str:
+    return os.path.join(backend._dir, 'locks', hashlib.sha256(lock_key.encode()).hexdigest() + '.lock')
+
+
+def _add_lock(lock_key: str, token: str, timeout: int) -> bool:
+    """Atomically take lock_key for timeout seconds; False if someone holds it"""
+    backend = _shared()
+    if not isinstance(backend, FileBasedCache):
+        return backend.add(lock_key, token, timeout)
+
+    path = _lock_path(backend, lock_key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            try:
+                expired = os.path.getmtime(path) + timeout < time.time()
+            except FileNotFoundError:
+                continue  # Released meanwhile
+            if not expired:
+                return False
+            # The holder died or overran; take over its lock (racing takers at worst both compute)
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, 'w') as lock_file:
+            lock_file.write(token)
+        return True
+    return False
+
+
+def _lock_holder(lock_key: str) -> Optional[str]:
+    backend = _shared()
+    if not isinstance(backend, FileBasedCache):
+        return backend.get(lock_key)
+    try:
+        with open(_lock_path(backend, lock_key)) as lock_file:
+            return lock_file.read()
+    except FileNotFoundError:
+        return None
+
+
+def _release_lock(lock_key: str, token: str) -> None:
+    # A lock that timed out may belong to someone else by now
+    if _lock_holder(lock_key) != token:
+        return
+    backend = _shared()
+    if not isinstance(backend, FileBasedCache):
+        backend.delete(lock_key)
+        return
+    try:
+        os.unlink(_lock_path(backend, lock_key))
+    except FileNotFoundError:
+        pass
+
+
+def _count(namespace: str, event: str) -> None:
+    with _stats_lock:
+        _stats[namespace][event] += 1
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Per-namespace hit, miss, refresh and lock counts in this process"""
+    with _stats_lock:
+        namespaces = {}
+        for namespace, counts in _stats.items():
+            hits = counts['local_hits'] + counts['shared_hits'] + counts['stale_hits']
+            lookups = hits + counts['misses'] + counts['early_refreshes']
+            namespaces[namespace] = {
+                **{event: counts[event] for event in STAT_EVENTS},
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
+    return {'local_entries': len(_local()), 'namespaces': namespaces}
+
+
+def clear_local_cache() -> None:
+    """Drop this process's local tier (the shared tier is untouched)"""
+    _local().clear()
+
+
+class TieredCache:
+    """
+    One namespace of the tiered cache. timeout (seconds) is how long values
+    are fresh; the shared tier keeps them stale_ttl seconds longer for
+    get_or_compute to serve during a refresh. The local tier keeps entries
+    for at most TIERED_CACHE_LOCAL_TTL.
+    """
+
+    def __init__(self, namespace: str, version: str = 'v1', timeout: int = 300,
+                 stale_ttl: int = 0, beta: float = 1.0):
+        self.namespace = namespace
+        self.version = version
+        self.timeout = timeout
+        self.stale_ttl = stale_ttl
+        self.beta = beta
+
+    def make_key(self, key: Any) -> str:
+        full_key = f'{self.namespace}:{self.version}:{key}'
+        if len(full_key) <= MAX_KEY_LENGTH:
+            return full_key
+        return f'{self.namespace}:{self.version}:sha256:{hashlib.sha256(str(key).encode()).hexdigest()}'
+
+    # Tiers
+
+    def _read_shared(self, full_key: str) -> Optional[_Entry]:
+        try:
+            text = _shared().get(full_key)
+        except Exception as e:
+            logger.warning(f"Shared cache get failed for {full_key}: {e}")
+            _count(self.namespace, 'errors')
+            return None
+        if text is None:
+            return None
+        entry = self._unpack(full_key, text)
+        if entry is not None:
+            _local().set(full_key, text, self._local_ttl(entry))
+        return entry
+
+    def _read(self, full_key: str) -> Tuple[Optional[_Entry], str]:
+        """The entry, fresh or stale, and the tier it came from"""
+        local_entry = None
+        text = _local().get(full_key)
+        if text is not None:
+            local_entry = self._unpack(full_key, text)
+            if local_entry is not None and local_entry.is_fresh(time.time()):
+                return local_entry, 'local'
+        # Another worker may have refreshed a value this process holds stale
+        entry = self._read_shared(full_key)
+        if entry is None and local_entry is not None:
+            return local_entry, 'local'
+        return entry, 'shared'
+
+    def _unpack(self, full_key: str, text: str) -> Optional[_Entry]:
+        try:
+            return _unpack(text)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Dropping undecodable cache entry {full_key}: {e}")
+            _count(self.namespace, 'errors')
+            _local().delete(full_key)
+            return None
+
+    def _local_ttl(self, entry: _Entry) -> float:
+        local_ttl = getattr(settings, 'TIERED_CACHE_LOCAL_TTL', 60)
+        if entry.expires is None:
+            return local_ttl
+        return min(local_ttl, entry.expires + self.stale_ttl - time.time())
+
+    def _write(self, full_key: str, value: Any, timeout: Optional[int], delta: float = 0.0) -> None:
+        try:
+            text = _pack(value, timeout, delta)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Value for {full_key} is not cacheable: {e}")
+            _count(self.namespace, 'errors')
+            return
+
+        entry = _Entry(None, time.time() + timeout if timeout is not None else None, delta)
+        _local().set(full_key, text, self._local_ttl(entry))
+        try:
+            _shared().set(full_key, text, timeout + self.stale_ttl if timeout is not None else None)
+        except Exception as e:
+            logger.warning(f"Shared cache set failed for {full_key}: {e}")
+            _count(self.namespace, 'errors')
+        _count(self.namespace, 'sets')
+
+    # Locks
+
+    def _lock(self, full_key: str) -> Any:
+        """A token if this caller now holds the key's refresh lock, else None"""
+        token = uuid.uuid4().hex
+        try:
+            if _add_lock(f'{full_key}:lock', token, getattr(settings, 'TIERED_CACHE_LOCK_TIMEOUT', 60)):
+                return token
+            return None
+        except Exception as e:
+            logger.warning(f"Shared cache lock failed for {full_key}: {e}")
+            _count(self.namespace, 'errors')
+            return _NO_LOCK
+
+    def _unlock(self, full_key: str, token: Any) -> None:
+        if token is None or token is _NO_LOCK:
+            return
+        try:
+            _release_lock(f'{full_key}:lock', token)
+        except Exception as e:
+            logger.warning(f"Shared cache unlock failed for {full_key}: {e}")
+
+    def _poll(self, full_key: str) -> Tuple[Optional[_Entry], bool]:
+        """One wait step: (fresh entry or None, whether to stop waiting)"""
+        entry = self._read_shared(full_key)
+        if entry is not None and entry.is_fresh(time.time()):
+            _count(self.namespace, 'shared_hits')
+            return entry, True
+        try:
+            locked = _lock_holder(f'{full_key}:lock') is not None
+        except Exception:
+            locked = False
+        return None, not locked
+
+    def _wait_steps(self):
+        """Poll intervals until TIERED_CACHE_LOCK_WAIT seconds have passed"""
+        deadline = time.monotonic() + getattr(settings, 'TIERED_CACHE_LOCK_WAIT', 30)
+        interval = 0.05
+        while time.monotonic() < deadline:
+            yield interval
+            interval = min(interval * 2, 0.5)
+
+    def _begin(self, full_key: str) -> Tuple[Any, Any, bool]:
+        """
+        Decide what a get_or_compute caller does: (value to serve or _MISSING,
+        lock token, whether to wait for another caller's computation).
+        """
+        entry, tier = self._read(full_key)
+        now = time.time()
+        if entry is not None and entry.is_fresh(now) and not entry.refresh_early(now, self.beta):
+            _count(self.namespace, f'{tier}_hits')
+            return entry.value, None, False
+
+        token = self._lock(full_key)
+        if token is None:
+            if entry is not None:
+                # Someone else is refreshing; serve what we have meanwhile
+                _count(self.namespace, f'{tier}_hits' if entry.is_fresh(now) else 'stale_hits')
+                return entry.value, None, False
+            _count(self.namespace, 'lock_waits')
+            return _MISSING, None, True
+
+        if entry is None:
+            # The previous holder may have written it between our read and the lock
+            entry = self._read_shared(full_key)
+            if entry is not None and entry.is_fresh(time.time()):
+                self._unlock(full_key, token)
+                _count(self.namespace, 'shared_hits')
+                return entry.value, None, False
+        _count(self.namespace, 'misses' if entry is None or not entry.is_fresh(now) else 'early_refreshes')
+        return _MISSING, token, False
+
+    def _finish(self, full_key: str, value: Any, started: float, timeout: Optional[int],
+                should_cache: Optional[Callable[[Any], bool]]) -> None:
+        if should_cache is None or should_cache(value):
+            self._write(full_key, value, timeout, time.monotonic() - started)
+
+    # Public API
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """The fresh value for key, or default"""
+        full_key = self.make_key(key)
+        entry, tier = self._read(full_key)
+        if entry is None or not entry.is_fresh(time.time()):
+            _count(self.namespace, 'misses')
+            return default
+        _count(self.namespace, f'{tier}_hits')
+        return entry.value
+
+    def set(self, key: Any, value: Any, timeout: Optional[int] = _MISSING) -> None:
+        self._write(self.make_key(key), value, self.timeout if timeout is _MISSING else timeout)
+
+    def delete(self, key: Any) -> None:
+        full_key = self.make_key(key)
+        _local().delete(full_key)
+        try:
+            _shared().delete(full_key)
+        except Exception as e:
+            logger.warning(f"Shared cache delete failed for {full_key}: {e}")
+
+    def get_or_compute(self, key: Any, compute: Callable[[], Any], timeout: Optional[int] = _MISSING,
+                       should_cache: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Cached value for key, computed by one caller at a time on a miss or
+        refresh. Results failing should_cache are returned but not stored.
+        """
+        timeout = self.timeout if timeout is _MISSING else timeout
+        full_key = self.make_key(key)
+        value, token, wait = self._begin(full_key)
+        if wait:
+            for interval in self._wait_steps():
+                time.sleep(interval)
+                entry, done = self._poll(full_key)
+                if entry is not None:
+                    return entry.value
+                if done:
+                    break
+            # The other caller failed or is too slow: compute without the lock
+        elif value is not _MISSING:
+            return value
+
+        try:
+            started = time.monotonic()
+            value = compute()
+            self._finish(full_key, value, started, timeout, should_cache)
+            return value
+        finally:
+            self._unlock(full_key, token)
+
+    async def aget_or_compute(self, key: Any, compute: Callable[[], Awaitable[Any]],
+                              timeout: Optional[int] = _MISSING,
+                              should_cache: Optional[Callable[[Any], bool]] = None) -> Any:
+        """get_or_compute for a coroutine function; cache I/O runs off the event loop"""
+        timeout = self.timeout if timeout is _MISSING else timeout
+        full_key = self.make_key(key)
+        value, token, wait = await sync_to_async(self._begin, thread_sensitive=False)(full_key)
+        if wait:
+            for interval in self._wait_steps():
+                await asyncio.sleep(interval)
+                entry, done = await sync_to_async(self._poll, thread_sensitive=False)(full_key)
+                if entry is not None:
+                    return entry.value
+                if done:
+                    break
+        elif value is not _MISSING:
+            return value
+
+        try:
+            started = time.monotonic()
+            value = await compute()
+            await sync_to_async(self._finish, thread_sensitive=False)(full_key, value, started, timeout, should_cache)
+            return value
+        finally:
+            await sync_to_async(self._unlock, thread_sensitive=False)(full_key, token)
@@ -1,7 +1,15 @@
 from django.shortcuts import render
 from django.apps import apps
+from django.http import JsonResponse
+import os
 import random
 
+from accounts.decorators import jwt_login_required
+from resumes.analysis_store import analysis_store_stats
+from .executors import executor_stats
+from .request_timing import timing_stats
+from .tiered_cache import cache_stats
+
 # Dynamically load models to avoid circular imports
 JobMatch = apps.get_model('jobs', 'JobMatch')
 Resume = apps.get_model('resumes', 'Resume')
@@ -58,3 +66,35 @@ def home_view(request):
             context['ai_tip'] = random.choice(CAREER_TIPS)
     
     return render(request, 'home.html', context)
+
+
+@jwt_login_required
+def executor_stats_api(request):
+    """Queue depth and active counts of this process's shared thread pools (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required'}, status=403)
+    return JsonResponse({'pid': os.getpid(), 'executors': executor_stats()})
+
+
+@jwt_login_required
+def cache_stats_api(request):
+    """Hit and miss counts per tiered cache namespace in this process (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required'}, status=403)
+    return JsonResponse({'pid': os.getpid(), 'cache': cache_stats()})
+
+
+@jwt_login_required
+def request_timing_stats_api(request):
+    """Per-view histograms of request and stage timings in this process (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required'}, status=403)
+    return JsonResponse({'pid': os.getpid(), 'views': timing_stats()})
+
+
+@jwt_login_required
+def analysis_store_stats_api(request):
+    """Entries, hits and hit rate of the durable resume analysis store (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required'}, status=403)
+    return JsonResponse({'pid': os.getpid(), 'analysis_store': analysis_store_stats()})
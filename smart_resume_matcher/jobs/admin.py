@@ -1,13 +1,23 @@
 from django.contrib import admin
-from .models import Job, JobMatch, JobSearch, JobApplication
+from .models import (
+    Job, JobMatch, JobSearch, JobSearchDailyAggregate, JobApplication, MatchScoreMemo, Skill, SkillAlias
+)
+from .search import filter_jobs
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ('title', 'company_name', 'location', 'salary_range', 'published_at', 'is_active')
     list_filter = ('employment_type', 'location', 'published_at', 'is_active')
-    search_fields = ('title', 'company_name', 'hh_id')
+    search_fields = ('company_name', 'hh_id')
     readonly_fields = ('hh_id', 'hh_url', 'published_at', 'created_at', 'updated_at')
     
+    def get_search_results(self, request, queryset, search_term):
+        """Company and HH id lookups, plus a full-text match on the job text"""
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            results |= filter_jobs(queryset, search_term.split())
+        return results, may_have_duplicates
+    
     fieldsets = (
         ('Basic Information', {
             'fields': ('hh_id', 'title', 'company_name', 'company_url', 'hh_url')
@@ -47,6 +57,13 @@ class JobSearchAdmin(admin.ModelAdmin):
     search_fields = ('user__email', 'search_query')
     readonly_fields = ('started_at', 'completed_at', 'total_found', 'jobs_analyzed', 'matches_found')
 
+@admin.register(JobSearchDailyAggregate)
+class JobSearchDailyAggregateAdmin(admin.ModelAdmin):
+    list_display = ('user', 'day', 'searches', 'completed_searches', 'matches_found')
+    list_filter = ('day',)
+    search_fields = ('user__email',)
+    readonly_fields = ('user', 'day', 'searches', 'completed_searches', 'total_found', 'jobs_analyzed', 'matches_found')
+
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
     list_display = ('user', 'job_title', 'status', 'applied_date', 'last_status_update')
@@ -56,4 +73,22 @@ class JobApplicationAdmin(admin.ModelAdmin):
     
     def job_title(self, obj):
         return obj.job.title
-    job_title.short_description = 'Job Title'
\ No newline at end of file
+    job_title.short_description = 'Job Title'
+
+@admin.register(MatchScoreMemo)
+class MatchScoreMemoAdmin(admin.ModelAdmin):
+    list_display = ('scorer', 'scorer_version', 'resume_hash', 'job_hash', 'score', 'created_at')
+    list_filter = ('scorer', 'scorer_version')
+    search_fields = ('resume_hash', 'job_hash')
+    readonly_fields = ('resume_hash', 'job_hash', 'scorer', 'scorer_version', 'score', 'details', 'created_at')
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('display_name', 'name', 'category')
+    list_filter = ('category',)
+    search_fields = ('name', 'display_name', 'aliases__alias')
+    inlines = [SkillAliasInline]
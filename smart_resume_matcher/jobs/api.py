@@ -1,13 +1,17 @@
+import logging
+
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 from django.contrib.auth.decorators import login_required
 from django.apps import apps
 from accounts.decorators import jwt_login_required
-import html
-import re
+
+logger = logging.getLogger(__name__)
 
 # Get the model dynamically to avoid circular imports
 Job = apps.get_model('jobs', 'Job')
+JobMatch = apps.get_model('jobs', 'JobMatch')
+Resume = apps.get_model('resumes', 'Resume')
 
 @jwt_login_required
 @require_GET
@@ -19,8 +23,8 @@ def get_formatted_job_description(request, job_id):
     """
     try:
         job = Job.objects.get(id=job_id)
-        description = format_description_text(job.description)
-        requirements = format_description_text(job.requirements)
+        description = job.get_structured_description()
+        requirements = job.get_structured_requirements()
         
         return JsonResponse({
             'success': True,
@@ -39,40 +43,85 @@ def get_formatted_job_description(request, job_id):
             'error': 'An error occurred while formatting the job description'
         }, status=500)
 
-def format_description_text(text):
+@jwt_login_required
+@require_GET
+def search_jobs_api(request):
     """
-    Format job description text to be more user-friendly
+    Ranked full-text search over stored jobs.
+    ?q= keywords (all must match), ?mode=any to match any keyword, ?limit= up to 100.
     """
-    if not text:
-        return ""
+    from .search import ALL, ANY, search_jobs
     
-    # Unescape HTML entities
-    text = html.unescape(text)
-    
-    # Process specific formatting patterns
-    # Handle paragraphs and sections
-    text = re.sub(r'<p>\s*<strong>(.*?)</strong>\s*</p>', r'\n\n## \1\n', text, flags=re.DOTALL)
+    query = request.GET.get('q', '').strip()
+    mode = ANY if request.GET.get('mode') == ANY else ALL
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 100))
+    except ValueError:
+        limit = 20
     
-    # Process lists
-    text = re.sub(r'<ul>(.*?)</ul>', process_list, text, flags=re.DOTALL)
+    if not query:
+        return JsonResponse({
+            'success': False,
+            'error': 'Missing search query'
+        }, status=400)
     
-    # Remove remaining HTML tags
-    text = re.sub(r'<[^>]*>', ' ', text)
+    try:
+        jobs = search_jobs(query.split(), mode=mode, limit=limit)
+        return JsonResponse({
+            'success': True,
+            'query': query,
+            'results': [{
+                'id': job.id,
+                'title': job.title,
+                'company': job.company_name,
+                'location': job.location,
+                'published_at': job.published_at.isoformat() if job.published_at else None,
+                'rank': job.search_rank,
+            } for job in jobs]
+        })
+    except Exception:
+        logger.exception(f"Job search failed for {query!r}")
+        return JsonResponse({
+            'success': False,
+            'error': 'An error occurred while searching jobs'
+        }, status=500)
+
+@jwt_login_required
+@require_GET
+def job_match_insights_api(request, job_id):
+    """
+    Skill gaps, learning path and alternative roles for the user's match with
+    a job, from the stored resume analysis and match breakdown. Built on first
+    request and cached by analysis and job content.
+    """
+    from dataclasses import asdict
+    from resumes.enhanced_job_matcher import AdvancedJobMatcher
     
-    # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n\s*\n+', '\n\n', text)
+    resume = Resume.objects.filter(user=request.user, is_active=True).first()
+    job_match = JobMatch.objects.select_related('job').filter(job_id=job_id, resume=resume).first() if resume else None
+    if job_match is None:
+        return JsonResponse({
+            'success': False,
+            'error': 'Job match not found'
+        }, status=404)
     
-    # Trim whitespace
-    return text.strip()
-
-def process_list(match):
-    """Process <ul> list into formatted bullet points"""
-    list_content = match.group(1)
-    items = re.findall(r'<li>(.*?)</li>', list_content, re.DOTALL)
+    try:
+        insights = AdvancedJobMatcher(request.user, resume).stored_match_insights(job_match)
+    except Exception:
+        logger.exception(f"Match insights failed for job {job_id}, resume {resume.id}")
+        return JsonResponse({
+            'success': False,
+            'error': 'An error occurred while building match insights'
+        }, status=500)
     
-    formatted_list = '\n'
-    for item in items:
-        formatted_list += f"• {item.strip()}\n"
+    if insights is None:
+        return JsonResponse({
+            'success': False,
+            'error': 'Resume analysis is not available yet'
+        }, status=409)
     
-    return formatted_list
+    return JsonResponse({
+        'success': True,
+        'job_id': job_id,
+        'insights': asdict(insights)
+    })
@@ -6,7 +6,4 @@ class JobsConfig(AppConfig):
     name = 'jobs'
     
     def ready(self):
-        # Placeholder for future signal handlers
-        # If you add a signals.py file, uncomment the line below
-        # import jobs.signals  # noqa
-        pass
+        import jobs.signals  # noqa
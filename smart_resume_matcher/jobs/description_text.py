@@ -0,0 +1,122 @@
+"""
+Job description sanitizers.
+
+HH.ru descriptions arrive as HTML. Two renderings are derived from them:
+
+    display text     - plain text with headings and bullet points, shown in
+                       job lists and on the detail page (clean_html_description)
+    structured text  - "## " headings and "• " bullets, served by the
+                       job-description API (format_description_text)
+
+Job stores both, computed on save, so pages and the API do not rerun the
+regex passes on every render. Bump DESCRIPTION_TEXT_VERSION when either
+rendering changes and run the backfill_job_text command.
+"""
+
+import html
+import re
+
+DESCRIPTION_TEXT_VERSION = 1
+
+_HEADING_SECTIONS = (
+    ('Кто мы и чем занимаемся:', '\nAbout Us:'),
+    ('Наши проекты:', '\nOur Projects:'),
+    ('Тогда мы ищем именно ВАС!', '\nWe are looking for YOU!'),
+    ('Здесь вы научитесь:', '\nWhat You Will Learn:'),
+    ('Вы должны знать:', '\nRequired Skills:'),
+)
+
+
+def clean_html_description(value):
+    """
+    Properly format and clean HTML job descriptions.
+    Removes HTML tags and formats line breaks for better readability.
+    """
+    if not value:
+        return ""
+
+    # Special handling for the job description format seen in the screenshot
+    # First check for common patterns in the data
+    if '<p>' in value and '<strong>' in value and '</strong>' in value:
+        # Unescape HTML entities first
+        value = html.unescape(value)
+
+        # Process headings and important text
+        value = re.sub(r'<p><strong>(.*?)</strong></p>', r'\n\n\1:\n', value, flags=re.DOTALL)
+
+        # Convert <p> tags to paragraphs with line breaks
+        value = re.sub(r'<p[^>]*>(.*?)</p>', r'\1\n\n', value, flags=re.DOTALL)
+
+        # Convert <ul> and <li> to bullet points
+        value = re.sub(r'<ul[^>]*>(.*?)</ul>', r'\n\1', value, flags=re.DOTALL)
+        value = re.sub(r'<li[^>]*>(.*?)</li>', r'• \1\n', value, flags=re.DOTALL)
+
+        # Convert <strong> and <b> to make text stand out
+        value = re.sub(r'<(strong|b)[^>]*>(.*?)</\1>', r'\2', value, flags=re.DOTALL)
+
+        # Remove all other HTML tags
+        value = re.sub(r'<[^>]*>', ' ', value)
+
+        # Fix multiple spaces and line breaks
+        value = re.sub(r' +', ' ', value)
+        value = re.sub(r'\n{3,}', '\n\n', value)
+
+        # Handle specific content formatting
+        for original, replacement in _HEADING_SECTIONS:
+            value = value.replace(original, replacement)
+
+        # Trim leading/trailing whitespace
+        value = value.strip()
+    else:
+        # Default handling for other formats
+        # Unescape HTML entities first
+        value = html.unescape(value)
+
+        # Remove HTML tags
+        value = re.sub(r'<[^>]*>', ' ', value)
+
+        # Fix spaces
+        value = re.sub(r' +', ' ', value)
+        value = value.strip()
+
+    return value
+
+
+def format_description_text(text):
+    """
+    Format job description text to be more user-friendly
+    """
+    if not text:
+        return ""
+
+    # Unescape HTML entities
+    text = html.unescape(text)
+
+    # Process specific formatting patterns
+    # Handle paragraphs and sections
+    text = re.sub(r'<p>\s*<strong>(.*?)</strong>\s*</p>', r'\n\n## \1\n', text, flags=re.DOTALL)
+
+    # Process lists
+    text = re.sub(r'<ul>(.*?)</ul>', process_list, text, flags=re.DOTALL)
+
+    # Remove remaining HTML tags
+    text = re.sub(r'<[^>]*>', ' ', text)
+
+    # Clean up whitespace
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n\s*\n+', '\n\n', text)
+
+    # Trim whitespace
+    return text.strip()
+
+
+def process_list(match):
+    """Process <ul> list into formatted bullet points"""
+    list_content = match.group(1)
+    items = re.findall(r'<li>(.*?)</li>', list_content, re.DOTALL)
+
+    formatted_list = '\n'
+    for item in items:
+        formatted_list += f"• {item.strip()}\n"
+
+    return formatted_list
@@ -4,12 +4,18 @@ Enhanced HH API Client for fetching jobs from HH.ru and HH.kz
 import requests
 import logging
 from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 import time
 from dataclasses import dataclass
 
+from core.executors import io_executor
+from core.request_timing import HH, stage
+from core.tiered_cache import register_dataclass
+from .services import HH_SEARCH_CACHE
+
 logger = logging.getLogger(__name__)
 
+@register_dataclass
 @dataclass
 class JobData:
     """Data class to represent a job from HH API"""
@@ -169,7 +175,8 @@ class EnhancedHHApiClient:
             url = f"{base_url}/vacancies"
             logger.info(f"Fetching jobs from {source} with params: {params}")
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            with stage(HH):
+                response = requests.get(url, headers=self.headers, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -196,12 +203,21 @@ class EnhancedHHApiClient:
     def search_jobs_realtime(self, search_query: str = '', location: str = '', 
                            per_page: int = 50, max_total: int = 100) -> List[JobData]:
         """
-        Fetch fresh jobs from both HH.ru and HH.kz APIs in real-time
+        Fetch fresh jobs from both HH.ru and HH.kz APIs in real-time.
+        Results are shared through HH_SEARCH_CACHE; empty results (both APIs
+        failing or finding nothing) are not cached.
         """
-        logger.info(f"Starting real-time job search: query='{search_query}', location='{location}'")
-        
-        # Resolve location
         area_id = self._resolve_location(location)
+        cache_key = f"realtime:{area_id}:{per_page}:{max_total}:{search_query.strip().lower()}"
+        return HH_SEARCH_CACHE.get_or_compute(
+            cache_key,
+            lambda: self._search_jobs_realtime(search_query, area_id, per_page, max_total),
+            should_cache=bool,
+        )
+    
+    def _search_jobs_realtime(self, search_query: str, area_id: str, per_page: int, max_total: int) -> List[JobData]:
+        """Uncached search_jobs_realtime"""
+        logger.info(f"Starting real-time job search: query='{search_query}', area='{area_id}'")
         
         # Base search parameters
         base_params = {
@@ -219,29 +235,30 @@ class EnhancedHHApiClient:
         
         all_jobs = []
         
-        # Fetch from both APIs concurrently
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit tasks for both APIs
-            future_ru = executor.submit(
-                self._fetch_jobs_from_api, 
-                self.HH_RU_BASE, 
-                ru_params, 
-                'hh.ru'
-            )
-            future_kz = executor.submit(
-                self._fetch_jobs_from_api, 
-                self.HH_KZ_BASE, 
-                kz_params, 
-                'hh.kz'
-            )
-            
-            # Collect results
-            for future in as_completed([future_ru, future_kz]):
-                try:
-                    jobs = future.result()
-                    all_jobs.extend(jobs)
-                except Exception as e:
-                    logger.error(f"Error fetching jobs: {e}")
+        # Fetch from both APIs concurrently on the shared io pool
+        executor = io_executor()
+        
+        # Submit tasks for both APIs
+        future_ru = executor.submit(
+            self._fetch_jobs_from_api, 
+            self.HH_RU_BASE, 
+            ru_params, 
+            'hh.ru'
+        )
+        future_kz = executor.submit(
+            self._fetch_jobs_from_api, 
+            self.HH_KZ_BASE, 
+            kz_params, 
+            'hh.kz'
+        )
+        
+        # Collect results
+        for future in as_completed([future_ru, future_kz]):
+            try:
+                jobs = future.result()
+                all_jobs.extend(jobs)
+            except Exception as e:
+                logger.error(f"Error fetching jobs: {e}")
         
         # Remove duplicates based on title and company
         unique_jobs = []
@@ -268,7 +285,8 @@ class EnhancedHHApiClient:
         
         try:
             url = f"{base_url}/vacancies/{job_id}"
-            response = requests.get(url, headers=self.headers, timeout=30)
+            with stage(HH):
+                response = requests.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -10,6 +10,10 @@ from typing import List, Dict, Any, Tuple, Optional, Set
 from django.utils import timezone
 from django.apps import apps
 from .services import HHApiClient
+from core.ranking import TopK
+from core.request_timing import SCORING, stage
+from .score_memo import ScoreMemo, content_hash
+from accounts.dashboard_summary import refresh_summary_on_commit
 from resumes.universal_skills import (
     UNIVERSAL_SKILLS_DATABASE, 
     identify_profession_category,
@@ -25,6 +29,49 @@ JobSearch = apps.get_model('jobs', 'JobSearch')
 
 logger = logging.getLogger(__name__)
 
+def extract_job_skills(job_data: Dict[str, Any]) -> Set[str]:
+    """
+    Extract skills from job description and requirements using universal skills database
+    
+    Args:
+        job_data: Job dictionary containing description and requirements
+    
+    Returns:
+        Set of extracted skills across all professions
+    """
+    if not job_data:
+        return set()
+        
+    # Safely get nested dict values
+    snippet_req = job_data.get('snippet', {}).get('requirement', '') if job_data.get('snippet') else ''
+    snippet_resp = job_data.get('snippet', {}).get('responsibility', '') if job_data.get('snippet') else ''
+    
+    # Combine description and requirements, ensuring all values are strings
+    text_parts = [
+        job_data.get('description') or '',
+        job_data.get('requirements') or '',
+        snippet_req or '',
+        snippet_resp or ''
+    ]
+    # Filter out None values and empty strings, then join
+    full_text = ' '.join([str(part) for part in text_parts if part]).lower()
+    
+    # Extract skills from all profession categories
+    skills = set()
+    
+    # Check each profession category and extract matching skills
+    for subcategories in UNIVERSAL_SKILLS_DATABASE.values():
+        for skill_list in subcategories.values():
+            for skill in skill_list:
+                # Create regex pattern for skill matching
+                skill_lower = skill.lower()
+                # Replace special characters and create word boundary pattern
+                pattern = r'\b' + re.escape(skill_lower).replace(r'\ ', r'[ -]?') + r'\b'
+                if re.search(pattern, full_text):
+                    skills.add(skill_lower)
+            
+    return skills
+
 class JobMatcher:
     """
     AI-powered job matching functionality that:
@@ -34,6 +81,11 @@ class JobMatcher:
     - Supports healthcare, legal, education, finance, and all other professions
     """
     
+    # Bump SCORER_VERSION whenever calculate_match_score changes so memoized
+    # scores from the old version stop being served
+    SCORER_NAME = 'job_matcher'
+    SCORER_VERSION = 'v1'
+    
     def __init__(self, user=None, resume=None):
         """
         Initialize the JobMatcher with user and resume
@@ -45,6 +97,7 @@ class JobMatcher:
         self.user = user
         self.resume = resume
         self.api_client = HHApiClient()
+        self.score_memo = ScoreMemo(self.SCORER_NAME, self.SCORER_VERSION)
         
     def fetch_relevant_jobs(self, search_query: str, location: Optional[str] = None, 
                            page: int = 0, per_page: int = 20) -> List[Dict[str, Any]]:
@@ -111,51 +164,33 @@ class JobMatcher:
         return "professional"
     
     def _extract_skills_from_job(self, job_data: Dict[str, Any]) -> Set[str]:
-        """
-        Extract skills from job description and requirements using universal skills database
-        
-        Args:
-            job_data: Job dictionary containing description and requirements
-        
-        Returns:
-            Set of extracted skills across all professions
-        """
-        if not job_data:
-            return set()
-            
-        # Safely get nested dict values
-        snippet_req = job_data.get('snippet', {}).get('requirement', '') if job_data.get('snippet') else ''
-        snippet_resp = job_data.get('snippet', {}).get('responsibility', '') if job_data.get('snippet') else ''
-        
-        # Combine description and requirements, ensuring all values are strings
-        text_parts = [
-            job_data.get('description') or '',
-            job_data.get('requirements') or '',
-            snippet_req or '',
-            snippet_resp or ''
-        ]
-        # Filter out None values and empty strings, then join
-        full_text = ' '.join([str(part) for part in text_parts if part]).lower()
-        
-        # Extract skills from all profession categories
-        skills = set()
-        
-        # Check each profession category and extract matching skills
-        for subcategories in UNIVERSAL_SKILLS_DATABASE.values():
-            for skill_list in subcategories.values():
-                for skill in skill_list:
-                    # Create regex pattern for skill matching
-                    skill_lower = skill.lower()
-                    # Replace special characters and create word boundary pattern
-                    pattern = r'\b' + re.escape(skill_lower).replace(r'\ ', r'[ -]?') + r'\b'
-                    if re.search(pattern, full_text):
-                        skills.add(skill_lower)
-                
-        return skills
+        """Extract skills from job description and requirements (see extract_job_skills)"""
+        return extract_job_skills(job_data)
+
+    def resume_score_hash(self) -> str:
+        """Hash of the resume fields calculate_match_score reads"""
+        return content_hash({
+            'skills': sorted({skill.lower() for skill in getattr(self.resume, 'extracted_skills', None) or []}),
+            'experience_level': (getattr(self.resume, 'experience_level', '') or '').lower(),
+        })
+
+    @staticmethod
+    def job_score_hash(job_data: Dict[str, Any]) -> str:
+        """Hash of the job fields calculate_match_score reads"""
+        snippet = job_data.get('snippet') or {}
+        return content_hash({
+            'name': job_data.get('name') or '',
+            'description': job_data.get('description') or '',
+            'requirements': job_data.get('requirements') or '',
+            'snippet_requirement': snippet.get('requirement') or '',
+            'snippet_responsibility': snippet.get('responsibility') or '',
+        })
 
     def calculate_match_score(self, job_data: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
         """
-        Calculate match score between resume and job for any profession
+        Calculate match score between resume and job for any profession.
+        Memoized per (resume inputs, job inputs, scorer version); call
+        self.score_memo.flush() after a batch to persist new scores.
         
         Args:
             job_data: Job dictionary with title, description, requirements, etc.
@@ -166,6 +201,15 @@ class JobMatcher:
         if not self.resume:
             return 0.0, {}
         
+        return self.score_memo.memoize(
+            self.resume_score_hash(),
+            self.job_score_hash(job_data),
+            lambda: self._calculate_match_score(job_data)
+        )
+
+    @stage(SCORING)
+    def _calculate_match_score(self, job_data: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
+        """Uncached score for calculate_match_score"""
         # Extract job skills using universal skills
         job_skills = self._extract_skills_from_job(job_data)
         
@@ -237,13 +281,15 @@ class JobMatcher:
             return 15
 
     def find_matching_jobs(self, search_query: Optional[str] = None, 
-                          location: Optional[str] = None) -> List[Tuple[Job, float, Dict[str, Any]]]:
+                          location: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[Tuple[Job, float, Dict[str, Any]]]:
         """
         Find, analyze and score jobs that match the resume across all professions
         
         Args:
             search_query: Job search query (if None, will generate from resume)
             location: Location string to search in (if None, will use default)
+            limit: Return only the best `limit` matches (all matches are still saved)
             
         Returns:
             List of (Job, match_score, match_details) tuples, sorted by match score
@@ -255,9 +301,13 @@ class JobMatcher:
         # Fetch job listings
         job_items = self.fetch_relevant_jobs(search_query, location)
         
-        # Process and score each job
-        job_matches = []
-        for item in job_items:
+        # Load memoized scores for these jobs in one query
+        if self.resume:
+            self.score_memo.prefetch(self.resume_score_hash(), [self.job_score_hash(item) for item in job_items])
+        
+        # Process and score each job; ties keep fetch order
+        job_matches = TopK(limit if limit is not None else len(job_items))
+        for index, item in enumerate(job_items):
             try:
                 # Create or get Job object
                 # Ensure all required fields have default values
@@ -313,13 +363,16 @@ class JobMatcher:
                         'match_score': match_score,
                         'match_details': match_details,
                         'matching_skills': match_details.get('matching_skills', []),
-                        'missing_skills': match_details.get('missing_skills', [])
+                        'missing_skills': match_details.get('missing_skills', []),
+                        'analysis_version': self.SCORER_VERSION
                     }
                 )
             
-            job_matches.append((job, match_score, match_details))
+            job_matches.push((match_score, -index), (job, match_score, match_details))
         
-        # Sort by match score (descending)
-        job_matches.sort(key=lambda x: x[1], reverse=True)
+        self.score_memo.flush()
+        if self.resume:
+            refresh_summary_on_commit(self.user)
         
-        return job_matches
+        # Best first
+        return job_matches.items()
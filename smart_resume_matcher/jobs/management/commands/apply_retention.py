@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from jobs.retention import POLICIES, run_retention
+
+
+class Command(BaseCommand):
+    help = ('Apply the retention policies: prune old job matches, compact old searches, archive inactive jobs, '
+            'expire old score memos')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', action='append', choices=POLICIES, help='Run just this policy (repeatable)')
+        parser.add_argument('--time-budget', type=float, help='Seconds to spend (0 = until done); RETENTION_TIME_BUDGET by default')
+
+    def handle(self, *args, **options):
+        result = run_retention(options['only'], options['time_budget'])
+        for key, value in result.items():
+            self.stdout.write(f'{key}: {value}')
+        if result['complete']:
+            self.stdout.write(self.style.SUCCESS('Retention policies applied'))
+        else:
+            self.stdout.write(self.style.WARNING('Time budget spent; run again to continue'))
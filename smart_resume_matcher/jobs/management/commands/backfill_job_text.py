@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from jobs.description_text import DESCRIPTION_TEXT_VERSION
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Compute the stored sanitized description fields for jobs saved before they existed or changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Jobs per bulk update')
+        parser.add_argument('--all', action='store_true', help='Recompute every job, not just stale ones')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        jobs = Job.objects.all()
+        if not options['all']:
+            jobs = jobs.exclude(text_version=DESCRIPTION_TEXT_VERSION)
+
+        fields = ['description', 'requirements', 'responsibilities']
+        updated = 0
+        last_id = 0
+        while True:
+            # Keyset batches: updated rows drop out of the stale filter, so no OFFSET
+            batch = list(jobs.filter(id__gt=last_id).order_by('id').only('id', *fields)[:batch_size])
+            if not batch:
+                break
+
+            for job in batch:
+                job.refresh_text_fields()
+            Job.objects.bulk_update(batch, list(Job.DERIVED_TEXT_FIELDS))
+
+            updated += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f'Updated {updated} jobs...')
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled sanitized text for {updated} jobs (version {DESCRIPTION_TEXT_VERSION})'))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from jobs.models import Job
+from jobs.skills import seed_skill_catalog, sync_job_skills, sync_resume_skills
+from resumes.models import Resume
+
+
+class Command(BaseCommand):
+    help = 'Seed the skill catalog and rebuild JobSkill/ResumeSkill links from the existing extractors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows loaded per query')
+        parser.add_argument('--skip-jobs', action='store_true', help='Do not rebuild job skill links')
+        parser.add_argument('--skip-resumes', action='store_true', help='Do not rebuild resume skill links')
+        parser.add_argument('--force', action='store_true',
+                            help='Rebuild job skill links even where their sources are unchanged (e.g. after alias changes)')
+
+    def handle(self, *args, **options):
+        counts = seed_skill_catalog()
+        self.stdout.write(f"Catalog: {counts['skills']} skills, {counts['aliases']} aliases")
+
+        if not options['skip_jobs']:
+            fields = ('id', 'description', 'requirements', 'responsibilities', 'required_skills', 'skills_source_hash')
+            synced = self._sync(Job.objects.only(*fields),
+                                lambda job: sync_job_skills(job, force=options['force']), options['batch_size'])
+            self.stdout.write(f'Synced skills for {synced} jobs')
+
+        if not options['skip_resumes']:
+            synced = self._sync(Resume.objects.only('id', 'extracted_skills'), sync_resume_skills, options['batch_size'])
+            self.stdout.write(f'Synced skills for {synced} resumes')
+
+        self.stdout.write(self.style.SUCCESS('Skill tables are up to date'))
+
+    def _sync(self, queryset, sync, batch_size):
+        synced = 0
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id).order_by('id')[:max(1, batch_size)])
+            if not batch:
+                return synced
+            for row in batch:
+                sync(row)
+            synced += len(batch)
+            last_id = batch[-1].id
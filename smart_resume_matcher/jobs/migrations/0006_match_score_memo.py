@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_jobmatch_analysis_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchScoreMemo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume_hash', models.CharField(max_length=64)),
+                ('job_hash', models.CharField(max_length=64)),
+                ('scorer', models.CharField(max_length=50)),
+                ('scorer_version', models.CharField(max_length=20)),
+                ('score', models.FloatField()),
+                ('details', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Match Score Memo',
+                'verbose_name_plural': 'Match Score Memos',
+                'indexes': [models.Index(fields=['scorer', 'scorer_version'], name='jobs_memo_scorer_idx')],
+                'unique_together': {('resume_hash', 'job_hash', 'scorer', 'scorer_version')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_match_score_memo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['resume', 'match_score', 'id'], name='jobs_match_resume_score_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_full_text_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='description_structured',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='description_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='requirements_structured',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='requirements_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='responsibilities_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='text_version',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
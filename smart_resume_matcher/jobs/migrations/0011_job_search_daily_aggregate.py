@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0010_skill_catalog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDailyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('searches', models.PositiveIntegerField(default=0)),
+                ('completed_searches', models.PositiveIntegerField(default=0)),
+                ('total_found', models.PositiveBigIntegerField(default=0)),
+                ('jobs_analyzed', models.PositiveBigIntegerField(default=0)),
+                ('matches_found', models.PositiveBigIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_search_aggregates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Job Search Daily Aggregate',
+                'verbose_name_plural': 'Job Search Daily Aggregates',
+                'ordering': ['-day'],
+                'unique_together': {('user', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_search_daily_aggregate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='skills_source_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
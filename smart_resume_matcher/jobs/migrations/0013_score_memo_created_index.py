@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_skills_source_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matchscorememo',
+            index=models.Index(fields=['created_at'], name='jobs_memo_created_idx'),
+        ),
+    ]
@@ -43,6 +43,26 @@ class JobSearch(models.Model):
         user_email = getattr(self.user, 'email', None)
         return f"{user_email or self.user} - {self.search_query}"
 
+class JobSearchDailyAggregate(models.Model):
+    """Per-user daily totals of JobSearch rows compacted away by the retention policy"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_search_aggregates')
+    day = models.DateField()
+
+    searches = models.PositiveIntegerField(default=0)
+    completed_searches = models.PositiveIntegerField(default=0)
+    total_found = models.PositiveBigIntegerField(default=0)
+    jobs_analyzed = models.PositiveBigIntegerField(default=0)
+    matches_found = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        verbose_name = 'Job Search Daily Aggregate'
+        verbose_name_plural = 'Job Search Daily Aggregates'
+        unique_together = ('user', 'day')
+
+    def __str__(self):
+        return f"{self.user_id} - {self.day} ({self.searches} searches)"
+
 class Job(models.Model):
     # Basic job information from HH.ru
     hh_id = models.CharField(max_length=50, unique=True)  # HH.ru job ID
@@ -73,11 +93,28 @@ class Job(models.Model):
     hh_url = models.URLField(blank=True, default='')
     published_at = models.DateTimeField(default=timezone.now)
     
+    # Sanitized renderings of the HTML fields, computed on save (see jobs.description_text)
+    description_text = models.TextField(blank=True, default='')
+    requirements_text = models.TextField(blank=True, default='')
+    responsibilities_text = models.TextField(blank=True, default='')
+    description_structured = models.TextField(blank=True, default='')
+    requirements_structured = models.TextField(blank=True, default='')
+    text_version = models.PositiveSmallIntegerField(default=0)
+    
+    # Hash of the skill sources JobSkill links were last synced from (see jobs.skills)
+    skills_source_hash = models.CharField(max_length=64, blank=True, default='')
+    
     # Our metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    SOURCE_TEXT_FIELDS = ('description', 'requirements', 'responsibilities')
+    DERIVED_TEXT_FIELDS = (
+        'description_text', 'requirements_text', 'responsibilities_text',
+        'description_structured', 'requirements_structured', 'text_version',
+    )
+    
     class Meta:
         ordering = ['-published_at']
         verbose_name = 'Job'
@@ -96,28 +133,61 @@ class Job(models.Model):
             return f"до {self.salary_to:,} {self.salary_currency}"
         return "Зарплата не указана"
         
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.refresh_text_fields()
+        elif set(update_fields) & set(self.SOURCE_TEXT_FIELDS):
+            self.refresh_text_fields()
+            kwargs['update_fields'] = set(update_fields) | set(self.DERIVED_TEXT_FIELDS)
+        super().save(*args, **kwargs)
+    
+    def refresh_text_fields(self):
+        """Recompute the sanitized description fields from the HTML ones"""
+        from .description_text import (
+            DESCRIPTION_TEXT_VERSION, clean_html_description, format_description_text
+        )
+        
+        self.description_text = clean_html_description(self.description)
+        self.requirements_text = clean_html_description(self.requirements)
+        self.responsibilities_text = clean_html_description(self.responsibilities)
+        self.description_structured = format_description_text(self.description)
+        self.requirements_structured = format_description_text(self.requirements)
+        self.text_version = DESCRIPTION_TEXT_VERSION
+    
+    def _text_is_current(self):
+        from .description_text import DESCRIPTION_TEXT_VERSION
+        return self.text_version == DESCRIPTION_TEXT_VERSION
+    
     def get_clean_description(self):
         """
         Returns a clean version of the job description with HTML tags removed
         and properly formatted for display
         """
-        import html
-        import re
-        
-        if not self.description:
-            return ""
-            
-        # Unescape HTML entities
-        value = html.unescape(self.description)
-        
-        # Remove HTML tags
-        value = re.sub(r'<[^>]*>', ' ', value)
-        
-        # Fix spaces and line breaks
-        value = re.sub(r' +', ' ', value)
-        value = re.sub(r'\n{3,}', '\n\n', value)
-        
-        return value.strip()
+        if not self._text_is_current():
+            self.refresh_text_fields()
+        return self.description_text
+    
+    def get_clean_requirements(self):
+        if not self._text_is_current():
+            self.refresh_text_fields()
+        return self.requirements_text
+    
+    def get_clean_responsibilities(self):
+        if not self._text_is_current():
+            self.refresh_text_fields()
+        return self.responsibilities_text
+    
+    def get_structured_description(self):
+        """Description with "## " headings and "• " bullets, for the job-description API"""
+        if not self._text_is_current():
+            self.refresh_text_fields()
+        return self.description_structured
+    
+    def get_structured_requirements(self):
+        if not self._text_is_current():
+            self.refresh_text_fields()
+        return self.requirements_structured
 
 class JobMatch(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_matches')
@@ -141,6 +211,10 @@ class JobMatch(models.Model):
         verbose_name = 'Job Match'
         verbose_name_plural = 'Job Matches'
         unique_together = ('job', 'resume')
+        indexes = [
+            # Keyset pagination of a resume's matches by (match_score, id)
+            models.Index(fields=['resume', 'match_score', 'id'], name='jobs_match_resume_score_idx'),
+        ]
     
     def __str__(self):
         # Use self.user directly, as JobMatch already has a user ForeignKey
@@ -204,4 +278,95 @@ class JobApplication(models.Model):
         for code, name in self.STATUS_CHOICES:
             if code == self.status:
                 return name
-        return str(self.status).title()
\ No newline at end of file
+        return str(self.status).title()
+class MatchScoreMemo(models.Model):
+    """
+    Persistent memo of (resume, job) scores keyed by content hashes of the
+    scorer's inputs and the scorer's name and version. Unchanged pairs are
+    looked up instead of rescored; bumping a scorer's version makes exactly
+    its own entries stale.
+    """
+    resume_hash = models.CharField(max_length=64)
+    job_hash = models.CharField(max_length=64)
+    scorer = models.CharField(max_length=50)
+    scorer_version = models.CharField(max_length=20)
+    
+    score = models.FloatField()
+    details = models.JSONField(default=dict, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Match Score Memo'
+        verbose_name_plural = 'Match Score Memos'
+        unique_together = ('resume_hash', 'job_hash', 'scorer', 'scorer_version')
+        indexes = [
+            models.Index(fields=['scorer', 'scorer_version'], name='jobs_memo_scorer_idx'),
+            models.Index(fields=['created_at'], name='jobs_memo_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.scorer}:{self.scorer_version} {self.resume_hash[:8]}/{self.job_hash[:8]} ({self.score:.0f})"
+
+class Skill(models.Model):
+    """Canonical skill; name is the lowercased canonical spelling"""
+    name = models.CharField(max_length=100, unique=True)
+    display_name = models.CharField(max_length=100)
+    category = models.CharField(max_length=50, blank=True)
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Skill'
+        verbose_name_plural = 'Skills'
+    
+    def __str__(self):
+        return self.display_name
+
+class SkillAlias(models.Model):
+    """Alternative spelling of a skill (e.g. 'golang' for 'go'), lowercased"""
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    
+    class Meta:
+        verbose_name = 'Skill Alias'
+        verbose_name_plural = 'Skill Aliases'
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+class JobSkill(models.Model):
+    SOURCE_CHOICES = [
+        ('required', 'Required (HH.ru key skills)'),
+        ('text', 'Extracted from job text'),
+    ]
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='text')
+    
+    class Meta:
+        verbose_name = 'Job Skill'
+        verbose_name_plural = 'Job Skills'
+        unique_together = ('job', 'skill')
+        indexes = [
+            # "Jobs needing skill X" and overlap scoring drive from the skill side
+            models.Index(fields=['skill', 'job'], name='jobs_jobskill_skill_job_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id}: {self.skill_id}"
+
+class ResumeSkill(models.Model):
+    resume = models.ForeignKey('resumes.Resume', on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='resume_links')
+    
+    class Meta:
+        verbose_name = 'Resume Skill'
+        verbose_name_plural = 'Resume Skills'
+        unique_together = ('resume', 'skill')
+        indexes = [
+            models.Index(fields=['skill', 'resume'], name='jobs_resumeskill_skill_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.resume_id}: {self.skill_id}"
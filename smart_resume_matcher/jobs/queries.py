@@ -0,0 +1,64 @@
+"""
+Job querysets annotated with the current user's context.
+
+Job pages show each job with the user's match score and application status.
+Looking those up per job (job.matches.all, one application query per row)
+makes a page cost O(jobs) queries. These helpers fold them into the page
+query as subquery annotations, or into one prefetch query per relation, so a
+page costs the same number of queries whatever its size.
+"""
+
+from django.apps import apps
+from django.db.models import FloatField, OuterRef, Prefetch, QuerySet, Subquery, Value
+
+Job = apps.get_model('jobs', 'Job')
+JobMatch = apps.get_model('jobs', 'JobMatch')
+JobApplication = apps.get_model('jobs', 'JobApplication')
+
+
+def _application_status(user, job_ref: str) -> Subquery:
+    applications = JobApplication.objects.filter(job=OuterRef(job_ref), user=user)
+    return Subquery(applications.values('status')[:1])
+
+
+def annotate_jobs_for_user(queryset: QuerySet, user, resume=None) -> QuerySet:
+    """
+    Annotate jobs with match_score (for resume; None without a match) and
+    application_status (the user's application status, or None).
+    """
+    if resume is not None:
+        matches = JobMatch.objects.filter(job=OuterRef('pk'), resume=resume)
+        match_score = Subquery(matches.values('match_score')[:1], output_field=FloatField())
+    else:
+        match_score = Value(None, output_field=FloatField())
+    return queryset.annotate(
+        match_score=match_score,
+        application_status=_application_status(user, 'pk'),
+    )
+
+
+def prefetch_resume_match(queryset: QuerySet, resume) -> QuerySet:
+    """Attach job.resume_matches: the resume's JobMatch for each job (zero or one)"""
+    matches = JobMatch.objects.filter(resume=resume) if resume is not None else JobMatch.objects.none()
+    return queryset.prefetch_related(Prefetch('matches', queryset=matches, to_attr='resume_matches'))
+
+
+def annotate_matches_for_user(queryset: QuerySet, user) -> QuerySet:
+    """JobMatch rows with their job joined and the user's application_status annotated"""
+    return queryset.select_related('job').annotate(application_status=_application_status(user, 'job'))
+
+
+def job_detail_queryset(user, resume=None) -> QuerySet:
+    """Jobs with everything the detail page shows about the user's match and application"""
+    return prefetch_resume_match(annotate_jobs_for_user(Job.objects.all(), user, resume), resume)
+
+
+def similar_jobs(job, user, resume=None, limit: int = 5) -> list:
+    """Active jobs with titles like job's, best full-text match first, annotated for the user"""
+    from .search import search_job_ids
+
+    ranked = [job_id for job_id, _ in search_job_ids(job.title.split(), limit=limit + 1) if job_id != job.id][:limit]
+    if not ranked:
+        return []
+    jobs = annotate_jobs_for_user(Job.objects.filter(id__in=ranked), user, resume).in_bulk()
+    return [jobs[job_id] for job_id in ranked if job_id in jobs]
@@ -3,9 +3,11 @@ import logging
 import asyncio
 import aiohttp
 from typing import List, Dict, Any, Optional, Union
-from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 from django.apps import apps
+from core.executors import io_executor
+from core.ranking import TopK
+from core.request_timing import HH, SCORING, stage
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +114,8 @@ class EnhancedHHApiClient:
         
         try:
             logger.info(f"Fetching from {base_url} with params: {params}")
-            response = requests.get(url, headers=self.headers, params=params, timeout=self.timeout)
+            with stage(HH):
+                response = requests.get(url, headers=self.headers, params=params, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -123,39 +126,83 @@ class EnhancedHHApiClient:
             logger.error(f"Failed to fetch from {base_url}: {str(e)}")
             return {'items': [], 'found': 0, 'pages': 0}
     
-    def fetch_jobs_from_both_apis(self, search_query: str = None, location: str = None, 
-                                 per_page: int = 50) -> List[Dict[str, Any]]:
-        """Fetch jobs from both HH.ru and HH.kz APIs"""
-        
-        # Generate search parameters
-        params = self._generate_search_params(search_query, location, per_page // 2)
-        
-        # Fetch from both APIs concurrently
-        all_jobs = []
+    async def _fetch_from_single_api_async(self, session: aiohttp.ClientSession, base_url: str,
+                                           params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch jobs from a single HH API endpoint without blocking the event loop"""
+        url = f"{base_url}/vacancies"
         
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit tasks for both APIs
-            future_ru = executor.submit(self._fetch_from_single_api, self.HH_RU_BASE_URL, params)
-            future_kz = executor.submit(self._fetch_from_single_api, self.HH_KZ_BASE_URL, params)
+        try:
+            logger.info(f"Fetching from {base_url} with params: {params}")
+            with stage(HH):
+                async with session.get(url, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json()
             
-            # Get results
-            ru_data = future_ru.result()
-            kz_data = future_kz.result()
+            logger.info(f"Successfully fetched {len(data.get('items', []))} jobs from {base_url}")
+            return data
             
-            # Combine results
-            all_jobs.extend(ru_data.get('items', []))
-            all_jobs.extend(kz_data.get('items', []))
-        
-        # Remove duplicates based on job ID
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to fetch from {base_url}: {str(e)}")
+            return {'items': [], 'found': 0, 'pages': 0}
+    
+    def _session(self) -> aiohttp.ClientSession:
+        """aiohttp session with the client's headers and timeout"""
+        return aiohttp.ClientSession(
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+    
+    def _unique_jobs(self, all_jobs: List[Dict[str, Any]], limit: int = None) -> List[Dict[str, Any]]:
+        """Remove duplicates based on job ID, keeping the first occurrence"""
         seen_ids = set()
         unique_jobs = []
         
         for job in all_jobs:
             job_id = job.get('id')
-            if job_id and job_id not in seen_ids:
+            if job_id and job_id not in seen_ids and (limit is None or len(unique_jobs) < limit):
                 seen_ids.add(job_id)
                 unique_jobs.append(job)
         
+        return unique_jobs
+    
+    async def fetch_jobs_from_both_apis_async(self, search_query: str = None, location: str = None,
+                                              per_page: int = 50,
+                                              session: aiohttp.ClientSession = None) -> List[Dict[str, Any]]:
+        """Async version of fetch_jobs_from_both_apis"""
+        if session is None:
+            async with self._session() as session:
+                return await self.fetch_jobs_from_both_apis_async(search_query, location, per_page, session)
+        
+        params = self._generate_search_params(search_query, location, per_page // 2)
+        
+        ru_data, kz_data = await asyncio.gather(
+            self._fetch_from_single_api_async(session, self.HH_RU_BASE_URL, params),
+            self._fetch_from_single_api_async(session, self.HH_KZ_BASE_URL, params),
+        )
+        
+        unique_jobs = self._unique_jobs(ru_data.get('items', []) + kz_data.get('items', []))
+        logger.info(f"Fetched {len(unique_jobs)} unique jobs from both APIs")
+        return unique_jobs
+    
+    def fetch_jobs_from_both_apis(self, search_query: str = None, location: str = None, 
+                                 per_page: int = 50) -> List[Dict[str, Any]]:
+        """Fetch jobs from both HH.ru and HH.kz APIs"""
+        
+        # Generate search parameters
+        params = self._generate_search_params(search_query, location, per_page // 2)
+        
+        # Fetch from both APIs concurrently
+        executor = io_executor()
+        
+        # Submit tasks for both APIs
+        future_ru = executor.submit(self._fetch_from_single_api, self.HH_RU_BASE_URL, params)
+        future_kz = executor.submit(self._fetch_from_single_api, self.HH_KZ_BASE_URL, params)
+        
+        # Get results
+        ru_data = future_ru.result()
+        kz_data = future_kz.result()
+        
+        unique_jobs = self._unique_jobs(ru_data.get('items', []) + kz_data.get('items', []))
         logger.info(f"Fetched {len(unique_jobs)} unique jobs from both APIs")
         return unique_jobs
     
@@ -167,7 +214,8 @@ class EnhancedHHApiClient:
         url = f"{base_url}/vacancies/{job_id}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            with stage(HH):
+                response = requests.get(url, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -177,25 +225,7 @@ class EnhancedHHApiClient:
     def search_jobs_for_resume(self, resume_text: str, skills: List[str], 
                               location: str = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Search for jobs that match a resume's skills and content"""
-        
-        # Generate search query from skills
-        search_queries = []
-        
-        if skills:
-            # Use top skills as search terms (simpler approach)
-            tech_skills = [skill for skill in skills if self._is_tech_skill(skill)]
-            if tech_skills:
-                # Use individual skills instead of OR operator
-                search_queries.extend(tech_skills[:3])
-            
-            # Add general skill search
-            general_skills = [skill for skill in skills if not self._is_tech_skill(skill)]
-            if general_skills:
-                search_queries.extend(general_skills[:2])
-        
-        # If no skills, use generic tech terms
-        if not search_queries:
-            search_queries = ['developer', 'engineer', 'programmer', 'analyst', 'manager']
+        search_queries = self._resume_search_queries(skills)
         
         all_jobs = []
         
@@ -224,16 +254,58 @@ class EnhancedHHApiClient:
             except Exception as e:
                 logger.error(f"Error in general search: {str(e)}")
         
-        # Remove duplicates and limit results
-        seen_ids = set()
-        unique_jobs = []
+        unique_jobs = self._unique_jobs(all_jobs, limit)
+        logger.info(f"Found {len(unique_jobs)} unique jobs matching resume")
+        return unique_jobs
+    
+    def _resume_search_queries(self, skills: List[str]) -> List[str]:
+        """Search terms derived from resume skills"""
+        search_queries = []
         
-        for job in all_jobs:
-            job_id = job.get('id')
-            if job_id and job_id not in seen_ids and len(unique_jobs) < limit:
-                seen_ids.add(job_id)
-                unique_jobs.append(job)
+        if skills:
+            tech_skills = [skill for skill in skills if self._is_tech_skill(skill)]
+            if tech_skills:
+                search_queries.extend(tech_skills[:3])
+            
+            general_skills = [skill for skill in skills if not self._is_tech_skill(skill)]
+            if general_skills:
+                search_queries.extend(general_skills[:2])
         
+        if not search_queries:
+            search_queries = ['developer', 'engineer', 'programmer', 'analyst', 'manager']
+        
+        return search_queries
+    
+    async def search_jobs_for_resume_async(self, resume_text: str, skills: List[str],
+                                           location: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Async version of search_jobs_for_resume; all queries run concurrently"""
+        queries = self._resume_search_queries(skills)[:3]
+        per_page = limit // len(queries)
+        
+        async with self._session() as session:
+            results = await asyncio.gather(
+                *[
+                    self.fetch_jobs_from_both_apis_async(query, location, per_page, session)
+                    for query in queries
+                ],
+                return_exceptions=True
+            )
+            
+            all_jobs = []
+            for query, jobs in zip(queries, results):
+                if isinstance(jobs, Exception):
+                    logger.error(f"Error searching with query '{query}': {str(jobs)}")
+                    continue
+                all_jobs.extend(jobs)
+            
+            # If no jobs found, try a general search without specific terms
+            if not all_jobs:
+                try:
+                    all_jobs = await self.fetch_jobs_from_both_apis_async(None, location, limit, session)
+                except Exception as e:
+                    logger.error(f"Error in general search: {str(e)}")
+        
+        unique_jobs = self._unique_jobs(all_jobs, limit)
         logger.info(f"Found {len(unique_jobs)} unique jobs matching resume")
         return unique_jobs
     
@@ -333,26 +405,57 @@ class RealTimeJobMatcher:
                 limit=limit
             )
         
-        # Calculate match scores and create job objects
-        matched_jobs = []
+        return self._score_jobs(jobs, user_skills, limit)
+    
+    async def find_matching_jobs_async(self, search_query: str = None, location: str = None,
+                                       limit: int = 50) -> List[Dict[str, Any]]:
+        """Async version of find_matching_jobs for ASGI views"""
+        user_skills = []
+        if hasattr(self.resume, 'extracted_skills') and self.resume.extracted_skills:
+            user_skills = self.resume.extracted_skills
         
-        for job_data in jobs:
+        if search_query:
+            jobs = await self.hh_client.fetch_jobs_from_both_apis_async(
+                search_query=search_query,
+                location=location,
+                per_page=limit
+            )
+        else:
+            jobs = await self.hh_client.search_jobs_for_resume_async(
+                resume_text=getattr(self.resume, 'content', ''),
+                skills=user_skills,
+                location=location,
+                limit=limit
+            )
+        
+        return self._score_jobs(jobs, user_skills, limit)
+    
+    @stage(SCORING)
+    def _score_jobs(self, jobs: List[Dict[str, Any]], user_skills: List[str],
+                    limit: int = 50) -> List[Dict[str, Any]]:
+        """Score fetched jobs against the user's skills and return the best `limit`, best first"""
+        # Keep only the top `limit` scores; ties keep fetch order
+        top = TopK(limit)
+        
+        for index, job_data in enumerate(jobs):
             try:
                 # Calculate match score
                 match_info = self.calculate_match_score(job_data, user_skills)
-                
-                # Create job object (temporary, not saved to database)
-                job_obj = self._create_job_object(job_data, match_info)
-                matched_jobs.append(job_obj)
+                top.push((match_info.get('match_score', 0), -index), (job_data, match_info))
                 
             except Exception as e:
                 logger.error(f"Error processing job {job_data.get('id', 'unknown')}: {str(e)}")
                 continue
         
-        # Sort by match score (descending)
-        matched_jobs.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+        # Create job objects (temporary, not saved to database) for the kept jobs only
+        matched_jobs = []
+        for job_data, match_info in top.items():
+            try:
+                matched_jobs.append(self._create_job_object(job_data, match_info))
+            except Exception as e:
+                logger.error(f"Error processing job {job_data.get('id', 'unknown')}: {str(e)}")
         
-        logger.info(f"Successfully matched {len(matched_jobs)} jobs")
+        logger.info(f"Successfully matched {len(matched_jobs)} of {len(jobs)} jobs")
         return matched_jobs
     
     def _create_job_object(self, job_data: Dict[str, Any], match_info: Dict[str, Any]) -> Dict[str, Any]:
@@ -5,6 +5,7 @@ import logging
 from typing import List, Dict, Any, Optional
 from .enhanced_hh_client import EnhancedHHApiClient, JobData
 from dataclasses import dataclass
+from core.request_timing import SCORING, stage
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,7 @@ class RealTimeJobMatcher:
         self.user_location = user_location
         self.hh_client = EnhancedHHApiClient()
         
+    @stage(SCORING)
     def calculate_match_score(self, job: JobData) -> Dict[str, Any]:
         """Calculate match score between user profile and job"""
         
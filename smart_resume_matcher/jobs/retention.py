@@ -0,0 +1,226 @@
+"""
+Retention policies for the tables that only grow.
+
+    JobMatch   - keep each resume's RETENTION_MATCHES_PER_RESUME most recently
+                 scored matches
+    JobSearch  - fold searches older than RETENTION_SEARCH_DAYS into per-user
+                 JobSearchDailyAggregate rows, then delete them
+    Job        - append inactive jobs untouched for RETENTION_INACTIVE_JOB_DAYS
+                 to a gzipped JSON Lines file in RETENTION_ARCHIVE_DIR, then
+                 delete them (with their matches and skill links). Jobs someone
+                 applied to are kept. Nothing is archived until
+                 RETENTION_ARCHIVE_DIR names durable storage.
+    MatchScoreMemo - delete memoized scores older than RETENTION_MEMO_DAYS;
+                 pairs still being matched are rescored and stored again
+
+Rows are handled RETENTION_CHUNK_SIZE at a time, each chunk in its own short
+transaction, sleeping RETENTION_CHUNK_PAUSE seconds between chunks so locks
+are never held for long and other writers get in. A run stops once
+RETENTION_TIME_BUDGET seconds are spent; the next run carries on from there.
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef
+from django.utils import timezone
+
+from accounts.dashboard_summary import mark_summary_stale
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('matches', 'searches', 'jobs', 'memos')
+
+
+class _Throttle:
+    """Sleeps between chunks and tells when the run's time budget is spent"""
+
+    def __init__(self, pause: float, budget: float):
+        self.pause = pause
+        self.deadline = time.monotonic() + budget if budget else None
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def chunk_done(self) -> None:
+        if self.pause > 0:
+            time.sleep(self.pause)
+
+
+def prune_job_matches(keep: int, throttle: _Throttle, chunk_size: int) -> int:
+    """Delete all but each resume's newest keep matches; returns rows deleted"""
+    JobMatch = apps.get_model('jobs', 'JobMatch')
+
+    crowded = list(
+        JobMatch.objects.order_by().values('resume_id', 'user_id')
+        .annotate(matches=Count('id')).filter(matches__gt=keep)
+        .values_list('resume_id', 'user_id')
+    )
+    deleted = 0
+    pruned_users = set()
+    for resume_id, user_id in crowded:
+        while not throttle.expired():
+            ids = list(
+                JobMatch.objects.filter(resume_id=resume_id)
+                .order_by('-updated_at', '-id').values_list('id', flat=True)[keep:keep + chunk_size]
+            )
+            if not ids:
+                break
+            JobMatch.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+            pruned_users.add(user_id)
+            throttle.chunk_done()
+
+    for user_id in pruned_users:
+        mark_summary_stale(user_id)
+    return deleted
+
+
+def _day(moment) -> date:
+    return timezone.localtime(moment).date() if timezone.is_aware(moment) else moment.date()
+
+
+def compact_job_searches(days: int, throttle: _Throttle, chunk_size: int) -> int:
+    """Fold searches older than days into daily aggregates; returns searches compacted"""
+    JobSearch = apps.get_model('jobs', 'JobSearch')
+    JobSearchDailyAggregate = apps.get_model('jobs', 'JobSearchDailyAggregate')
+
+    cutoff = timezone.now() - timedelta(days=days)
+    compacted = 0
+    while not throttle.expired():
+        searches = list(
+            JobSearch.objects.filter(created_at__lt=cutoff).order_by('id')
+            .values('id', 'user_id', 'created_at', 'status', 'total_found', 'jobs_analyzed', 'matches_found')[:chunk_size]
+        )
+        if not searches:
+            break
+
+        totals = defaultdict(Counter)
+        for search in searches:
+            day_totals = totals[(search['user_id'], _day(search['created_at']))]
+            day_totals['searches'] += 1
+            day_totals['completed_searches'] += search['status'] == 'completed'
+            for field in ('total_found', 'jobs_analyzed', 'matches_found'):
+                day_totals[field] += search[field] or 0
+
+        with transaction.atomic():
+            JobSearchDailyAggregate.objects.bulk_create(
+                [JobSearchDailyAggregate(user_id=user_id, day=day) for user_id, day in totals],
+                ignore_conflicts=True,
+            )
+            for (user_id, day), day_totals in totals.items():
+                JobSearchDailyAggregate.objects.filter(user_id=user_id, day=day).update(
+                    **{field: F(field) + value for field, value in day_totals.items()}
+                )
+            JobSearch.objects.filter(id__in=[search['id'] for search in searches]).delete()
+
+        compacted += len(searches)
+        throttle.chunk_done()
+    return compacted
+
+
+def _archivable_jobs(days: int):
+    Job = apps.get_model('jobs', 'Job')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    return Job.objects.filter(
+        is_active=False,
+        updated_at__lt=timezone.now() - timedelta(days=days),
+    ).exclude(Exists(JobApplication.objects.filter(job=OuterRef('pk'))))
+
+
+def archive_inactive_jobs(days: int, archive_dir: str, throttle: _Throttle, chunk_size: int) -> Dict:
+    """
+    Archive and delete inactive jobs older than days.
+    Returns {'archived': jobs deleted, 'path': archive file or None}.
+    """
+    Job = apps.get_model('jobs', 'Job')
+    JobMatch = apps.get_model('jobs', 'JobMatch')
+
+    # Derived text is recomputed on save, so restoring a line only needs the source fields
+    fields = [field.attname for field in Job._meta.concrete_fields if field.name not in Job.DERIVED_TEXT_FIELDS]
+    path = None
+    archived = 0
+    last_id = 0
+    while not throttle.expired():
+        rows = list(_archivable_jobs(days).filter(id__gt=last_id).order_by('id').values(*fields)[:chunk_size])
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        if path is None:
+            os.makedirs(archive_dir, exist_ok=True)
+            path = os.path.join(archive_dir, f"jobs-{timezone.now():%Y%m%d-%H%M%S}.jsonl.gz")
+        # One gzip member per chunk, closed (flushed) before anything is deleted
+        with gzip.open(path, 'at', encoding='utf-8') as archive:
+            for row in rows:
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+
+        ids = [row['id'] for row in rows]
+        with transaction.atomic():
+            # Re-check: a job reactivated or applied to since it was read stays
+            doomed = _archivable_jobs(days).filter(id__in=ids)
+            user_ids = set(JobMatch.objects.filter(job__in=doomed).values_list('user_id', flat=True))
+            archived += doomed.delete()[1].get(Job._meta.label, 0)
+        for user_id in user_ids:
+            mark_summary_stale(user_id)
+        throttle.chunk_done()
+    return {'archived': archived, 'path': path}
+
+
+def expire_score_memos(days: int, throttle: _Throttle, chunk_size: int) -> int:
+    """Delete memoized scores created more than days ago; returns rows deleted"""
+    MatchScoreMemo = apps.get_model('jobs', 'MatchScoreMemo')
+
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while not throttle.expired():
+        ids = list(MatchScoreMemo.objects.filter(created_at__lt=cutoff).values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+        deleted += MatchScoreMemo.objects.filter(id__in=ids).delete()[0]
+        throttle.chunk_done()
+    return deleted
+
+
+def run_retention(policies: Optional[Iterable[str]] = None, time_budget: Optional[float] = None) -> Dict:
+    """
+    Apply the configured retention policies (all of POLICIES by default).
+    Returns counts per policy and whether the run finished within its budget.
+    """
+    policies = set(policies or POLICIES)
+    chunk_size = max(1, settings.RETENTION_CHUNK_SIZE)
+    throttle = _Throttle(
+        settings.RETENTION_CHUNK_PAUSE,
+        settings.RETENTION_TIME_BUDGET if time_budget is None else time_budget,
+    )
+
+    result = {}
+    if 'matches' in policies and settings.RETENTION_MATCHES_PER_RESUME > 0:
+        result['matches_deleted'] = prune_job_matches(settings.RETENTION_MATCHES_PER_RESUME, throttle, chunk_size)
+    if 'searches' in policies and settings.RETENTION_SEARCH_DAYS > 0:
+        result['searches_compacted'] = compact_job_searches(settings.RETENTION_SEARCH_DAYS, throttle, chunk_size)
+    if 'jobs' in policies and settings.RETENTION_INACTIVE_JOB_DAYS > 0:
+        if not settings.RETENTION_ARCHIVE_DIR:
+            logger.warning("Inactive jobs not archived: RETENTION_ARCHIVE_DIR is not set to durable storage")
+            result['jobs_archived'] = None
+        else:
+            jobs = archive_inactive_jobs(
+                settings.RETENTION_INACTIVE_JOB_DAYS, settings.RETENTION_ARCHIVE_DIR, throttle, chunk_size
+            )
+            result['jobs_archived'] = jobs['archived']
+            result['archive_path'] = jobs['path']
+    if 'memos' in policies and settings.RETENTION_MEMO_DAYS > 0:
+        result['memos_deleted'] = expire_score_memos(settings.RETENTION_MEMO_DAYS, throttle, chunk_size)
+    result['complete'] = not throttle.expired()
+    logger.info(f"Retention run finished: {result}")
+    return result
@@ -0,0 +1,220 @@
+"""
+Match score memoization.
+
+Scores are memoized per (resume hash, job hash, scorer name, scorer version):
+the hashes cover exactly the inputs a scorer reads, so an unchanged pair is a
+lookup wherever it is rescored (resume re-matching, job search, enhanced
+matching). Lookups go through a bounded in-process LRU backed by the
+MatchScoreMemo table. Bumping a scorer's version changes its keys, so only
+that scorer's entries go stale; purge_stale_scores() deletes them.
+
+Batch callers should prefetch() the job hashes they are about to score (one
+query) and flush() at the end, which writes new entries in one bulk insert.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LRU_SIZE = 10000
+PREFETCH_CHUNK_SIZE = 500
+
+# (score, details)
+ScoreResult = Tuple[float, Dict[str, Any]]
+
+
+def content_hash(value: Any) -> str:
+    """SHA-256 of a JSON-serializable value, stable across processes and dict order"""
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class _LRU:
+    """
+    Thread-safe bounded LRU shared by all memos in the process. Details are
+    copied in and out, so callers may mutate what they put or get.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: 'OrderedDict[Tuple[str, str, str, str], ScoreResult]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        score, details = value
+        return score, copy.deepcopy(details)
+
+    def put(self, key, value) -> None:
+        score, details = value
+        value = (score, copy.deepcopy(details))
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+_lru: Optional[_LRU] = None
+_lru_lock = threading.Lock()
+
+
+def _get_lru() -> _LRU:
+    global _lru
+    if _lru is None:
+        with _lru_lock:
+            if _lru is None:
+                _lru = _LRU(getattr(settings, 'SCORE_MEMO_LRU_SIZE', DEFAULT_LRU_SIZE))
+    return _lru
+
+
+class ScoreMemo:
+    """Memo for one scorer version; cheap to create per request or task"""
+
+    def __init__(self, scorer: str, version: str):
+        self.scorer = scorer
+        self.version = version
+        self._pending: Dict[Tuple[str, str], ScoreResult] = {}
+
+    def _key(self, resume_hash: str, job_hash: str):
+        return (self.scorer, self.version, resume_hash, job_hash)
+
+    def prefetch(self, resume_hash: str, job_hashes: Iterable[str]) -> int:
+        """Load stored scores for these jobs into the LRU with one query; returns how many were found"""
+        lru = _get_lru()
+        missing = [h for h in set(job_hashes) if self._key(resume_hash, h) not in lru]
+        if not missing:
+            return 0
+
+        MatchScoreMemo = apps.get_model('jobs', 'MatchScoreMemo')
+        found = 0
+        try:
+            # Chunked to stay under the database's bound-parameter limit
+            for start in range(0, len(missing), PREFETCH_CHUNK_SIZE):
+                rows = MatchScoreMemo.objects.filter(
+                    resume_hash=resume_hash,
+                    scorer=self.scorer,
+                    scorer_version=self.version,
+                    job_hash__in=missing[start:start + PREFETCH_CHUNK_SIZE],
+                ).values_list('job_hash', 'score', 'details')
+                for job_hash, score, details in rows:
+                    lru.put(self._key(resume_hash, job_hash), (score, details))
+                    found += 1
+        except Exception as e:
+            logger.warning(f"Score memo prefetch failed: {e}")
+        return found
+
+    def get(self, resume_hash: str, job_hash: str, check_db: bool = True) -> Optional[ScoreResult]:
+        key = self._key(resume_hash, job_hash)
+        cached = _get_lru().get(key)
+        if cached is not None or not check_db:
+            return cached
+
+        MatchScoreMemo = apps.get_model('jobs', 'MatchScoreMemo')
+        try:
+            row = MatchScoreMemo.objects.filter(
+                resume_hash=resume_hash,
+                job_hash=job_hash,
+                scorer=self.scorer,
+                scorer_version=self.version,
+            ).values_list('score', 'details').first()
+        except Exception as e:
+            logger.warning(f"Score memo lookup failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        result = (row[0], row[1])
+        _get_lru().put(key, result)
+        return result
+
+    def put(self, resume_hash: str, job_hash: str, score: float, details: Dict[str, Any]) -> None:
+        """Record a score in the LRU; it is written to the table on flush()"""
+        result = (float(score), details)
+        _get_lru().put(self._key(resume_hash, job_hash), result)
+        self._pending[(resume_hash, job_hash)] = result
+
+    def memoize(self, resume_hash: str, job_hash: str, compute: Callable[[], ScoreResult],
+                check_db: bool = True) -> ScoreResult:
+        """Return the memoized score for this pair, computing and recording it on a miss"""
+        cached = self.get(resume_hash, job_hash, check_db=check_db)
+        if cached is not None:
+            return cached
+        score, details = compute()
+        self.put(resume_hash, job_hash, score, details)
+        return score, details
+
+    def flush(self) -> int:
+        """Write pending scores in one bulk insert; returns how many were written"""
+        if not self._pending:
+            return 0
+
+        MatchScoreMemo = apps.get_model('jobs', 'MatchScoreMemo')
+        rows = [
+            MatchScoreMemo(
+                resume_hash=resume_hash,
+                job_hash=job_hash,
+                scorer=self.scorer,
+                scorer_version=self.version,
+                score=score,
+                details=details,
+            )
+            for (resume_hash, job_hash), (score, details) in self._pending.items()
+        ]
+        self._pending = {}
+        try:
+            # Concurrent writers may have stored the same pairs already
+            MatchScoreMemo.objects.bulk_create(rows, ignore_conflicts=True, batch_size=500)
+        except Exception as e:
+            logger.warning(f"Score memo flush failed: {e}")
+            return 0
+        return len(rows)
+
+
+def purge_stale_scores(scorer: str, current_version: str) -> int:
+    """Delete a scorer's entries from every version except current_version"""
+    MatchScoreMemo = apps.get_model('jobs', 'MatchScoreMemo')
+    deleted, _ = MatchScoreMemo.objects.filter(scorer=scorer).exclude(scorer_version=current_version).delete()
+    _get_lru().clear()
+    return deleted
+
+
+def score_memo_stats() -> Dict[str, Any]:
+    """In-process LRU statistics"""
+    return _get_lru().stats()
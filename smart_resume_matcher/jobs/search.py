@@ -0,0 +1,326 @@
+"""
+Full-text search over Job title, requirements, responsibilities and description.
+
+icontains filters cannot use an index and scan every vacancy. Instead:
+
+    SQLite    - an FTS5 external-content table (jobs_job_fts) over jobs_job,
+                kept in sync by insert/update/delete triggers, ranked by bm25
+    Postgres  - a stored, generated search_vector tsvector column (English and
+                Russian configurations) with a GIN index, ranked by ts_rank
+
+Title matches weigh most, then requirements, responsibilities, description.
+Other backends, or a missing index, fall back to icontains so callers never
+need to care which one is in use.
+
+Terms are matched as phrases of word tokens; mode 'any' matches jobs
+containing any term (candidate retrieval by skills), 'all' requires every
+term (keyword search).
+
+Both tokenizers drop symbols, so "C++" and "C#" index as "c" and ".NET" as
+"net". Such terms are matched with icontains instead: filter_jobs combines
+that with the index lookup of the other terms, and search_job_ids ranks the
+index's broader token match and keeps only the rows that match exactly.
+"""
+
+import logging
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'jobs_job_fts'
+FTS_TRIGGERS = ('jobs_job_fts_ai', 'jobs_job_fts_ad', 'jobs_job_fts_au')
+PG_VECTOR_COLUMN = 'search_vector'
+PG_INDEX = 'jobs_job_search_gin'
+PG_CONFIGS = ('english', 'russian')
+
+# title, description, requirements, responsibilities
+BM25_WEIGHTS = (10.0, 1.0, 5.0, 2.0)
+
+ANY = 'any'
+ALL = 'all'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Terms whose meaning the tokenizers drop: "c++", "c#", "f#", ".net"
+_SYMBOL_TERM_RE = re.compile(r'[+#]|^\.')
+
+# Ranked searches with symbol terms fetch this many times the limit before exact filtering
+SYMBOL_OVERFETCH = 4
+
+Terms = Union[str, Iterable[str]]
+
+
+def backend() -> Optional[str]:
+    """'sqlite' or 'postgresql' when full-text search is available, else None"""
+    if connection.vendor == 'sqlite':
+        return 'sqlite' if _sqlite_index_exists() else None
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    return None
+
+
+def _sqlite_index_exists() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _normalize_terms(terms: Terms) -> List[str]:
+    if isinstance(terms, str):
+        terms = [terms]
+    return [term.strip() for term in terms if term and term.strip()]
+
+
+def _fts5_query(terms: Sequence[str], mode: str) -> str:
+    """FTS5 MATCH expression: each term becomes a quoted phrase of its tokens"""
+    phrases = []
+    for term in terms:
+        tokens = _TOKEN_RE.findall(term.lower())
+        if tokens:
+            phrases.append('"' + ' '.join(tokens) + '"')
+    return (' AND ' if mode == ALL else ' OR ').join(phrases)
+
+
+def _pg_query(terms: Sequence[str], mode: str) -> Tuple[str, list]:
+    """tsquery SQL and params: each term as a phrase in every configuration"""
+    parts = []
+    params = []
+    for term in terms:
+        per_config = []
+        for config in PG_CONFIGS:
+            per_config.append(f"phraseto_tsquery('{config}', %s)")
+            params.append(term)
+        parts.append('(' + ' || '.join(per_config) + ')')
+    return (' && ' if mode == ALL else ' || ').join(parts), params
+
+
+def _split_symbol_terms(terms: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """(terms the index matches exactly, symbol-bearing terms it cannot)"""
+    indexed = [term for term in terms if not _SYMBOL_TERM_RE.search(term)]
+    symbols = [term for term in terms if _SYMBOL_TERM_RE.search(term)]
+    return indexed, symbols
+
+
+def _icontains_filter(terms: Sequence[str], mode: str) -> Q:
+    query = Q()
+    for term in terms:
+        term_query = (
+            Q(title__icontains=term) |
+            Q(description__icontains=term) |
+            Q(requirements__icontains=term) |
+            Q(responsibilities__icontains=term)
+        )
+        query = (query & term_query) if mode == ALL else (query | term_query)
+    return query
+
+
+def _index_filter(terms: Sequence[str], mode: str, engine: str) -> Q:
+    if engine == 'sqlite':
+        match = _fts5_query(terms, mode)
+        if not match:
+            return Q(pk__in=[])
+        return Q(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    tsquery, params = _pg_query(terms, mode)
+    return Q(id__in=RawSQL(f"SELECT id FROM jobs_job WHERE {PG_VECTOR_COLUMN} @@ ({tsquery})", params))
+
+
+def _terms_filter(terms: Sequence[str], mode: str, engine: Optional[str]) -> Q:
+    """Index lookup for plain terms, icontains for symbol-bearing ones"""
+    if engine is None:
+        return _icontains_filter(terms, mode)
+
+    indexed, symbols = _split_symbol_terms(terms)
+    parts = []
+    if indexed:
+        parts.append(_index_filter(indexed, mode, engine))
+    if symbols:
+        parts.append(_icontains_filter(symbols, mode))
+
+    query = parts[0]
+    for part in parts[1:]:
+        query = (query & part) if mode == ALL else (query | part)
+    return query
+
+
+def filter_jobs(queryset: QuerySet, terms: Terms, mode: str = ALL) -> QuerySet:
+    """Restrict a Job queryset to jobs matching terms (unranked)"""
+    terms = _normalize_terms(terms)
+    if not terms:
+        return queryset
+    return queryset.filter(_terms_filter(terms, mode, backend()))
+
+
+def search_job_ids(terms: Terms, mode: str = ANY, limit: int = 100,
+                   active_only: bool = True) -> List[Tuple[int, float]]:
+    """
+    (job_id, rank) pairs for jobs matching terms, best first. Ranks are
+    comparable within one result list only; higher is better.
+    """
+    terms = _normalize_terms(terms)
+    if not terms or limit <= 0:
+        return []
+
+    try:
+        engine = backend()
+        if engine is not None:
+            _, symbols = _split_symbol_terms(terms)
+            fetch = limit * SYMBOL_OVERFETCH if symbols else limit
+            search = _search_sqlite if engine == 'sqlite' else _search_postgres
+            ranked = search(terms, mode, fetch, active_only)
+            if symbols:
+                ranked = _exact_matches(ranked, terms, mode, engine)[:limit]
+            return ranked
+    except Exception as e:
+        logger.warning(f"Full-text job search failed, falling back to icontains: {e}")
+
+    Job = apps.get_model('jobs', 'Job')
+    queryset = Job.objects.filter(_icontains_filter(terms, mode))
+    if active_only:
+        queryset = queryset.filter(is_active=True)
+    ids = queryset.order_by('-created_at').values_list('id', flat=True)[:limit]
+    return [(job_id, 0.0) for job_id in ids]
+
+
+def _exact_matches(ranked: List[Tuple[int, float]], terms: Sequence[str], mode: str,
+                   engine: str) -> List[Tuple[int, float]]:
+    """The ranked rows that match symbol terms as written, not just their tokens"""
+    Job = apps.get_model('jobs', 'Job')
+    exact = set(Job.objects.filter(
+        _terms_filter(terms, mode, engine), id__in=[job_id for job_id, _ in ranked]
+    ).values_list('id', flat=True))
+    return [(job_id, rank) for job_id, rank in ranked if job_id in exact]
+
+
+def _search_sqlite(terms, mode, limit, active_only) -> List[Tuple[int, float]]:
+    match = _fts5_query(terms, mode)
+    if not match:
+        return []
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    active = 'AND j.is_active' if active_only else ''
+    # bm25() is lower-is-better; negate it so ranks read like ts_rank
+    sql = (
+        f"SELECT f.rowid, -bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} f JOIN jobs_job j ON j.id = f.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s {active} "
+        f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, limit])
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def _search_postgres(terms, mode, limit, active_only) -> List[Tuple[int, float]]:
+    tsquery, params = _pg_query(terms, mode)
+    active = 'AND is_active' if active_only else ''
+    sql = (
+        f"SELECT id, ts_rank({PG_VECTOR_COLUMN}, q.query) AS rank "
+        f"FROM jobs_job, (SELECT {tsquery} AS query) q "
+        f"WHERE {PG_VECTOR_COLUMN} @@ q.query {active} "
+        f"ORDER BY rank DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit])
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def search_jobs(terms: Terms, mode: str = ANY, limit: int = 100, active_only: bool = True) -> list:
+    """Jobs matching terms, best first, each with a search_rank attribute"""
+    ranked = search_job_ids(terms, mode=mode, limit=limit, active_only=active_only)
+    if not ranked:
+        return []
+
+    Job = apps.get_model('jobs', 'Job')
+    jobs = Job.objects.in_bulk([job_id for job_id, _ in ranked])
+    results = []
+    for job_id, rank in ranked:
+        job = jobs.get(job_id)
+        if job is not None:
+            job.search_rank = rank
+            results.append(job)
+    return results
+
+
+# Index maintenance
+
+def _sqlite_schema_sql() -> List[str]:
+    columns = 'title, description, requirements, responsibilities'
+    new_values = ("new.id, new.title, new.description, "
+                  "coalesce(new.requirements, ''), coalesce(new.responsibilities, '')")
+    old_values = ("'delete', old.id, old.title, old.description, "
+                  "coalesce(old.requirements, ''), coalesce(old.responsibilities, '')")
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, content='jobs_job', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ai AFTER INSERT ON jobs_job BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ad AFTER DELETE ON jobs_job BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ({old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS jobs_job_fts_au "
+        f"AFTER UPDATE OF {columns} ON jobs_job BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ({old_values}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values}); END",
+    ]
+
+
+def _pg_vector_sql() -> str:
+    weighted = []
+    for column, weight in (('title', 'A'), ('requirements', 'B'), ('responsibilities', 'C'), ('description', 'D')):
+        for config in PG_CONFIGS:
+            weighted.append(f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')")
+    return ' || '.join(weighted)
+
+
+def ensure_search_index(schema_connection=None) -> bool:
+    """
+    Create the full-text index if it is missing; returns whether anything was
+    (re)built. SQLite drops triggers when Django remakes jobs_job during a
+    migration, so this runs after every migrate and rebuilds the index then.
+    """
+    conn = schema_connection or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)",
+                [FTS_TABLE, *FTS_TRIGGERS],
+            )
+            if len(cursor.fetchall()) == len(FTS_TRIGGERS) + 1:
+                return False
+            for statement in _sqlite_schema_sql():
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            logger.info("Rebuilt SQLite full-text job index")
+            return True
+
+        if conn.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT 1 FROM information_schema.columns WHERE table_name = 'jobs_job' AND column_name = %s",
+                [PG_VECTOR_COLUMN],
+            )
+            if cursor.fetchone() is not None:
+                return False
+            cursor.execute(
+                f"ALTER TABLE jobs_job ADD COLUMN {PG_VECTOR_COLUMN} tsvector "
+                f"GENERATED ALWAYS AS ({_pg_vector_sql()}) STORED"
+            )
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON jobs_job USING GIN ({PG_VECTOR_COLUMN})")
+            logger.info("Created Postgres full-text job index")
+            return True
+    return False
+
+
+def drop_search_index(schema_connection=None) -> None:
+    conn = schema_connection or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            for trigger in FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        elif conn.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+            cursor.execute(f"ALTER TABLE jobs_job DROP COLUMN IF EXISTS {PG_VECTOR_COLUMN}")
@@ -1,12 +1,20 @@
 import requests
+import json
 import logging
 from django.conf import settings
 from django.apps import apps
 from typing import List, Dict, Any, Optional, Union
 from resumes.utils import AIAnalyzer
+from core.tiered_cache import TieredCache
+from core.request_timing import HH, stage
 
 logger = logging.getLogger(__name__)
 
+# HH.ru search responses, shared by HHApiClient and EnhancedHHApiClient
+HH_SEARCH_CACHE = TieredCache(
+    'hh_search', timeout=settings.HH_SEARCH_CACHE_TTL, stale_ttl=settings.HH_SEARCH_CACHE_STALE_TTL
+)
+
 class HHApiClient:
     # City/country name to HH.ru area ID mapping
     LOCATION_MAPPING = {
@@ -88,22 +96,29 @@ class HHApiClient:
             # Set default area to Moscow (1) if not provided
             clean_params['area'] = '1'
         
-        try:
-            logger.info(f"Searching HH.ru with parameters: {clean_params}")
-            response = requests.get(url, headers=self.headers, params=clean_params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            error_msg = f"HH.ru API request failed: {str(e)}"
-            logger.error(error_msg)
-            raise Exception(error_msg) from e
+        def fetch():
+            try:
+                logger.info(f"Searching HH.ru with parameters: {clean_params}")
+                with stage(HH):
+                    response = requests.get(url, headers=self.headers, params=clean_params, timeout=30)
+                response.raise_for_status()
+                return response.json()
+            except requests.exceptions.RequestException as e:
+                error_msg = f"HH.ru API request failed: {str(e)}"
+                logger.error(error_msg)
+                raise Exception(error_msg) from e
+        
+        # Failed requests raise, so only real responses are cached
+        cache_key = f"vacancies:{json.dumps(clean_params, sort_keys=True, default=str)}"
+        return HH_SEARCH_CACHE.get_or_compute(cache_key, fetch)
     
     def get_vacancy_details(self, vacancy_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific vacancy"""
         url = f"{self.base_url}/vacancies/{vacancy_id}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            with stage(HH):
+                response = requests.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -118,7 +133,8 @@ class HHApiClient:
         
         try:
             logger.info(f"Fetching areas dictionary from HH.ru API")
-            response = requests.get(url, headers=self.headers, timeout=30)
+            with stage(HH):
+                response = requests.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,79 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_migrate)
+def ensure_job_search_index(sender, using='default', **kwargs):
+    """Recreate the full-text job index if a migration dropped it"""
+    if sender.name != 'jobs':
+        return
+
+    from django.db import connections
+    from .search import ensure_search_index
+    try:
+        ensure_search_index(connections[using])
+    except Exception as e:
+        logger.error(f"Could not ensure full-text job index: {e}")
+
+
+JOB_SKILL_SOURCE_FIELDS = {'description', 'requirements', 'responsibilities', 'required_skills'}
+
+
+def _dispatch_job_skill_sync(job_id: int) -> None:
+    from resumes.dispatcher import broker_configured
+    from .skills import sync_job_skills_by_id
+    try:
+        if broker_configured():
+            from config.celery import app as celery_app
+            celery_app.send_task('jobs.tasks.sync_job_skills_task', args=[job_id])
+        else:
+            from core.executors import cpu_executor
+            cpu_executor().submit(sync_job_skills_by_id, job_id)
+    except Exception as e:
+        logger.error(f"Could not schedule skill sync for job {job_id}: {e}")
+
+
+@receiver(post_save, sender='jobs.Job')
+def sync_job_skill_links(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Keep JobSkill rows in step with the job text and key skills. Only saves
+    that change those sources schedule a sync, which runs after commit on a
+    Celery worker, or on the cpu executor without a broker.
+    """
+    if raw or not (created or update_fields is None or JOB_SKILL_SOURCE_FIELDS & set(update_fields)):
+        return
+
+    from .skills import job_skill_source_hash
+    try:
+        if job_skill_source_hash(instance) == instance.skills_source_hash:
+            return
+    except Exception as e:
+        logger.error(f"Could not hash skill sources for job {instance.id}: {e}")
+        return
+
+    job_id = instance.id
+    transaction.on_commit(lambda: _dispatch_job_skill_sync(job_id))
+
+
+@receiver(post_save, sender='resumes.Resume')
+def sync_resume_skill_links(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keep ResumeSkill rows in step with Resume.extracted_skills"""
+    if raw or not (created or update_fields is None or 'extracted_skills' in update_fields):
+        return
+
+    from .skills import sync_resume_skills
+    try:
+        sync_resume_skills(instance)
+    except Exception as e:
+        logger.error(f"Could not sync skills for resume {instance.id}: {e}")
+
+
+@receiver([post_save, post_delete], sender='jobs.SkillAlias')
+def clear_skill_alias_cache(sender, **kwargs):
+    from .skills import clear_alias_cache
+    clear_alias_cache()
@@ -0,0 +1,255 @@
+"""
+Normalized skill catalog.
+
+Skills otherwise live in JSON lists (Resume.extracted_skills,
+Job.required_skills, JobMatch.matching_skills), which cannot be joined or
+indexed. The catalog keeps one Skill row per canonical (lowercased) name, with
+SkillAlias rows mapping alternative spellings onto it, and link tables:
+
+    JobSkill     - HH.ru key skills plus the skills JobMatcher extracts from
+                   the job text (extract_job_skills), refreshed after a save
+                   that changes them (jobs.signals), off the request path
+    ResumeSkill  - Resume.extracted_skills, refreshed on save
+
+With those, overlap between one resume and every job is a single GROUP BY
+(skill_overlap_scores) and "jobs needing skill X" is an index lookup
+(jobs_needing_skill). AdvancedJobMatcher adds the best-overlapping jobs to
+its candidates. The sync_skill_tables command seeds the catalog and backfills
+the links for existing rows.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, QuerySet, Subquery
+
+logger = logging.getLogger(__name__)
+
+_alias_map: Optional[Dict[str, str]] = None
+_alias_lock = threading.Lock()
+
+
+def _normalize(name: str) -> str:
+    return ' '.join(str(name).lower().split())
+
+
+def _aliases() -> Dict[str, str]:
+    global _alias_map
+    if _alias_map is None:
+        with _alias_lock:
+            if _alias_map is None:
+                SkillAlias = apps.get_model('jobs', 'SkillAlias')
+                _alias_map = dict(SkillAlias.objects.values_list('alias', 'skill__name'))
+    return _alias_map
+
+
+def clear_alias_cache() -> None:
+    global _alias_map
+    with _alias_lock:
+        _alias_map = None
+
+
+def canonical_skill_name(name: str) -> str:
+    """Lowercased canonical name for a skill spelling, following aliases"""
+    normalized = _normalize(name)
+    return _aliases().get(normalized, normalized)
+
+
+def resolve_skills(names: Iterable[str]) -> Dict[str, int]:
+    """Canonical name -> Skill id for the given spellings, creating missing skills"""
+    Skill = apps.get_model('jobs', 'Skill')
+
+    display_names = {}
+    for name in names:
+        if name and str(name).strip():
+            display_names.setdefault(canonical_skill_name(name), str(name).strip())
+    if not display_names:
+        return {}
+
+    skill_ids = dict(Skill.objects.filter(name__in=display_names).values_list('name', 'id'))
+    missing = [name for name in display_names if name not in skill_ids]
+    if missing:
+        # Concurrent syncs may create the same skills
+        Skill.objects.bulk_create(
+            [Skill(name=name, display_name=display_names[name][:100]) for name in missing],
+            ignore_conflicts=True,
+        )
+        skill_ids.update(Skill.objects.filter(name__in=missing).values_list('name', 'id'))
+    return skill_ids
+
+
+def _sync_links(model, owner_field: str, owner_id: int, wanted: Dict[int, dict],
+                fields: Iterable[str] = ()) -> int:
+    """Make owner's link rows equal wanted (skill id -> field values); returns rows changed"""
+    existing = {
+        link['skill_id']: link
+        for link in model.objects.filter(**{owner_field: owner_id}).values('id', 'skill_id', *fields)
+    }
+
+    stale = [link['id'] for skill_id, link in existing.items() if skill_id not in wanted]
+    new = [
+        model(**{owner_field: owner_id, 'skill_id': skill_id, **values})
+        for skill_id, values in wanted.items() if skill_id not in existing
+    ]
+    changed = [
+        (existing[skill_id]['id'], values)
+        for skill_id, values in wanted.items()
+        if skill_id in existing and any(existing[skill_id][key] != value for key, value in values.items())
+    ]
+
+    with transaction.atomic():
+        if stale:
+            model.objects.filter(id__in=stale).delete()
+        if new:
+            model.objects.bulk_create(new, ignore_conflicts=True)
+        for link_id, values in changed:
+            model.objects.filter(id=link_id).update(**values)
+    return len(stale) + len(new) + len(changed)
+
+
+def job_skill_names(job) -> Dict[str, str]:
+    """Skill spelling -> source for a stored job, as JobMatcher sees its text"""
+    from .job_matcher import extract_job_skills
+
+    names = {}
+    for skill in extract_job_skills({
+        'description': job.description,
+        'snippet': {
+            'requirement': job.requirements or '',
+            'responsibility': job.responsibilities or '',
+        },
+    }):
+        names[skill] = 'text'
+    for skill in job.required_skills or []:
+        if isinstance(skill, str):
+            names[skill] = 'required'
+    return names
+
+
+def job_skill_source_hash(job) -> str:
+    """Hash of the fields a job's skill links are extracted from"""
+    from .score_memo import content_hash
+    return content_hash([job.description, job.requirements, job.responsibilities, job.required_skills])
+
+
+def sync_job_skills(job, force: bool = False) -> int:
+    """
+    Refresh a job's JobSkill rows unless its skill sources are unchanged since
+    the last sync (force skips that check); returns the number of rows changed
+    """
+    Job = apps.get_model('jobs', 'Job')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    source_hash = job_skill_source_hash(job)
+    if not force and source_hash == job.skills_source_hash:
+        return 0
+
+    names = job_skill_names(job)
+    skill_ids = resolve_skills(names)
+
+    wanted = {}
+    for name, source in names.items():
+        skill_id = skill_ids[canonical_skill_name(name)]
+        # Required (HH key skill) wins over text extraction for the same skill
+        if wanted.get(skill_id, {}).get('source') != 'required':
+            wanted[skill_id] = {'source': source}
+    changed = _sync_links(JobSkill, 'job_id', job.id, wanted, fields=['source'])
+
+    # update() rather than save(), so the sync does not signal itself again
+    Job.objects.filter(id=job.id).update(skills_source_hash=source_hash)
+    job.skills_source_hash = source_hash
+    return changed
+
+
+def sync_job_skills_by_id(job_id: int) -> int:
+    """sync_job_skills for a stored job, as deferred by jobs.signals"""
+    Job = apps.get_model('jobs', 'Job')
+    fields = ('id', 'description', 'requirements', 'responsibilities', 'required_skills', 'skills_source_hash')
+    job = Job.objects.only(*fields).filter(id=job_id).first()
+    return sync_job_skills(job) if job is not None else 0
+
+
+def sync_resume_skills(resume) -> int:
+    """Refresh a resume's ResumeSkill rows; returns the number of rows changed"""
+    ResumeSkill = apps.get_model('jobs', 'ResumeSkill')
+    names = [skill for skill in resume.extracted_skills or [] if isinstance(skill, str)]
+    skill_ids = resolve_skills(names)
+    return _sync_links(ResumeSkill, 'resume_id', resume.id, {skill_id: {} for skill_id in skill_ids.values()})
+
+
+def skill_overlap_scores(resume, limit: Optional[int] = None, active_only: bool = True) -> QuerySet:
+    """
+    Per-job skill overlap with a resume, in one GROUP BY over JobSkill.
+    Rows are dicts: job_id, overlap (shared skills), job_skill_count, best first.
+    Only jobs sharing at least one skill are returned.
+    """
+    ResumeSkill = apps.get_model('jobs', 'ResumeSkill')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+
+    resume_skills = ResumeSkill.objects.filter(resume=resume).values('skill_id')
+    job_skill_count = (
+        JobSkill.objects.filter(job_id=OuterRef('job_id'))
+        .order_by().values('job_id').annotate(count=Count('id')).values('count')
+    )
+    queryset = JobSkill.objects.filter(skill_id__in=Subquery(resume_skills))
+    if active_only:
+        queryset = queryset.filter(job__is_active=True)
+    queryset = (
+        queryset.order_by().values('job_id')
+        .annotate(overlap=Count('id'), job_skill_count=Subquery(job_skill_count))
+        .order_by('-overlap', 'job_skill_count', '-job_id')
+    )
+    return queryset[:limit] if limit else queryset
+
+
+def jobs_needing_skill(name: str, active_only: bool = True, required_only: bool = False) -> QuerySet:
+    """Jobs linked to a skill (any spelling of it), via the (skill, job) index"""
+    Job = apps.get_model('jobs', 'Job')
+    links = Q(skill_links__skill__name=canonical_skill_name(name))
+    if required_only:
+        links &= Q(skill_links__source='required')
+    queryset = Job.objects.filter(links)
+    if active_only:
+        queryset = queryset.filter(is_active=True)
+    return queryset
+
+
+def seed_skill_catalog() -> Dict[str, int]:
+    """
+    Create Skill rows for every skill the extractors know and SkillAlias rows
+    for the analyzer taxonomy's aliases. Idempotent.
+    """
+    from resumes.matching_models import ANALYZER_SKILL_TAXONOMY
+    from resumes.universal_skills import UNIVERSAL_SKILLS_DATABASE
+
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+
+    catalog = {}
+    for category, subcategories in UNIVERSAL_SKILLS_DATABASE.items():
+        for skills in subcategories.values():
+            for skill in skills:
+                catalog.setdefault(_normalize(skill), (skill, category))
+    for category, data in ANALYZER_SKILL_TAXONOMY.items():
+        for skill in data.get('skills', []):
+            # The taxonomy has the conventional capitalization
+            catalog[_normalize(skill)] = (skill, catalog.get(_normalize(skill), (None, category))[1])
+
+    Skill.objects.bulk_create(
+        [Skill(name=name, display_name=display[:100], category=category) for name, (display, category) in catalog.items()],
+        ignore_conflicts=True,
+    )
+    skill_ids = dict(Skill.objects.values_list('name', 'id'))
+
+    aliases = []
+    for data in ANALYZER_SKILL_TAXONOMY.values():
+        for alias, target in data.get('aliases', {}).items():
+            alias, target = _normalize(alias), _normalize(target)
+            if alias != target and target in skill_ids and alias not in catalog:
+                aliases.append(SkillAlias(alias=alias, skill_id=skill_ids[target]))
+    SkillAlias.objects.bulk_create(aliases, ignore_conflicts=True)
+    clear_alias_cache()
+
+    return {'skills': Skill.objects.count(), 'aliases': SkillAlias.objects.count()}
@@ -1,10 +1,14 @@
-from celery import shared_task
+from celery import group, shared_task
+from django.conf import settings
+from django.db.models import OuterRef, Q, Subquery
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.apps import apps
 from datetime import timedelta
+import math
 from .services import HHApiClient, JobMatcher
 from notifications.tasks import send_job_matches_email
+from accounts.dashboard_summary import refresh_summary_on_commit
 import logging
 
 User = get_user_model()
@@ -20,7 +24,7 @@ def search_and_match_jobs_task(self, user_id, resume_id):
     """Search for jobs and create matches for a specific user"""
     try:
         user = User.objects.get(id=user_id)
-        resume = Resume.objects.get(id=resume_id, user=user, status='completed')
+        resume = Resume.objects.get(id=resume_id, user=user, status__in=Resume.ANALYZED_STATUSES)
         
         # Create job search record
         job_search = JobSearch.objects.create(
@@ -136,6 +140,7 @@ def search_and_match_jobs_task(self, user_id, resume_id):
         job_search.status = 'completed'
         job_search.completed_at = timezone.now()
         job_search.save()
+        refresh_summary_on_commit(user)
         
         # Update user's last job search
         user.profile.last_job_search = timezone.now()
@@ -170,26 +175,78 @@ def search_and_match_jobs_task(self, user_id, resume_id):
         
         return {'status': 'error', 'message': str(exc)}
 
-@shared_task
-def weekly_job_search_for_all_users():
-    """Run weekly job search for all active users"""
-    active_users = User.objects.filter(
+def weekly_job_search_pairs():
+    """
+    (user_id, resume_id) pairs due for the weekly search, one query:
+    each eligible user annotated with their latest analyzed resume.
+    """
+    latest_resume = Resume.objects.filter(
+        user=OuterRef('pk'),
+        status__in=Resume.ANALYZED_STATUSES
+    ).order_by('-created_at').values('id')[:1]
+
+    cutoff = timezone.now() - timedelta(days=7)
+
+    return User.objects.filter(
+        Q(profile__last_job_search__isnull=True) | Q(profile__last_job_search__lt=cutoff),
         profile__is_job_search_active=True,
         profile__weekly_job_emails=True,
-        resumes__status='completed'
-    ).distinct()
-    
-    count = 0
-    for user in active_users:
-        # Check if user hasn't had a job search in the last week
-        if (not user.profile.last_job_search or 
-            user.profile.last_job_search < timezone.now() - timedelta(days=7)):
-            
-            # Get user's latest completed resume
-            latest_resume = user.resumes.filter(status='completed').first()
-            if latest_resume:
-                search_and_match_jobs_task.delay(user.id, latest_resume.id)
-                count += 1
-    
-    logger.info(f"Scheduled weekly job search for {count} users")
-    return {'scheduled_searches': count}
\ No newline at end of file
+    ).annotate(
+        latest_resume_id=Subquery(latest_resume)
+    ).filter(
+        latest_resume_id__isnull=False
+    ).order_by('id').values_list('id', 'latest_resume_id')
+
+# Redis/SQS redeliver a message still unacked after the visibility timeout (one hour by
+# default), and a countdown message stays unacked until it runs
+WEEKLY_BATCH_MAX_COUNTDOWN = 60 * 60 - 5 * 60
+
+@shared_task
+def weekly_job_search_for_all_users():
+    """
+    Run weekly job search for all active users.
+    Searches are enqueued in batches spread evenly over
+    WEEKLY_JOB_SEARCH_WINDOW seconds instead of all at once. Each batch
+    enqueues the next one, so no message waits longer than the spacing
+    between two batches and the broker's visibility timeout can stay short.
+    """
+    batch_size = max(1, getattr(settings, 'WEEKLY_JOB_SEARCH_BATCH_SIZE', 50))
+    window = getattr(settings, 'WEEKLY_JOB_SEARCH_WINDOW', 6 * 60 * 60)
+
+    total = weekly_job_search_pairs().count()
+    if not total:
+        logger.info("Scheduled weekly job search for 0 users")
+        return {'scheduled_searches': 0, 'batches': 0}
+
+    batches = math.ceil(total / batch_size)
+    spacing = min(window / batches, WEEKLY_BATCH_MAX_COUNTDOWN)
+    weekly_job_search_batch.delay(0, int(spacing))
+
+    logger.info(f"Scheduling weekly job search for {total} users in {batches} batches, {int(spacing)}s apart")
+    return {'scheduled_searches': total, 'batches': batches}
+
+@shared_task
+def weekly_job_search_batch(after_user_id, spacing):
+    """Enqueue the weekly searches of the next batch of users, then schedule the batch after it"""
+    batch_size = max(1, getattr(settings, 'WEEKLY_JOB_SEARCH_BATCH_SIZE', 50))
+    batch = list(weekly_job_search_pairs().filter(id__gt=after_user_id)[:batch_size])
+    if not batch:
+        return {'scheduled_searches': 0}
+
+    group(search_and_match_jobs_task.s(user_id, resume_id) for user_id, resume_id in batch).apply_async()
+    if len(batch) == batch_size:
+        weekly_job_search_batch.apply_async(args=[batch[-1][0], spacing], countdown=spacing)
+    return {'scheduled_searches': len(batch)}
+
+@shared_task
+def sync_job_skills_task(job_id):
+    """Refresh a job's JobSkill links after its skill sources changed (see jobs.signals)"""
+    from .skills import sync_job_skills_by_id
+    return sync_job_skills_by_id(job_id)
+
+
+@shared_task
+def apply_retention_policies_task():
+    """Prune old matches, compact old searches and archive inactive jobs (see jobs.retention)"""
+    from .retention import run_retention
+    return run_retention()
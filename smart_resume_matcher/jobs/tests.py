@@ -1,3 +1,539 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import LOCMEM_CACHES
+from jobs.models import Job, JobApplication, JobMatch
+from jobs.retention import run_retention
+from resumes.models import Resume
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobPageQueryCountTests(TestCase):
+    """Job pages must cost a constant number of queries, however many jobs they show"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='reader', email='reader@example.com', password='secret-pass-123'
+        )
+        cls.resume = Resume.objects.create(
+            user=cls.user, original_filename='cv.pdf', extracted_skills=['python', 'django']
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def _add_jobs(self, count, start=0):
+        jobs = []
+        for i in range(start, start + count):
+            job = Job.objects.create(
+                hh_id=f'hh-{i}', title=f'Python developer {i}', company_name='Acme',
+                description='<p>Python and Django</p>', location='Almaty'
+            )
+            JobMatch.objects.create(user=self.user, job=job, resume=self.resume, match_score=50 + i % 50)
+            if i % 2:
+                JobApplication.objects.create(user=self.user, job=job, resume=self.resume)
+            jobs.append(job)
+        return jobs
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_job_list_queries_do_not_grow_with_page_size(self):
+        self._add_jobs(2)
+        small_page, _ = self._count_queries(reverse('job_list'))
+
+        self._add_jobs(20, start=2)
+        full_page, response = self._count_queries(reverse('job_list'))
+
+        self.assertEqual(len(response.context['job_matches']), 10)
+        self.assertEqual(small_page, full_page)
+        self.assertContains(response, 'Applied')
+
+    def test_job_detail_queries_do_not_grow_with_similar_jobs(self):
+        job = self._add_jobs(2)[1]
+        few_similar, _ = self._count_queries(reverse('job_detail', args=[job.id]))
+
+        self._add_jobs(10, start=2)
+        many_similar, response = self._count_queries(reverse('job_detail', args=[job.id]))
+
+        self.assertEqual(few_similar, many_similar)
+        self.assertEqual(response.context['job_match'].job_id, job.id)
+        self.assertEqual(response.context['application_status'], 'applied')
+        self.assertEqual(len(response.context['similar_jobs']), 5)
+        self.assertTrue(all(similar.match_score is not None for similar in response.context['similar_jobs']))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class KeysetPaginationTests(TestCase):
+    """Cursor pages walk the (score, id) order both ways and shrug off bad cursors"""
+
+    SCORES = [90, 80, 80, 80, 80, 70, 60]
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            username='pager', email='pager@example.com', password='secret-pass-123'
+        )
+        cls.resume = Resume.objects.create(user=user, original_filename='cv.pdf')
+        for i, score in enumerate(cls.SCORES):
+            job = Job.objects.create(hh_id=f'hh-{i}', title=f'Engineer {i}', company_name='Acme',
+                                     description='', location='Almaty')
+            JobMatch.objects.create(user=user, job=job, resume=cls.resume, match_score=score)
+
+    def _matches(self):
+        return JobMatch.objects.filter(resume=self.resume)
+
+    def _ids(self, page):
+        return [match.id for match in page]
+
+    def test_next_and_previous_round_trip_across_tied_scores(self):
+        from core.pagination import keyset_page
+
+        expected = list(self._matches().order_by('-match_score', '-pk').values_list('id', flat=True))
+
+        pages = [keyset_page(self._matches(), page_size=3)]
+        while pages[-1].has_next:
+            pages.append(keyset_page(self._matches(), pages[-1].next_cursor, page_size=3))
+
+        # The 80s straddle the first page boundary; none is skipped or repeated
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([pk for page in pages for pk in self._ids(page)], expected)
+        self.assertFalse(pages[0].has_previous)
+        self.assertTrue(all(page.has_previous for page in pages[1:]))
+
+        back = pages[-1]
+        for page in reversed(pages[:-1]):
+            back = keyset_page(self._matches(), back.previous_cursor, page_size=3)
+            self.assertEqual(self._ids(back), self._ids(page))
+            self.assertTrue(back.has_next)
+        self.assertFalse(back.has_previous)
+
+    def test_tampered_or_malformed_cursors_fall_back_to_the_first_page(self):
+        from django.core import signing
+
+        from core.pagination import CURSOR_SALT, keyset_page
+
+        first = keyset_page(self._matches(), page_size=3)
+        cursor = first.next_cursor
+        tampered = cursor[:-1] + ('A' if cursor[-1] != 'A' else 'B')
+        bad_direction = signing.dumps({'s': 80, 'i': 1, 'd': 'x'}, salt=CURSOR_SALT)
+        bad_score = signing.dumps({'s': 'high', 'i': 1, 'd': 'n'}, salt=CURSOR_SALT)
+        wrong_salt = signing.dumps({'s': 80, 'i': 1, 'd': 'n'})
+
+        for bad in (tampered, 'not-a-cursor', bad_direction, bad_score, wrong_salt):
+            with self.subTest(cursor=bad), self.assertLogs('core.pagination', 'WARNING'):
+                page = keyset_page(self._matches(), bad, page_size=3)
+            self.assertEqual(self._ids(page), self._ids(first))
+            self.assertFalse(page.has_previous)
+
+    def test_job_list_ignores_a_tampered_cursor(self):
+        self.client.force_login(self.resume.user)
+        with self.assertLogs('core.pagination', 'WARNING'):
+            response = self.client.get(reverse('job_list'), {'cursor': 'forged'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['job_matches']), len(self.SCORES))
+        self.assertFalse(response.context['job_matches'].has_previous)
+
+
+class JobDescriptionTextTests(TestCase):
+    """Sanitized description renderings are stored on save and kept in step with the HTML"""
+
+    HTML = '<p><strong>Обязанности</strong></p><ul><li>Писать код на Python</li><li>Ревью</li></ul><p>Удалённо &amp; гибко</p>'
+
+    def _job(self, **fields):
+        return Job.objects.create(hh_id='hh-text', title='Engineer', company_name='Acme',
+                                  location='Almaty', **fields)
+
+    def test_save_stores_the_sanitized_renderings(self):
+        from jobs.description_text import DESCRIPTION_TEXT_VERSION
+
+        job = Job.objects.get(id=self._job(description=self.HTML, requirements='<p>Django</p>').id)
+
+        self.assertEqual(job.description_text, 'Обязанности:\n\n• Писать код на Python\n• Ревью\nУдалённо & гибко')
+        self.assertEqual(job.description_structured, '## Обязанности • Писать код на Python • Ревью Удалённо & гибко')
+        self.assertEqual(job.requirements_text, 'Django')
+        self.assertEqual(job.text_version, DESCRIPTION_TEXT_VERSION)
+        with self.assertNumQueries(0):
+            self.assertEqual(job.get_clean_description(), job.description_text)
+
+    def test_update_fields_on_a_source_field_also_writes_the_derived_ones(self):
+        job = self._job(description='<p>Old</p>')
+
+        job.description = self.HTML
+        job.save(update_fields=['description'])
+        stored = Job.objects.get(id=job.id)
+        self.assertIn('• Ревью', stored.description_text)
+        self.assertTrue(stored.description_structured.startswith('## Обязанности'))
+
+        # Saves that do not touch the HTML leave update_fields alone
+        Job.objects.filter(id=job.id).update(description_text='stale')
+        job.title = 'Senior engineer'
+        job.save(update_fields=['title'])
+        self.assertEqual(Job.objects.get(id=job.id).description_text, 'stale')
+
+    def test_backfill_recomputes_stale_rows(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        job = self._job(description=self.HTML)
+        Job.objects.filter(id=job.id).update(description_text='', description_structured='', text_version=0)
+
+        call_command('backfill_job_text', batch_size=1, stdout=StringIO())
+
+        stored = Job.objects.get(id=job.id)
+        self.assertEqual(stored.description_text, job.description_text)
+        self.assertEqual(stored.description_structured, job.description_structured)
+        self.assertEqual(stored.text_version, job.text_version)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobListDispatchTests(TestCase):
+    """A resume without matches gets them generated in the background"""
+
+    def test_dispatch_failure_is_reported_not_raised(self):
+        user = get_user_model().objects.create_user(
+            username='newcomer', email='newcomer@example.com', password='secret-pass-123'
+        )
+        Resume.objects.create(user=user, original_filename='cv.pdf', extracted_skills=['python'])
+        self.client.force_login(user)
+
+        with mock.patch('resumes.dispatcher.dispatch_job_match_generation', side_effect=ConnectionError('broker down')):
+            response = self.client.get(reverse('job_list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['matches_pending'])
+        self.assertIn('broker down', [str(message) for message in response.context['messages']][0])
+
+
+class ScoreMemoTests(TestCase):
+    """Scores are memoized per scorer version and input hashes, in the LRU and the table"""
+
+    def setUp(self):
+        from jobs.score_memo import _get_lru
+        _get_lru().clear()
+
+    def test_hits_are_copies(self):
+        from jobs.score_memo import ScoreMemo
+
+        memo = ScoreMemo('test_scorer', 'v1')
+        compute = mock.Mock(return_value=(70.0, {'breakdown': {'skills': 80}}))
+        score, details = memo.memoize('resume', 'job', compute)
+        details['breakdown']['skills'] = 0
+
+        self.assertEqual(memo.memoize('resume', 'job', compute), (70.0, {'breakdown': {'skills': 80}}))
+        compute.assert_called_once()
+
+    def test_version_and_input_changes_miss(self):
+        from jobs.score_memo import ScoreMemo
+
+        ScoreMemo('test_scorer', 'v1').put('resume', 'job', 70.0, {})
+        self.assertIsNotNone(ScoreMemo('test_scorer', 'v1').get('resume', 'job'))
+        self.assertIsNone(ScoreMemo('test_scorer', 'v2').get('resume', 'job'))
+        self.assertIsNone(ScoreMemo('test_scorer', 'v1').get('resume', 'edited-job'))
+        self.assertIsNone(ScoreMemo('test_scorer', 'v1').get('re-analyzed-resume', 'job'))
+
+    def test_table_backs_the_lru(self):
+        from jobs.models import MatchScoreMemo
+        from jobs.score_memo import ScoreMemo, _get_lru, purge_stale_scores
+
+        memo = ScoreMemo('test_scorer', 'v1')
+        memo.put('resume', 'job-1', 70.0, {'skills': 80})
+        memo.put('resume', 'job-2', 40.0, {'skills': 10})
+        self.assertEqual(memo.flush(), 2)
+        _get_lru().clear()
+
+        self.assertIsNone(memo.get('resume', 'job-1', check_db=False))
+        self.assertEqual(memo.get('resume', 'job-1'), (70.0, {'skills': 80}))
+        self.assertEqual(memo.prefetch('resume', ['job-1', 'job-2']), 1)
+        self.assertEqual(memo.get('resume', 'job-2', check_db=False), (40.0, {'skills': 10}))
+
+        old_memo = ScoreMemo('test_scorer', 'v0')
+        old_memo.put('resume', 'job-1', 10.0, {})
+        old_memo.flush()
+        self.assertEqual(purge_stale_scores('test_scorer', 'v1'), 1)
+        self.assertEqual(MatchScoreMemo.objects.filter(scorer='test_scorer').count(), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobSearchTests(TestCase):
+    """The full-text index follows job writes, survives migrations and handles symbol skills"""
+
+    def _job(self, hh_id, title, description='', **fields):
+        return Job.objects.create(hh_id=hh_id, title=title, company_name='Acme',
+                                  description=description, location='Almaty', **fields)
+
+    def _found(self, terms, mode=None):
+        from jobs.search import ANY, search_job_ids
+        return sorted(
+            Job.objects.get(id=job_id).hh_id
+            for job_id, _ in search_job_ids(terms, mode=mode or ANY)
+        )
+
+    def test_triggers_keep_the_index_in_sync(self):
+        from jobs.search import backend
+
+        self.assertEqual(backend(), 'sqlite')
+        job = self._job('hh-1', 'Kotlin developer', 'Android apps')
+        self.assertEqual(self._found('kotlin'), ['hh-1'])
+
+        job.title = 'Swift developer'
+        job.save()
+        self.assertEqual(self._found('kotlin'), [])
+        self.assertEqual(self._found('swift'), ['hh-1'])
+
+        job.delete()
+        self.assertEqual(self._found('swift'), [])
+
+    def test_index_is_rebuilt_after_migrate(self):
+        from django.apps import apps as django_apps
+
+        from jobs.search import backend, drop_search_index
+        from jobs.signals import ensure_job_search_index
+
+        self._job('hh-1', 'Scala engineer')
+        drop_search_index()
+        self.assertIsNone(backend())
+        # Without the index, search falls back to icontains
+        self.assertEqual(self._found('scala'), ['hh-1'])
+
+        ensure_job_search_index(sender=django_apps.get_app_config('jobs'))
+        self.assertEqual(backend(), 'sqlite')
+        self.assertEqual(self._found('scala'), ['hh-1'])
+
+    def test_symbol_skills_match_as_written(self):
+        from jobs.models import Job as JobModel
+        from jobs.search import ALL, filter_jobs
+
+        self._job('hh-cpp', 'C++ developer', 'Modern C++ and Python')
+        self._job('hh-c', 'C developer', 'Embedded C')
+        self._job('hh-cs', 'C# engineer', 'ASP.NET Core')
+        self._job('hh-net', 'Network engineer', 'Cisco, net admin')
+
+        self.assertEqual(self._found('C++'), ['hh-cpp'])
+        self.assertEqual(self._found('C#'), ['hh-cs'])
+        self.assertEqual(self._found('.NET'), ['hh-cs'])
+        self.assertEqual(self._found(['python', 'c++'], mode=ALL), ['hh-cpp'])
+        self.assertEqual(self._found(['C#', 'embedded']), ['hh-c', 'hh-cs'])
+        self.assertEqual(
+            sorted(filter_jobs(JobModel.objects.all(), ['c++', 'python']).values_list('hh_id', flat=True)),
+            ['hh-cpp'],
+        )
+
+    def test_search_api(self):
+        user = get_user_model().objects.create_user(
+            username='searcher', email='searcher@example.com', password='secret-pass-123'
+        )
+        self.client.force_login(user)
+        self._job('hh-1', 'Rust developer', 'Systems programming')
+
+        response = self.client.get(reverse('api_job_search'), {'q': 'rust'})
+        self.assertEqual([result['title'] for result in response.json()['results']], ['Rust developer'])
+        self.assertEqual(self.client.get(reverse('api_job_search')).status_code, 400)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SkillLinkTests(TestCase):
+    """JobSkill links are rebuilt after commit, only when a job's skill sources change"""
+
+    def _job(self, hh_id, description, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Job.objects.create(hh_id=hh_id, title='Engineer', company_name='Acme',
+                                      description=description, location='Almaty', **fields)
+
+    def _links(self, job):
+        return sorted(job.skill_links.values_list('skill__name', flat=True))
+
+    def setUp(self):
+        # Run deferred syncs inline instead of on the cpu executor
+        patcher = mock.patch('core.executors.cpu_executor')
+        executor = patcher.start()
+        executor.return_value.submit.side_effect = lambda func, *args: func(*args)
+        self.addCleanup(patcher.stop)
+
+    def test_sync_is_deferred_and_skipped_for_unchanged_sources(self):
+        with mock.patch('jobs.skills.job_skill_names', return_value={'Python': 'text'}) as names:
+            with self.captureOnCommitCallbacks() as callbacks:
+                job = Job.objects.create(hh_id='hh-1', title='Engineer', company_name='Acme',
+                                         description='Python', location='Almaty')
+            names.assert_not_called()
+            for callback in callbacks:
+                callback()
+            self.assertEqual(self._links(job), ['python'])
+
+            job.refresh_from_db()
+            job.is_active = False
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                job.save()
+            self.assertEqual((len(callbacks), names.call_count), (0, 1))
+
+            job.description = 'Python and Go'
+            names.return_value = {'Python': 'text', 'Go': 'text'}
+            with self.captureOnCommitCallbacks(execute=True):
+                job.save()
+            self.assertEqual(self._links(job), ['go', 'python'])
+
+    def test_overlap_ranks_jobs_and_feeds_candidates(self):
+        from jobs.skills import jobs_needing_skill, skill_overlap_scores
+        from resumes.enhanced_job_matcher import AdvancedJobMatcher
+
+        user = get_user_model().objects.create_user(
+            username='overlap', email='overlap@example.com', password='secret-pass-123'
+        )
+        resume = Resume.objects.create(user=user, original_filename='cv.pdf', extracted_skills=['Python', 'Django'])
+        with mock.patch('jobs.skills.job_skill_names') as names:
+            names.return_value = {'Python': 'text', 'Django': 'text', 'PostgreSQL': 'text'}
+            both = self._job('hh-both', 'Python, Django, PostgreSQL')
+            names.return_value = {'Python': 'text', 'Django': 'text'}
+            exact = self._job('hh-exact', 'Python, Django')
+            names.return_value = {'Python': 'text'}
+            one = self._job('hh-one', 'Python')
+            names.return_value = {'Java': 'text'}
+            self._job('hh-none', 'Java')
+
+        rows = list(skill_overlap_scores(resume))
+        self.assertEqual([row['job_id'] for row in rows], [exact.id, both.id, one.id])
+        self.assertEqual((rows[0]['overlap'], rows[0]['job_skill_count']), (2, 2))
+
+        self.assertEqual(
+            sorted(jobs_needing_skill(' DJANGO ').values_list('hh_id', flat=True)), ['hh-both', 'hh-exact']
+        )
+
+        matcher = AdvancedJobMatcher(user, resume)
+        self.assertEqual([job.hh_id for job in matcher._skill_overlap_jobs({exact.id})], ['hh-both', 'hh-one'])
+
+
+@override_settings(RETENTION_CHUNK_SIZE=2, RETENTION_CHUNK_PAUSE=0, RETENTION_TIME_BUDGET=0,
+                   RETENTION_MATCHES_PER_RESUME=0, RETENTION_SEARCH_DAYS=0,
+                   RETENTION_INACTIVE_JOB_DAYS=0, RETENTION_MEMO_DAYS=0,
+                   CACHES=LOCMEM_CACHES)
+class RetentionTests(TestCase):
+    """Retention bounds the growing tables without losing what users still need"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='keeper', email='keeper@example.com', password='secret-pass-123'
+        )
+        cls.resume = Resume.objects.create(user=cls.user, original_filename='cv.pdf')
+
+    def _jobs(self, count, **fields):
+        return [
+            Job.objects.create(hh_id=f'hh-{Job.objects.count()}', title='Engineer', company_name='Acme',
+                               description='Python', location='Almaty', **fields)
+            for _ in range(count)
+        ]
+
+    def _age(self, queryset, days, field):
+        queryset.update(**{field: timezone.now() - timedelta(days=days)})
+
+    @override_settings(RETENTION_MATCHES_PER_RESUME=3)
+    def test_matches_keep_the_newest_per_resume(self):
+        jobs = self._jobs(5)
+        matches = [JobMatch.objects.create(user=self.user, job=job, resume=self.resume) for job in jobs]
+        for age, match in enumerate(reversed(matches)):
+            self._age(JobMatch.objects.filter(id=match.id), age, 'updated_at')
+
+        self.assertEqual(run_retention(['matches'])['matches_deleted'], 2)
+        self.assertEqual(
+            sorted(JobMatch.objects.values_list('id', flat=True)), [match.id for match in matches[2:]]
+        )
+
+    @override_settings(RETENTION_SEARCH_DAYS=30)
+    def test_searches_fold_into_daily_totals_once(self):
+        from jobs.models import JobSearch, JobSearchDailyAggregate
+
+        for status, found in (('completed', 10), ('completed', 5), ('failed', 0), ('completed', 7)):
+            JobSearch.objects.create(user=self.user, resume=self.resume, search_query='python',
+                                     status=status, total_found=found, matches_found=found // 5)
+        recent = JobSearch.objects.order_by('-id')[:1].get()
+        self._age(JobSearch.objects.exclude(id=recent.id), 40, 'created_at')
+
+        self.assertEqual(run_retention(['searches'])['searches_compacted'], 3)
+        self.assertEqual(run_retention(['searches'])['searches_compacted'], 0)
+
+        aggregate = JobSearchDailyAggregate.objects.get(user=self.user)
+        self.assertEqual(
+            (aggregate.searches, aggregate.completed_searches, aggregate.total_found, aggregate.matches_found),
+            (3, 2, 15, 3),
+        )
+        self.assertEqual(list(JobSearch.objects.values_list('id', flat=True)), [recent.id])
+
+    @override_settings(RETENTION_INACTIVE_JOB_DAYS=90)
+    def test_inactive_jobs_are_archived_readably_unless_applied_to(self):
+        import gzip
+        import json
+        import tempfile
+
+        applied, stale, reopened = self._jobs(3, is_active=False)
+        JobApplication.objects.create(user=self.user, job=applied, resume=self.resume)
+        self._age(Job.objects.filter(id__in=[applied.id, stale.id]), 100, 'updated_at')
+
+        # Without durable storage for the archive nothing is deleted
+        self.assertIsNone(run_retention(['jobs'])['jobs_archived'])
+        self.assertEqual(Job.objects.count(), 3)
+
+        with tempfile.TemporaryDirectory() as archive_dir, override_settings(RETENTION_ARCHIVE_DIR=archive_dir):
+            result = run_retention(['jobs'])
+            with gzip.open(result['archive_path'], 'rt', encoding='utf-8') as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertEqual(result['jobs_archived'], 1)
+        self.assertEqual([(row['id'], row['hh_id']) for row in rows], [(stale.id, stale.hh_id)])
+        self.assertEqual(sorted(Job.objects.values_list('id', flat=True)), [applied.id, reopened.id])
+
+    @override_settings(RETENTION_MEMO_DAYS=30)
+    def test_old_score_memos_expire(self):
+        from jobs.models import MatchScoreMemo
+
+        for job_hash in ('old-1', 'old-2', 'old-3', 'new'):
+            MatchScoreMemo.objects.create(resume_hash='r', job_hash=job_hash, scorer='s', scorer_version='v1', score=1)
+        self._age(MatchScoreMemo.objects.filter(job_hash__startswith='old'), 40, 'created_at')
+
+        self.assertEqual(run_retention(['memos'])['memos_deleted'], 3)
+        self.assertEqual(list(MatchScoreMemo.objects.values_list('job_hash', flat=True)), ['new'])
+
+
+@override_settings(WEEKLY_JOB_SEARCH_BATCH_SIZE=2, WEEKLY_JOB_SEARCH_WINDOW=6 * 60 * 60, CACHES=LOCMEM_CACHES)
+class WeeklyJobSearchTests(TestCase):
+    """The weekly fan-out chains its batches instead of parking hours-long countdown messages"""
+
+    def test_batches_chain_with_short_countdowns(self):
+        from jobs import tasks
+
+        for i in range(5):
+            user = get_user_model().objects.create_user(
+                username=f'weekly-{i}', email=f'weekly-{i}@example.com', password='secret-pass-123'
+            )
+            Resume.objects.create(user=user, original_filename='cv.pdf', status='completed')
+
+        with mock.patch.object(tasks.weekly_job_search_batch, 'delay') as first:
+            self.assertEqual(tasks.weekly_job_search_for_all_users(), {'scheduled_searches': 5, 'batches': 3})
+        first.assert_called_once_with(0, tasks.WEEKLY_BATCH_MAX_COUNTDOWN)
+
+        scheduled = []
+        after_user_id = 0
+        with mock.patch.object(tasks, 'group') as group, \
+                mock.patch.object(tasks.weekly_job_search_batch, 'apply_async') as next_batch:
+            while True:
+                result = tasks.weekly_job_search_batch(after_user_id, 600)
+                scheduled.append(result['scheduled_searches'])
+                if not next_batch.called:
+                    break
+                self.assertEqual(next_batch.call_args.kwargs['countdown'], 600)
+                after_user_id = next_batch.call_args.kwargs['args'][0]
+                next_batch.reset_mock()
+
+        self.assertEqual(scheduled, [2, 2, 1])
+        self.assertEqual(group.return_value.apply_async.call_count, 3)
@@ -11,4 +11,6 @@ urlpatterns = [
     
     # API endpoints
     path('api/job-description/<int:job_id>/', api.get_formatted_job_description, name='api_job_description'),
+    path('api/search/', api.search_jobs_api, name='api_job_search'),
+    path('api/insights/<int:job_id>/', api.job_match_insights_api, name='api_job_match_insights'),
 ]
@@ -4,12 +4,19 @@ from django.contrib import messages
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.apps import apps
+from asgiref.sync import sync_to_async
+import logging
 from .services import HHApiClient
 from .job_matcher import JobMatcher
 from .enhanced_hh_client import EnhancedHHApiClient
 from .realtime_matcher import RealTimeJobMatcher
-from resumes.enhanced_job_matcher import AdvancedJobMatcher
 from accounts.decorators import jwt_login_required
+from core.pagination import keyset_page
+from .queries import annotate_matches_for_user, job_detail_queryset, similar_jobs
+from accounts.dashboard_summary import refresh_summary_on_commit
+from resumes.progress import current_seq, progress_shared
+
+logger = logging.getLogger(__name__)
 
 # Dynamically load models to avoid circular imports
 Resume = apps.get_model('resumes', 'Resume')
@@ -28,38 +35,22 @@ def job_list_view(request):
         messages.warning(request, "Please upload your resume to see job matches.")
         return redirect('jwt_resume_upload')
     
-    # Create enhanced job matcher
-    enhanced_matcher = AdvancedJobMatcher(user=request.user, resume=user_resume)
-    
-    # Try to get existing job matches, if none exist, generate them
-    job_matches = JobMatch.objects.filter(resume=user_resume).select_related('job')
+    # Try to get existing job matches, if none exist, generate them in the background
+    # (job joined and application status annotated: one query per page)
+    job_matches = annotate_matches_for_user(JobMatch.objects.filter(resume=user_resume), request.user)
     
+    matches_pending = False
+    progress_since = 0
     if not job_matches.exists():
-        # Generate enhanced job matches
+        from resumes.dispatcher import dispatch_job_match_generation
+        
+        # Stream only events published after this page was rendered
+        progress_since = current_seq(user_resume.id)
         try:
-            import asyncio
-            enhanced_matches = asyncio.run(enhanced_matcher.generate_advanced_job_matches(limit=20))
-            
-            # Create JobMatch objects from enhanced matches
-            for match_data in enhanced_matches:
-                if match_data.get('job'):
-                    job = match_data['job']
-                    JobMatch.objects.get_or_create(
-                        job=job,
-                        resume=user_resume,
-                        defaults={
-                            'user': request.user,
-                            'match_score': match_data.get('match_score', 0),
-                            'match_details': match_data.get('match_details', {}),
-                            'matching_skills': match_data.get('matching_skills', []),
-                            'missing_skills': match_data.get('missing_skills', [])
-                        }
-                    )
-            
-            job_matches = JobMatch.objects.filter(resume=user_resume).select_related('job')
-            if job_matches.exists():
-                messages.success(request, f"Generated {job_matches.count()} enhanced job matches based on your skills!")
+            dispatch_job_match_generation(user_resume.id)
+            matches_pending = True
         except Exception as e:
+            logger.error(f"Failed to dispatch job match generation for resume {user_resume.id}: {e}")
             messages.warning(request, f"Could not generate enhanced matches: {e}")
     
     # Filter options
@@ -74,26 +65,28 @@ def job_list_view(request):
     # Get unique skills from user's resume
     user_skills = set(user_resume.extracted_skills) if user_resume.extracted_skills else set()
     
-    # Order by match score
-    job_matches = job_matches.order_by('-match_score')
-    
-    # Pagination
-    paginator = Paginator(job_matches, 10)
-    page_number = request.GET.get('page', 1)
-    job_matches_page = paginator.get_page(page_number)
+    # Keyset pagination by (match_score, id): deep pages cost the same as the first
+    job_matches_page = keyset_page(job_matches, request.GET.get('cursor'), page_size=10, with_total=True)
     
     context = {
         'job_matches': job_matches_page,
         'user_skills': user_skills,
-        'match_filter': match_filter
+        'match_filter': match_filter,
+        'matches_pending': matches_pending,
+        'progress_resume_id': user_resume.id,
+        'progress_since': progress_since,
+        'progress_streaming': progress_shared(),
     }
     return render(request, 'jobs/job_list.html', context)
 
 @jwt_login_required
-def ai_job_matches_view(request):
-    """View to display AI-powered job matches fetched from HH.ru and HH.kz APIs"""
+async def ai_job_matches_view(request):
+    """
+    View to display AI-powered job matches fetched from HH.ru and HH.kz APIs.
+    Async so that a worker is not blocked while waiting on the HH APIs.
+    """
     # Get latest user resume
-    user_resume = Resume.objects.filter(user=request.user, is_active=True).first()
+    user_resume = await Resume.objects.filter(user=request.user, is_active=True).afirst()
     
     if not user_resume:
         messages.warning(request, "Please upload your resume to see AI job matches.")
@@ -123,7 +116,7 @@ def ai_job_matches_view(request):
                 search_query = ', '.join(user_resume.extracted_skills[:3])
         
         # Create JobSearch record
-        job_search = JobSearch.objects.create(
+        job_search = await JobSearch.objects.acreate(
             user=request.user,
             resume=user_resume,
             search_query=search_query,
@@ -134,38 +127,20 @@ def ai_job_matches_view(request):
         
         try:
             # Fetch jobs from HH.ru and HH.kz APIs in real-time
-            matched_jobs = realtime_matcher.find_matching_jobs(
+            matched_jobs = await realtime_matcher.find_matching_jobs_async(
                 search_query=search_query,
                 location=location,
                 limit=50
             )
             
-            # Convert job dictionaries to job-like objects for template compatibility
-            jobs = []
-            for job_data in matched_jobs:
-                # Handle date formatting for template compatibility
-                published_at = job_data.get('published_at')
-                if published_at:
-                    try:
-                        from datetime import datetime
-                        if isinstance(published_at, str):
-                            # Parse ISO format datetime string
-                            published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                        job_data['published_at'] = published_at
-                    except (ValueError, TypeError):
-                        # If parsing fails, set to current time
-                        job_data['published_at'] = timezone.now()
-                
-                # Create a simple object that behaves like a Django model
-                job_obj = type('Job', (), job_data)()
-                jobs.append(job_obj)
+            jobs = _realtime_job_objects(matched_jobs)
             
             job_search.total_found = len(jobs)
             job_search.jobs_analyzed = len(jobs)
             job_search.matches_found = len(jobs)
             job_search.status = 'completed'
             job_search.completed_at = timezone.now()
-            job_search.save()
+            await job_search.asave()
             
             # Success message
             if jobs:
@@ -177,7 +152,7 @@ def ai_job_matches_view(request):
             # Update JobSearch record with error
             job_search.status = 'failed'
             job_search.completed_at = timezone.now()
-            job_search.save()
+            await job_search.asave()
             
             # Log the detailed error for admins
             import logging
@@ -187,6 +162,35 @@ def ai_job_matches_view(request):
             # User-friendly error message
             messages.error(request, f"Error fetching jobs from HH APIs: {str(e)}")
     
+    # Template rendering may touch the ORM (context processors, lazy user)
+    return await sync_to_async(_ai_job_matches_response)(
+        request, user_resume, jobs, search_performed, search_query, location, auto_match
+    )
+
+def _realtime_job_objects(matched_jobs):
+    """Convert job dictionaries to job-like objects for template compatibility"""
+    jobs = []
+    for job_data in matched_jobs:
+        # Handle date formatting for template compatibility
+        published_at = job_data.get('published_at')
+        if published_at:
+            try:
+                from datetime import datetime
+                if isinstance(published_at, str):
+                    # Parse ISO format datetime string
+                    published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+                job_data['published_at'] = published_at
+            except (ValueError, TypeError):
+                # If parsing fails, set to current time
+                job_data['published_at'] = timezone.now()
+        
+        # Create a simple object that behaves like a Django model
+        job_obj = type('Job', (), job_data)()
+        jobs.append(job_obj)
+    return jobs
+
+def _ai_job_matches_response(request, user_resume, jobs, search_performed, search_query, location, auto_match):
+    """Build the JSON (auto-match AJAX) or HTML response for ai_job_matches_view"""
     # Pagination
     paginator = Paginator(jobs, 10)
     page_number = request.GET.get('page', 1)
@@ -380,6 +384,15 @@ def job_search_view(request):
             job_search.completed_at = timezone.now()
             job_search.save()
             
+            # One matcher for the whole page so memoized scores are looked up in one query
+            job_matcher = None
+            if use_ai_matching and user_resume:
+                job_matcher = JobMatcher(user=request.user, resume=user_resume)
+                job_matcher.score_memo.prefetch(
+                    job_matcher.resume_score_hash(),
+                    [job_matcher.job_score_hash(item) for item in search_results.get('items', [])]
+                )
+            
             # Process job results
             for item in search_results.get('items', []):
                 # Skip items with missing required fields
@@ -430,9 +443,8 @@ def job_search_view(request):
                         pass
                 
                 # Calculate match score if AI matching is enabled
-                if use_ai_matching and user_resume:
+                if job_matcher:
                     try:
-                        job_matcher = JobMatcher(user=request.user, resume=user_resume)
                         match_score, match_details = job_matcher.calculate_match_score(item)
                         
                         # Save match details
@@ -444,7 +456,8 @@ def job_search_view(request):
                                 'match_score': match_score,
                                 'match_details': match_details,
                                 'matching_skills': match_details.get('matching_skills', []),
-                                'missing_skills': match_details.get('missing_skills', [])
+                                'missing_skills': match_details.get('missing_skills', []),
+                                'analysis_version': job_matcher.SCORER_VERSION
                             }
                         )
                     except Exception as match_error:
@@ -453,6 +466,10 @@ def job_search_view(request):
                 
                 jobs.append(job)
             
+            if job_matcher:
+                job_matcher.score_memo.flush()
+                refresh_summary_on_commit(request.user)
+            
             # Success message
             messages.success(request, f"Found {len(jobs)} jobs matching your search.")
             
@@ -482,21 +499,17 @@ def job_search_view(request):
 @jwt_login_required
 def job_detail_view(request, job_id):
     """View job details"""
-    job = get_object_or_404(Job, id=job_id)
     user_resume = Resume.objects.filter(user=request.user, is_active=True).first()
     
-    # Get job match score if available
-    job_match = None
-    if user_resume:
-        job_match = JobMatch.objects.filter(job=job, resume=user_resume).first()
-    
-    # Check if user already applied
-    application = JobApplication.objects.filter(job=job, user=request.user).first()
+    # Match (prefetched) and application status (annotated) come with the job
+    job = get_object_or_404(job_detail_queryset(request.user, user_resume), id=job_id)
+    job_match = job.resume_matches[0] if job.resume_matches else None
     
     context = {
         'job': job,
         'job_match': job_match,
-        'application': application,
+        'application_status': job.application_status,
+        'similar_jobs': similar_jobs(job, request.user, user_resume),
         'user_resume': user_resume
     }
     return render(request, 'jobs/job_detail.html', context)
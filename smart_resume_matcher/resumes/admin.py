@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Resume
+from .models import Resume, ResumeAnalysisCache
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
@@ -30,4 +30,11 @@ class ResumeAdmin(admin.ModelAdmin):
         # The `request` argument is intentionally unused
         if obj:  # Editing existing object
             return self.readonly_fields + ('file', 'user')
-        return self.readonly_fields
\ No newline at end of file
+        return self.readonly_fields
+
+@admin.register(ResumeAnalysisCache)
+class ResumeAnalysisCacheAdmin(admin.ModelAdmin):
+    list_display = ('content_hash', 'model_name', 'prompt_version', 'hit_count', 'last_hit_at', 'created_at')
+    list_filter = ('model_name', 'prompt_version', 'created_at')
+    search_fields = ('content_hash',)
+    readonly_fields = ('content_hash', 'prompt_version', 'model_name', 'result', 'hit_count', 'last_hit_at', 'created_at')
@@ -0,0 +1,114 @@
+"""
+Durable resume analysis store.
+
+LLM analyses are persisted in the ResumeAnalysisCache table keyed by a hash of
+the normalized resume text plus the prompt and model version, so identical (or
+whitespace-different) resumes never trigger a second LLM call, across
+processes and restarts.
+"""
+
+import hashlib
+import logging
+import unicodedata
+from typing import Any, Dict, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, models
+from django.utils import timezone
+
+from .prompt_compaction import DEFAULT_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the analysis prompt or result post-processing changes so that
+# stale entries stop being served.
+ANALYSIS_PROMPT_VERSION = 'advanced_v2'
+
+
+def analysis_prompt_version() -> str:
+    """ANALYSIS_PROMPT_VERSION plus the compaction token budget, which also changes the prompt"""
+    budget = getattr(settings, 'RESUME_PROMPT_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+    return f'{ANALYSIS_PROMPT_VERSION}-b{budget}'
+
+
+def normalize_resume_text(text: str) -> str:
+    """Normalize resume text so formatting-only differences hash identically"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFC', text)
+    return ' '.join(text.split())
+
+
+def resume_content_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized resume text"""
+    return hashlib.sha256(normalize_resume_text(text).encode('utf-8')).hexdigest()
+
+
+def get_cached_analysis(content_hash: str, model_name: str,
+                        prompt_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored analysis for this content/model/prompt (the current
+    analysis_prompt_version() by default), or None. Records the hit on the row.
+    """
+    ResumeAnalysisCache = apps.get_model('resumes', 'ResumeAnalysisCache')
+    prompt_version = prompt_version or analysis_prompt_version()
+    try:
+        entry = ResumeAnalysisCache.objects.filter(
+            content_hash=content_hash,
+            prompt_version=prompt_version,
+            model_name=model_name,
+        ).only('id', 'result').first()
+
+        if entry is None:
+            return None
+
+        ResumeAnalysisCache.objects.filter(id=entry.id).update(
+            hit_count=models.F('hit_count') + 1,
+            last_hit_at=timezone.now(),
+        )
+        return entry.result
+    except Exception as e:
+        logger.warning(f"Analysis store lookup failed: {e}")
+        return None
+
+
+def store_analysis(content_hash: str, model_name: str, result: Dict[str, Any],
+                   prompt_version: Optional[str] = None) -> None:
+    """Persist an analysis result; concurrent writers for the same key are ignored"""
+    ResumeAnalysisCache = apps.get_model('resumes', 'ResumeAnalysisCache')
+    prompt_version = prompt_version or analysis_prompt_version()
+    try:
+        ResumeAnalysisCache.objects.get_or_create(
+            content_hash=content_hash,
+            prompt_version=prompt_version,
+            model_name=model_name,
+            defaults={'result': result},
+        )
+    except IntegrityError:
+        # Another process stored the same analysis first
+        pass
+    except Exception as e:
+        logger.warning(f"Analysis store write failed: {e}")
+
+
+def analysis_store_stats() -> Dict[str, Any]:
+    """
+    Hit-rate statistics for the analysis store.
+    Every entry represents one miss (the LLM call that produced it).
+    """
+    ResumeAnalysisCache = apps.get_model('resumes', 'ResumeAnalysisCache')
+    totals = ResumeAnalysisCache.objects.aggregate(
+        entries=models.Count('id'),
+        hits=models.Sum('hit_count'),
+    )
+    entries = totals['entries'] or 0
+    hits = totals['hits'] or 0
+    lookups = entries + hits
+
+    return {
+        'entries': entries,
+        'hits': hits,
+        'misses': entries,
+        'hit_rate': hits / lookups if lookups else 0.0,
+    }
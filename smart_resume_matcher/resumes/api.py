@@ -2,18 +2,23 @@
 Resume API for handling file uploads and analysis.
 """
 
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.apps import apps
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.jwt_auth import CachedJWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 import json
 import logging
 import os
-import threading
+
+from .dispatcher import (
+    AnalysisQueueFull, dispatch_pending, dispatch_resume_analysis, get_queue_position, has_capacity,
+)
+from .progress import astream_events, current_seq, progress_shared, publish_progress, stream_events
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +31,9 @@ def jwt_authenticate_user(request):
     Returns the user object if valid, None otherwise.
     """
     try:
-        jwt_auth = JWTAuthentication()
-        
-        # Try to get the user from the JWT token
-        validated_token = jwt_auth.get_validated_token(jwt_auth.get_raw_token(jwt_auth.get_header(request)))
-        user = jwt_auth.get_user(validated_token)
-        
-        return user
+        # Reuses the middleware's validation of the same token
+        authenticated = CachedJWTAuthentication().authenticate(request)
+        return authenticated[0] if authenticated else None
     except (InvalidToken, TokenError, Exception) as e:
         logger.debug(f"JWT authentication failed: {e}")
         return None
@@ -76,8 +77,9 @@ def resume_upload_api(request):
                 'message': 'File size must be less than 5MB'
             }, status=400)
         
-        # Deactivate existing resumes for this user
-        Resume.objects.filter(user=user, is_active=True).update(is_active=False)
+        # Backpressure: refuse new work while the analysis queue is full
+        if not has_capacity():
+            return queue_full_response()
         
         # Create new resume record
         resume = Resume.objects.create(
@@ -89,14 +91,25 @@ def resume_upload_api(request):
         )
         
         # Start background analysis
-        start_resume_analysis(resume.id)
+        try:
+            start_resume_analysis(resume.id)
+        except AnalysisQueueFull:
+            # Lost the race for the last queue slot
+            resume.file.delete(save=False)
+            resume.delete()
+            return queue_full_response()
+        
+        # Deactivate existing resumes for this user
+        Resume.objects.filter(user=user, is_active=True).exclude(id=resume.id).update(is_active=False)
+        publish_progress(resume.id, 'uploaded', filename=original_filename)
         
         return JsonResponse({
             'success': True,
             'message': 'Resume uploaded successfully',
             'resume_id': resume.id,
             'filename': original_filename,
-            'status': 'pending'
+            'status': 'pending',
+            'queue_position': get_queue_position(resume),
         })
         
     except Exception as e:
@@ -128,6 +141,12 @@ def resume_status_api(request, resume_id):
                 'error': 'Resume not found'
             }, status=404)
         
+        # Pollers see a lost enrichment promoted even where no beat scheduler runs
+        if resume.status == 'provisional':
+            from .views import finalize_stale_provisional_analyses
+            if finalize_stale_provisional_analyses(Resume.objects.filter(id=resume.id)):
+                resume.refresh_from_db()
+        
         return JsonResponse({
             'success': True,
             'resume_id': resume.id,
@@ -138,11 +157,15 @@ def resume_status_api(request, resume_id):
             'analysis_completed_at': resume.analysis_completed_at.isoformat() if resume.analysis_completed_at else None,
             'skills_count': len(resume.extracted_skills) if resume.extracted_skills else 0,
             'has_summary': bool(resume.analysis_summary),
+            'queue_position': get_queue_position(resume),
+            'is_provisional': resume.status == 'provisional',
             'has_extraction_issues': getattr(resume, 'has_extraction_issues', False),
             'error_message': getattr(resume, 'error_message', ''),
             'error_type': getattr(resume, 'error_type', ''),
             'warning_message': getattr(resume, 'warning_message', ''),
             'suggestions': getattr(resume, 'suggestions', []),
+            'job_matches_count': resume.job_matches.count(),
+            'matching_pending': dispatch_pending('matching', resume),
         })
         
     except Exception as e:
@@ -152,6 +175,61 @@ def resume_status_api(request, resume_id):
             'message': str(e)
         }, status=500)
 
+@require_http_methods(["GET"])
+def resume_progress_stream_api(request, resume_id):
+    """
+    Server-Sent Events stream of analysis and matching progress for a resume.
+    Query params: since (last seen event id), until (stage that ends the stream).
+    """
+    user = request.user if request.user.is_authenticated else jwt_authenticate_user(request)
+    if not user:
+        return JsonResponse({
+            'error': 'Authentication required'
+        }, status=401)
+    
+    try:
+        resume = Resume.objects.get(id=resume_id, user=user)
+    except Resume.DoesNotExist:
+        return JsonResponse({
+            'error': 'Resume not found'
+        }, status=404)
+    
+    if not progress_shared():
+        # Events published by other processes would never arrive; the client polls instead
+        return JsonResponse({
+            'error': 'Progress streaming is unavailable, poll the status API',
+            'poll': True
+        }, status=503)
+    
+    try:
+        since = int(request.headers.get('Last-Event-ID') or request.GET.get('since', 0))
+    except ValueError:
+        since = 0
+    until = request.GET.get('until', 'completed')
+    
+    # Analysis already finished and its events have expired: report the outcome once.
+    # A provisional analysis is reported as analyzed; enrichment (or its deadline) completes it.
+    if until == 'completed' and since == 0 and not current_seq(resume.id):
+        if resume.status == 'failed':
+            publish_progress(resume.id, 'failed', status=resume.status)
+        elif resume.is_analyzed:
+            publish_progress(resume.id, 'analyzed', status=resume.status,
+                             provisional=resume.status == 'provisional',
+                             skills_count=len(resume.extracted_skills or []),
+                             experience_level=resume.experience_level)
+            if resume.status != 'provisional':
+                publish_progress(resume.id, 'completed', status=resume.status)
+    
+    if isinstance(request, ASGIRequest):
+        events = astream_events(resume.id, since, until)
+    else:
+        events = stream_events(resume.id, since, until)
+    
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def resume_list_api(request):
@@ -253,17 +331,19 @@ def resume_analysis_api(request, resume_id):
 
 def start_resume_analysis(resume_id):
     """
-    Start resume analysis in a background thread.
+    Queue resume analysis on the analysis dispatcher (Celery or bounded pool).
+    Raises AnalysisQueueFull when the queue is at its limit.
     """
-    def analyze_in_background():
-        try:
-            from resumes.views import analyze_resume
-            analyze_resume(resume_id)
-            logger.info(f"Resume analysis completed for ID: {resume_id}")
-        except Exception as e:
-            logger.error(f"Resume analysis failed for ID {resume_id}: {e}")
-    
-    # Start analysis in background thread
-    thread = threading.Thread(target=analyze_in_background)
-    thread.daemon = True
-    thread.start()
+    if dispatch_resume_analysis(resume_id):
+        logger.info(f"Resume analysis queued for ID: {resume_id}")
+    else:
+        logger.info(f"Resume analysis already queued or running for ID: {resume_id}")
+
+def queue_full_response():
+    """HTTP 429 response asking the client to retry the upload later"""
+    response = JsonResponse({
+        'error': 'Analysis queue full',
+        'message': 'Too many resumes are being analyzed right now. Please try again shortly.'
+    }, status=429)
+    response['Retry-After'] = '30'
+    return response
@@ -6,5 +6,4 @@ class ResumesConfig(AppConfig):
     name = 'resumes'
     
     def ready(self):
-        # Import any signals or perform app initialization here
-        pass
+        from . import checks  # noqa: F401
@@ -0,0 +1,16 @@
+from django.core.checks import Tags, Warning, register
+
+from .progress import progress_shared
+
+
+@register(Tags.caches)
+def check_progress_cache(app_configs, **kwargs):
+    """Progress streaming needs a cross-process cache once work leaves the web process"""
+    if progress_shared():
+        return []
+    return [Warning(
+        'Resume progress events are kept in a per-process cache, but a Celery broker '
+        'or several web workers are configured.',
+        hint='Set REDIS_URL so workers share progress events; until then clients poll for status.',
+        id='resumes.W001',
+    )]
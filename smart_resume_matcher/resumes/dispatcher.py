@@ -0,0 +1,256 @@
+"""
+Resume analysis dispatcher.
+
+Analysis work (PDF extraction, regex analysis, LLM calls) is sent to the Celery
+app from config/celery.py when CELERY_BROKER_URL is configured. Without a broker
+it runs on a process-wide bounded thread pool with a queue-depth limit instead of
+one unbounded daemon thread per upload. Either way a resume is analyzed at most
+once at a time, and callers get backpressure when the queue is full. With a
+broker the claim is a conditional UPDATE of the resume's <kind>_dispatched_at
+column, so it holds across web processes.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_QUEUE_DEPTH = 20
+DEFAULT_LOCK_TIMEOUT = 15 * 60
+
+
+class AnalysisQueueFull(Exception):
+    """Raised when the analysis queue cannot take more work"""
+
+    def __init__(self, depth: int):
+        super().__init__(f"Analysis queue is full ({depth} pending)")
+        self.depth = depth
+
+
+class BoundedAnalysisExecutor:
+    """
+    Thread pool with a queue-depth limit and per-key deduplication.
+    Tracks submission order so callers can report a queue position.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-analysis')
+        self._lock = threading.Lock()
+        self._queued: 'OrderedDict[str, None]' = OrderedDict()
+        self._running = set()
+
+    @property
+    def depth(self) -> int:
+        """Number of submitted tasks that have not started yet"""
+        with self._lock:
+            return len(self._queued)
+
+    def has_capacity(self) -> bool:
+        return self.depth < self.max_queue_depth
+
+    def submit(self, key: str, fn: Callable, *args) -> bool:
+        """
+        Queue fn(*args) under key. Returns False if the key is already queued
+        or running; raises AnalysisQueueFull if the queue is at its limit.
+        """
+        with self._lock:
+            if key in self._queued or key in self._running:
+                return False
+            if len(self._queued) >= self.max_queue_depth:
+                raise AnalysisQueueFull(len(self._queued))
+            self._queued[key] = None
+
+        self._executor.submit(self._run, key, fn, *args)
+        return True
+
+    def position(self, key: str) -> Optional[int]:
+        """0 while running, 1-based position while queued, None if unknown"""
+        with self._lock:
+            if key in self._running:
+                return 0
+            for index, queued_key in enumerate(self._queued, start=1):
+                if queued_key == key:
+                    return index
+        return None
+
+    def _run(self, key: str, fn: Callable, *args):
+        with self._lock:
+            self._queued.pop(key, None)
+            self._running.add(key)
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.error(f"Background analysis task {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue_depth': self.max_queue_depth,
+                'queued': len(self._queued),
+                'running': len(self._running),
+            }
+
+
+_local_executor: Optional[BoundedAnalysisExecutor] = None
+_local_executor_lock = threading.Lock()
+
+
+def get_local_executor() -> BoundedAnalysisExecutor:
+    """Process-wide executor used when no Celery broker is configured"""
+    global _local_executor
+    if _local_executor is None:
+        with _local_executor_lock:
+            if _local_executor is None:
+                _local_executor = BoundedAnalysisExecutor(
+                    max_workers=getattr(settings, 'RESUME_ANALYSIS_WORKERS', DEFAULT_MAX_WORKERS),
+                    max_queue_depth=getattr(settings, 'RESUME_ANALYSIS_QUEUE_LIMIT', DEFAULT_MAX_QUEUE_DEPTH),
+                )
+    return _local_executor
+
+
+def broker_configured() -> bool:
+    return bool(getattr(settings, 'CELERY_BROKER_URL', ''))
+
+
+def _task_key(kind: str, resume_id: int) -> str:
+    return f"{kind}:{resume_id}"
+
+
+def _dispatch_field(kind: str) -> str:
+    return f"{kind}_dispatched_at"
+
+
+def _claim_cutoff():
+    """Claims made before this have expired: their task crashed or its message was lost"""
+    return timezone.now() - timedelta(seconds=getattr(settings, 'RESUME_ANALYSIS_LOCK_TIMEOUT', DEFAULT_LOCK_TIMEOUT))
+
+
+def _claim_dispatch(kind: str, resume_id: int) -> bool:
+    """
+    Mark a kind of task as dispatched for a resume in one conditional UPDATE.
+    False when another process holds an unexpired claim.
+    """
+    Resume = apps.get_model('resumes', 'Resume')
+    field = _dispatch_field(kind)
+    unclaimed = Q(**{f'{field}__isnull': True}) | Q(**{f'{field}__lt': _claim_cutoff()})
+    return Resume.objects.filter(unclaimed, id=resume_id).update(**{field: timezone.now()}) == 1
+
+
+def release_dispatch_lock(kind: str, resume_id: int) -> None:
+    """Called by Celery tasks when they finish"""
+    Resume = apps.get_model('resumes', 'Resume')
+    Resume.objects.filter(id=resume_id).update(**{_dispatch_field(kind): None})
+
+
+def dispatch_pending(kind: str, resume) -> bool:
+    """Whether a kind of task is still queued or running for a resume"""
+    if broker_configured():
+        return getattr(resume, _dispatch_field(kind)) is not None
+    return get_local_executor().position(_task_key(kind, resume.id)) is not None
+
+
+def _queued_resumes():
+    """
+    Pending resumes whose analysis task is queued: a live claim. Uploads that
+    crashed or whose message was lost stay pending but stop counting once
+    their claim expires.
+    """
+    Resume = apps.get_model('resumes', 'Resume')
+    return Resume.objects.filter(status='pending', analysis_dispatched_at__gte=_claim_cutoff())
+
+
+def _pending_resume_count() -> int:
+    return _queued_resumes().count()
+
+
+def has_capacity() -> bool:
+    """Whether a new upload can be queued right now"""
+    limit = getattr(settings, 'RESUME_ANALYSIS_QUEUE_LIMIT', DEFAULT_MAX_QUEUE_DEPTH)
+    if broker_configured():
+        return _pending_resume_count() < limit
+    return get_local_executor().has_capacity()
+
+
+def _dispatch(kind: str, resume_id: int, task_name: str, fn: Callable) -> bool:
+    if broker_configured():
+        if not _claim_dispatch(kind, resume_id):
+            logger.info(f"Resume {resume_id} {kind} already dispatched, skipping")
+            return False
+
+        from config.celery import app as celery_app
+        try:
+            celery_app.send_task(task_name, args=[resume_id])
+        except Exception:
+            release_dispatch_lock(kind, resume_id)
+            raise
+        return True
+
+    return get_local_executor().submit(_task_key(kind, resume_id), fn, resume_id)
+
+
+def dispatch_resume_analysis(resume_id: int) -> bool:
+    """
+    Queue full analysis of a resume.
+    Returns False if it is already queued or running; raises AnalysisQueueFull.
+    """
+    from resumes.views import analyze_resume
+    return _dispatch('analysis', resume_id, 'resumes.tasks.run_resume_analysis_task', analyze_resume)
+
+
+def dispatch_resume_enrichment(resume_id: int) -> bool:
+    """Queue LLM enrichment of a provisional analysis"""
+    from resumes.views import enrich_resume_analysis
+    return _dispatch('enrichment', resume_id, 'resumes.tasks.enrich_resume_analysis_task', enrich_resume_analysis)
+
+
+def dispatch_job_match_generation(resume_id: int) -> bool:
+    """Queue enhanced job match generation for a resume without matches"""
+    from resumes.views import generate_job_matches
+    return _dispatch('matching', resume_id, 'resumes.tasks.generate_job_matches_task', generate_job_matches)
+
+
+def dispatch_resume_rematch(resume_id: int, changed_skills: Optional[List[str]] = None) -> None:
+    """
+    Re-match a resume against jobs. Goes to the match_cpu Celery queue when a
+    broker is configured, otherwise runs inline on the calling worker.
+    """
+    from resumes.views import rematch_resume_jobs
+
+    if broker_configured():
+        from config.celery import app as celery_app
+        celery_app.send_task('resumes.tasks.rematch_resume_jobs_task', args=[resume_id, changed_skills])
+    else:
+        rematch_resume_jobs(resume_id, changed_skills)
+
+
+def get_queue_position(resume) -> Optional[int]:
+    """
+    Queue position of a resume's analysis: 0 while running, 1-based while
+    queued, None when not queued.
+    """
+    if resume.status != 'pending':
+        return None
+
+    if broker_configured():
+        if resume.analysis_dispatched_at is None or resume.analysis_dispatched_at < _claim_cutoff():
+            return None
+        # Celery does not expose queue order; approximate with upload order
+        return _queued_resumes().filter(created_at__lt=resume.created_at).count() + 1
+
+    return get_local_executor().position(_task_key('analysis', resume.id))
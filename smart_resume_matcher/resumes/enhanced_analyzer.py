@@ -7,16 +7,19 @@ import json
 import asyncio
 import logging
 from typing import Dict, List, Any, Tuple, Optional, Set
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from collections import defaultdict, Counter
-from functools import lru_cache
 import time
-from concurrent.futures import ThreadPoolExecutor
 import pickle
-import hashlib
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.cache import cache
 from .utils import PDFProcessor
+from .analysis_store import resume_content_hash, get_cached_analysis, store_analysis
+from .prompt_compaction import compact_resume_text
+from .matching_models import get_matching_models
+from core.executors import cpu_executor
+from core.request_timing import LLM, stage
+from core.tiered_cache import register_dataclass
 
 # Try to import aiohttp, make it optional
 try:
@@ -28,6 +31,7 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+@register_dataclass
 @dataclass
 class SkillMatch:
     """Data class for skill matching with confidence scoring"""
@@ -37,6 +41,7 @@ class SkillMatch:
     context_count: int
     patterns_matched: List[str] = field(default_factory=list)
 
+@register_dataclass
 @dataclass
 class ResumeAnalysis:
     """Data class for comprehensive resume analysis results"""
@@ -66,267 +71,21 @@ class AdvancedAIAnalyzer:
     Advanced AI analyzer with ML-enhanced skill extraction, caching, and performance optimization
     """
     
+    LLM_MODEL = 'llama3-70b-8192'
+    LOCAL_MODEL = 'local_fallback'
+    
     def __init__(self):
         self.api_key = settings.GROQ_API_KEY
         self.api_url = settings.GROQ_API_URL
-        self.executor = ThreadPoolExecutor(max_workers=4)
-        
-        # Pre-compiled regex patterns for better performance
-        self._compile_patterns()
-        
-        # Enhanced skill taxonomy with weighted importance
-        self.skill_taxonomy = {
-            'programming_languages': {
-                'skills': [
-                    'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'Ruby',
-                    'PHP', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'C', 'Objective-C', 'Dart',
-                    'Perl', 'Shell', 'Bash', 'PowerShell', 'Assembly', 'Clojure', 'F#', 'Haskell',
-                    'Erlang', 'Elixir', 'Lua', 'Julia', 'Groovy', 'VBA', 'COBOL', 'Fortran'
-                ],
-                'weight': 1.0,
-                'aliases': {
-                    'js': 'JavaScript',
-                    'ts': 'TypeScript',
-                    'py': 'Python',
-                    'cpp': 'C++',
-                    'c++': 'C++',
-                    'csharp': 'C#',
-                    'c#': 'C#',
-                    'golang': 'Go'
-                }
-            },
-            'web_frameworks': {
-                'skills': [
-                    'React', 'Angular', 'Vue.js', 'Django', 'Flask', 'FastAPI', 'Express.js',
-                    'Node.js', 'Next.js', 'Nuxt.js', 'Laravel', 'Spring Boot', 'ASP.NET',
-                    'Ruby on Rails', 'Symfony', 'CodeIgniter', 'Svelte', 'Ember.js', 'Blazor',
-                    'Phoenix', 'Gin', 'Echo', 'Fiber', 'Nest.js', 'Koa.js', 'Hapi.js',
-                    'Meteor', 'Backbone.js', 'Knockout.js', 'Alpine.js', 'Solid.js'
-                ],
-                'weight': 0.9,
-                'aliases': {
-                    'reactjs': 'React',
-                    'angularjs': 'Angular',
-                    'vuejs': 'Vue.js',
-                    'nodejs': 'Node.js',
-                    'nextjs': 'Next.js',
-                    'nuxtjs': 'Nuxt.js',
-                    'rails': 'Ruby on Rails',
-                    'ror': 'Ruby on Rails'
-                }
-            },
-            'databases': {
-                'skills': [
-                    'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server',
-                    'MariaDB', 'DynamoDB', 'Cassandra', 'Elasticsearch', 'Neo4j', 'InfluxDB',
-                    'CouchDB', 'Firebase', 'Supabase', 'PlanetScale', 'Snowflake', 'BigQuery',
-                    'Amazon RDS', 'Azure SQL', 'Google Cloud SQL', 'TimescaleDB', 'ClickHouse',
-                    'Apache Drill', 'Apache Hive', 'Apache Impala', 'Presto', 'Trino'
-                ],
-                'weight': 0.8,
-                'aliases': {
-                    'postgres': 'PostgreSQL',
-                    'mysql': 'MySQL',
-                    'mongo': 'MongoDB',
-                    'elasticsearch': 'Elasticsearch',
-                    'elastic': 'Elasticsearch',
-                    'sqlserver': 'SQL Server',
-                    'mssql': 'SQL Server'
-                }
-            },
-            'cloud_platforms': {
-                'skills': [
-                    'AWS', 'Google Cloud', 'Azure', 'DigitalOcean', 'Heroku', 'Vercel', 'Netlify',
-                    'Firebase', 'Cloudflare', 'Linode', 'Vultr', 'IBM Cloud', 'Oracle Cloud',
-                    'Alibaba Cloud', 'Scaleway', 'OVH', 'Hetzner', 'Railway', 'Render',
-                    'PlanetScale', 'Supabase', 'Neon', 'Upstash', 'Fly.io'
-                ],
-                'weight': 0.85,
-                'aliases': {
-                    'amazon web services': 'AWS',
-                    'gcp': 'Google Cloud',
-                    'google cloud platform': 'Google Cloud',
-                    'microsoft azure': 'Azure',
-                    'amazon aws': 'AWS'
-                }
-            },
-            'devops_tools': {
-                'skills': [
-                    'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions', 'Terraform',
-                    'Ansible', 'Chef', 'Puppet', 'Vagrant', 'Nginx', 'Apache', 'Git', 'SVN',
-                    'CircleCI', 'Travis CI', 'Helm', 'Prometheus', 'Grafana', 'ELK Stack',
-                    'Istio', 'Linkerd', 'Consul', 'Vault', 'Nomad', 'Packer', 'Pulumi',
-                    'ArgoCD', 'Flux', 'Tekton', 'Spinnaker', 'Bamboo', 'TeamCity'
-                ],
-                'weight': 0.75,
-                'aliases': {
-                    'k8s': 'Kubernetes',
-                    'gitlab-ci': 'GitLab CI',
-                    'github-actions': 'GitHub Actions',
-                    'travisci': 'Travis CI',
-                    'circleci': 'CircleCI'
-                }
-            },
-            'mobile_development': {
-                'skills': [
-                    'React Native', 'Flutter', 'Ionic', 'Xamarin', 'Swift', 'Kotlin', 'Cordova',
-                    'PhoneGap', 'NativeScript', 'Unity', 'Unreal Engine', 'SwiftUI', 'Jetpack Compose',
-                    'Expo', 'Capacitor', 'Titanium', 'Corona SDK', 'Cocos2d', 'Godot'
-                ],
-                'weight': 0.8,
-                'aliases': {
-                    'react-native': 'React Native',
-                    'rn': 'React Native',
-                    'xamarin.forms': 'Xamarin',
-                    'phonegap': 'PhoneGap'
-                }
-            },
-            'data_science': {
-                'skills': [
-                    'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib',
-                    'Seaborn', 'Jupyter', 'Apache Spark', 'Hadoop', 'Kafka', 'Airflow',
-                    'MLflow', 'Kubeflow', 'SageMaker', 'BigQuery', 'Tableau', 'Power BI',
-                    'Plotly', 'Bokeh', 'Altair', 'Streamlit', 'Gradio', 'Weights & Biases',
-                    'Neptune', 'Comet', 'DataRobot', 'H2O.ai', 'Databricks', 'Snowflake',
-                    'dbt', 'Great Expectations', 'Prefect', 'Kedro', 'DVC', 'ClearML'
-                ],
-                'weight': 0.9,
-                'aliases': {
-                    'tensorflow': 'TensorFlow',
-                    'pytorch': 'PyTorch',
-                    'sklearn': 'Scikit-learn',
-                    'scikit-learn': 'Scikit-learn',
-                    'numpy': 'NumPy',
-                    'pandas': 'Pandas',
-                    'jupyter notebook': 'Jupyter',
-                    'powerbi': 'Power BI'
-                }
-            },
-            'testing_frameworks': {
-                'skills': [
-                    'Jest', 'Mocha', 'Jasmine', 'Cypress', 'Selenium', 'Playwright', 'TestCafe',
-                    'PyTest', 'Unittest', 'JUnit', 'TestNG', 'RSpec', 'Capybara', 'Karma',
-                    'Protractor', 'WebDriver', 'Appium', 'Postman', 'Newman', 'Artillery',
-                    'K6', 'Locust', 'JMeter', 'Gatling', 'SoapUI', 'REST Assured'
-                ],
-                'weight': 0.6,
-                'aliases': {
-                    'pytest': 'PyTest',
-                    'junit': 'JUnit',
-                    'testng': 'TestNG',
-                    'webdriver': 'WebDriver'
-                }
-            },
-            'design_tools': {
-                'skills': [
-                    'Figma', 'Adobe XD', 'Sketch', 'InVision', 'Photoshop', 'Illustrator',
-                    'After Effects', 'Premiere Pro', 'Canva', 'Framer', 'Principle',
-                    'Zeplin', 'Abstract', 'Marvel', 'Balsamiq', 'Axure', 'Miro', 'Whimsical'
-                ],
-                'weight': 0.5,
-                'aliases': {
-                    'adobexd': 'Adobe XD',
-                    'adobe-xd': 'Adobe XD',
-                    'photoshop': 'Photoshop',
-                    'illustrator': 'Illustrator'
-                }
-            },
-            'project_management': {
-                'skills': [
-                    'Jira', 'Trello', 'Asana', 'Monday.com', 'Notion', 'Confluence', 'Slack',
-                    'Microsoft Teams', 'Zoom', 'Linear', 'ClickUp', 'Basecamp', 'Airtable',
-                    'Smartsheet', 'Wrike', 'Teamwork', 'Podio', 'Zoho Projects'
-                ],
-                'weight': 0.4,
-                'aliases': {
-                    'monday': 'Monday.com',
-                    'ms teams': 'Microsoft Teams',
-                    'teams': 'Microsoft Teams',
-                    'clickup': 'ClickUp'
-                }
-            }
-        }
-        
-        # Advanced tech stack definitions with scoring
-        self.tech_stacks = {
-            'Full Stack Web Development': {
-                'core_skills': ['React', 'Node.js', 'Express.js', 'MongoDB', 'PostgreSQL'],
-                'bonus_skills': ['TypeScript', 'Next.js', 'GraphQL', 'Redis', 'AWS'],
-                'weight': 1.0
-            },
-            'Python Backend Development': {
-                'core_skills': ['Python', 'Django', 'Flask', 'FastAPI', 'PostgreSQL'],
-                'bonus_skills': ['Redis', 'Celery', 'Docker', 'AWS', 'Kubernetes'],
-                'weight': 0.9
-            },
-            'Frontend Development': {
-                'core_skills': ['React', 'TypeScript', 'HTML', 'CSS', 'JavaScript'],
-                'bonus_skills': ['Next.js', 'Vue.js', 'Angular', 'Tailwind CSS', 'Webpack'],
-                'weight': 0.8
-            },
-            'Data Science & ML': {
-                'core_skills': ['Python', 'Pandas', 'NumPy', 'TensorFlow', 'PyTorch'],
-                'bonus_skills': ['Jupyter', 'Scikit-learn', 'Apache Spark', 'MLflow', 'Kubeflow'],
-                'weight': 1.0
-            },
-            'DevOps Engineering': {
-                'core_skills': ['Docker', 'Kubernetes', 'AWS', 'Jenkins', 'Terraform'],
-                'bonus_skills': ['Ansible', 'Prometheus', 'Grafana', 'Helm', 'GitLab CI'],
-                'weight': 0.95
-            },
-            'Mobile Development': {
-                'core_skills': ['React Native', 'Flutter', 'Swift', 'Kotlin'],
-                'bonus_skills': ['Expo', 'Firebase', 'Redux', 'MobX', 'Realm'],
-                'weight': 0.85
-            },
-            'Java Enterprise': {
-                'core_skills': ['Java', 'Spring Boot', 'Maven', 'PostgreSQL', 'Docker'],
-                'bonus_skills': ['Spring Security', 'JPA', 'Hibernate', 'Kafka', 'Microservices'],
-                'weight': 0.8
-            },
-            'Cloud Architecture': {
-                'core_skills': ['AWS', 'Docker', 'Kubernetes', 'Terraform', 'Microservices'],
-                'bonus_skills': ['Istio', 'Prometheus', 'Grafana', 'ArgoCD', 'Helm'],
-                'weight': 1.0
-            }
-        }
+        # Shared process-wide pool for PDF parsing and regex scans
+        self.executor = cpu_executor()
         
-        # Role mapping for career recommendations
-        self.role_mappings = {
-            'Full Stack Web Development': ['Full Stack Developer', 'Web Developer', 'Software Engineer'],
-            'Python Backend Development': ['Backend Developer', 'Python Developer', 'API Developer'],
-            'Frontend Development': ['Frontend Developer', 'React Developer', 'UI Developer'],
-            'Data Science & ML': ['Data Scientist', 'ML Engineer', 'Data Analyst'],
-            'DevOps Engineering': ['DevOps Engineer', 'Site Reliability Engineer', 'Platform Engineer'],
-            'Mobile Development': ['Mobile Developer', 'React Native Developer', 'iOS/Android Developer'],
-            'Java Enterprise': ['Java Developer', 'Backend Developer', 'Enterprise Developer'],
-            'Cloud Architecture': ['Cloud Architect', 'Solutions Architect', 'Cloud Engineer']
-        }
-
-    def _compile_patterns(self):
-        """Pre-compile regex patterns for better performance"""
-        self.compiled_patterns = {
-            'years_experience': [
-                re.compile(r'(\d+)\+?\s*years?\s*(?:of)?\s*experience', re.IGNORECASE),
-                re.compile(r'experience\s*(?:of|:)?\s*(\d+)\+?\s*years?', re.IGNORECASE),
-                re.compile(r'(\d+)\+?\s*years?\s*(?:in|with|of)', re.IGNORECASE),
-            ],
-            'seniority': {
-                'senior': re.compile(r'senior|sr\.|lead|principal|staff|architect|tech lead|team lead', re.IGNORECASE),
-                'middle': re.compile(r'mid-level|intermediate|associate|mid level', re.IGNORECASE),
-                'junior': re.compile(r'junior|jr\.|entry|intern|graduate|trainee|junior level', re.IGNORECASE)
-            },
-            'leadership': [
-                re.compile(r'team lead|tech lead|engineering manager|cto|vp|director|head of', re.IGNORECASE),
-                re.compile(r'managed\s+\d+\s+(?:people|developers|engineers|team members)', re.IGNORECASE),
-                re.compile(r'mentored|guided|supervised|coaching|leading', re.IGNORECASE),
-            ]
-        }
-
-    @lru_cache(maxsize=1000)
-    def _get_resume_hash(self, resume_text: str) -> str:
-        """Generate hash for caching resume analysis"""
-        return hashlib.md5(resume_text.encode()).hexdigest()
+        # Taxonomies and pre-compiled patterns are shared by all instances
+        self.models = get_matching_models()
+        self.skill_taxonomy = self.models.analyzer_skill_taxonomy
+        self.tech_stacks = self.models.tech_stacks
+        self.role_mappings = self.models.role_mappings
+        self.compiled_patterns = self.models.experience_patterns
 
     async def extract_text_from_pdf_async(self, file_path: str) -> str:
         """
@@ -374,32 +133,22 @@ class AdvancedAIAnalyzer:
         extracted_skills = defaultdict(list)
         skill_matches = []
         
-        # Process each skill category
-        for category, category_data in self.skill_taxonomy.items():
-            skills = category_data['skills']
-            aliases = category_data.get('aliases', {})
-            weight = category_data['weight']
+        # Skill variants (name plus aliases) are precomputed in the registry
+        for category, skill, weight, variants in self.models.analyzer_skills:
+            best_match = None
+            max_confidence = 0
             
-            for skill in skills:
-                skill_lower = skill.lower()
-                
-                # Check aliases first
-                all_skill_variants = [skill_lower] + [alias.lower() for alias in aliases.keys() if aliases[alias] == skill]
-                
-                best_match = None
-                max_confidence = 0
-                
-                for variant in all_skill_variants:
-                    match = self._analyze_skill_context(text_lower, variant, skill)
-                    if match and match.confidence > max_confidence:
-                        max_confidence = match.confidence
-                        best_match = match
-                
-                # Apply category weight and confidence threshold
-                if best_match and best_match.confidence * weight >= 0.3:
-                    best_match.confidence *= weight
-                    skill_matches.append(best_match)
-                    extracted_skills[category].append(skill)
+            for variant in variants:
+                match = self._analyze_skill_context(text_lower, variant, skill)
+                if match and match.confidence > max_confidence:
+                    max_confidence = match.confidence
+                    best_match = match
+            
+            # Apply category weight and confidence threshold
+            if best_match and best_match.confidence * weight >= 0.3:
+                best_match.confidence *= weight
+                skill_matches.append(best_match)
+                extracted_skills[category].append(skill)
         
         # Convert defaultdict to regular dict
         return dict(extracted_skills), skill_matches
@@ -408,41 +157,23 @@ class AdvancedAIAnalyzer:
         """
         Analyze skill context with advanced pattern matching
         """
-        # Enhanced pattern matching with context scoring
-        patterns = [
-            # Exact word boundary matches
-            (rf'\b{re.escape(skill_variant)}\b', 1.0),
-            # Technology with version numbers
-            (rf'{re.escape(skill_variant)}\s*(?:\d+|\d+\.\d+|v\d+)', 1.2),
-            # Technology with common suffixes
-            (rf'{re.escape(skill_variant)}(?:js|\.js|\.py|\.rb|\.java|\.go)?', 0.9),
-            # Technology in lists or bullets
-            (rf'(?:•|[\-\*])\s*{re.escape(skill_variant)}\b', 1.1),
-            # Technology with context words
-            (rf'(?:using|with|in|built with|developed with|worked with|experience with|proficient in|skilled in|expert in)\s+{re.escape(skill_variant)}\b', 1.3),
-            (rf'{re.escape(skill_variant)}\s+(?:development|programming|framework|library|database|platform|tool|stack|ecosystem)', 1.2),
-            # Years of experience patterns
-            (rf'(?:\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience\s+)?(?:in\s+|with\s+)?{re.escape(skill_variant)}\b', 1.5),
-            # Certification or course patterns
-            (rf'(?:certified|certification|course|training|bootcamp|specialization)\s+(?:in\s+)?{re.escape(skill_variant)}\b', 1.1),
-            # Project context
-            (rf'(?:project|built|created|developed|implemented)\s+(?:using|with|in)\s+{re.escape(skill_variant)}\b', 1.4),
-        ]
+        # Context patterns are compiled once per variant in the registry
+        patterns, mention_pattern = self.models.context_patterns_for(skill_variant)
         
         total_confidence = 0
         context_count = 0
         matched_patterns = []
         
         for pattern, weight in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+            matches = pattern.findall(text)
             if matches:
                 match_count = len(matches)
                 total_confidence += match_count * weight * 0.2
                 context_count += match_count
-                matched_patterns.append(pattern)
+                matched_patterns.append(pattern.pattern)
         
         # Boost for multiple mentions
-        mentions = len(re.findall(rf'\b{re.escape(skill_variant)}\b', text, re.IGNORECASE))
+        mentions = len(mention_pattern.findall(text))
         if mentions > 1:
             total_confidence += min(mentions * 0.1, 0.3)
         
@@ -587,52 +318,91 @@ class AdvancedAIAnalyzer:
 
     async def analyze_resume_async(self, resume_text: str) -> ResumeAnalysis:
         """
-        Asynchronous resume analysis with caching and performance optimization
+        Asynchronous resume analysis backed by the durable analysis store
         """
         start_time = time.time()
         
-        # Check cache first
-        resume_hash = self._get_resume_hash(resume_text)
-        cached_result = cache.get(f"resume_analysis_{resume_hash}")
-        if cached_result:
-            logger.info("Retrieved analysis from cache")
-            return ResumeAnalysis(**cached_result)
-        
-        logger.info("Starting advanced resume analysis")
-        
         # Handle extraction failures
         if resume_text.startswith(("PDF_EXTRACTION_FAILED:", "PDF_EXTRACTION_ERROR:", "PDF_EXTRACTION_WARNING:")):
             logger.warning("PDF extraction had issues")
             return self._handle_extraction_failure(resume_text)
         
+        use_llm = self.llm_available()
+        model_name = self.LLM_MODEL if use_llm else self.LOCAL_MODEL
+        
+        # Check the durable store first (keyed by normalized content)
+        content_hash = resume_content_hash(resume_text)
+        cached_result = await sync_to_async(get_cached_analysis)(content_hash, model_name)
+        if cached_result:
+            logger.info("Retrieved analysis from analysis store")
+            return self._analysis_from_dict(cached_result)
+        
+        logger.info("Starting advanced resume analysis")
+        
         # Try AI analysis first, fall back to enhanced analysis
         try:
-            if self.api_key and self.api_key != 'your-groq-api-key':
+            if use_llm:
                 result = await self._advanced_ai_analysis(resume_text)
             else:
                 result = await self._advanced_fallback_analysis(resume_text)
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
+            # Never store a fallback result under the LLM key
+            model_name = self.LOCAL_MODEL
             result = await self._advanced_fallback_analysis(resume_text)
         
         # Calculate analysis duration
         result.analysis_duration = time.time() - start_time
         
-        # Cache the result
-        cache.set(f"resume_analysis_{resume_hash}", result.__dict__, timeout=3600)  # Cache for 1 hour
+        # Persist the result
+        await sync_to_async(store_analysis)(content_hash, model_name, asdict(result))
         
         logger.info(f"Analysis completed in {result.analysis_duration:.2f} seconds")
         return result
 
-    async def _advanced_ai_analysis(self, resume_text: str) -> ResumeAnalysis:
+    def llm_available(self) -> bool:
+        """Whether a Groq API key is configured and aiohttp is installed"""
+        return bool(self.api_key and self.api_key != 'your-groq-api-key' and HAS_AIOHTTP)
+
+    async def analyze_resume_local_async(self, resume_text: str) -> ResumeAnalysis:
         """
-        Advanced AI analysis with structured prompts and parallel processing
+        Local-only analysis (no LLM call); bounded by CPU time.
+        Used for the provisional phase of two-phase analysis.
+        """
+        start_time = time.time()
+        
+        if resume_text.startswith(("PDF_EXTRACTION_FAILED:", "PDF_EXTRACTION_ERROR:", "PDF_EXTRACTION_WARNING:")):
+            logger.warning("PDF extraction had issues")
+            return self._handle_extraction_failure(resume_text)
+        
+        result = await self._advanced_fallback_analysis(resume_text)
+        result.analysis_duration = time.time() - start_time
+        
+        logger.info(f"Local analysis completed in {result.analysis_duration:.2f} seconds")
+        return result
+
+    def _analysis_from_dict(self, data: Dict[str, Any]) -> ResumeAnalysis:
+        """Rebuild a ResumeAnalysis (including nested SkillMatch objects) from stored JSON"""
+        data = dict(data)
+        data['skill_matches'] = [
+            SkillMatch(**match) if isinstance(match, dict) else match
+            for match in data.get('skill_matches', [])
+        ]
+        return ResumeAnalysis(**data)
+
+    async def _advanced_ai_analysis(self, resume_text: str, compact: bool = True) -> ResumeAnalysis:
+        """
+        Advanced AI analysis with structured prompts and parallel processing.
+        Pass compact=False to send the raw text (used by the compaction benchmark).
         """
         # Check if aiohttp is available
         if not HAS_AIOHTTP:
             logger.warning("aiohttp not available, falling back to enhanced analysis")
             return await self._advanced_fallback_analysis(resume_text)
         
+        # Strip extraction noise and keep only the budgeted, highest-priority sections
+        prompt_text = compact_resume_text(resume_text).text if compact else resume_text
+        
         # Enhanced prompt for better AI analysis
         prompt = f"""
         You are an expert technical recruiter and AI system specializing in precise resume analysis.
@@ -645,7 +415,7 @@ class AdvancedAIAnalyzer:
         5. Recommend specific roles and identify skill gaps
         
         RESUME TEXT:
-        {resume_text}
+        {prompt_text}
         
         RESPOND WITH VALID JSON ONLY:
         {{
@@ -675,7 +445,7 @@ class AdvancedAIAnalyzer:
         }
         
         data = {
-            'model': 'llama3-70b-8192',
+            'model': self.LLM_MODEL,
             'messages': [
                 {
                     'role': 'system',
@@ -692,10 +462,11 @@ class AdvancedAIAnalyzer:
         }
         
         # Use async HTTP client
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.api_url, headers=headers, json=data, timeout=30) as response:
-                response.raise_for_status()
-                result = await response.json()
+        with stage(LLM):
+            async with aiohttp.ClientSession() as session:
+                async with session.post(self.api_url, headers=headers, json=data, timeout=30) as response:
+                    response.raise_for_status()
+                    result = await response.json()
         
         ai_response = result.get('choices', [{}])[0].get('message', {}).get('content', '{}')
         
@@ -1024,6 +795,18 @@ class AdvancedAIAnalyzer:
         finally:
             loop.close()
 
+    def analyze_resume_local(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Synchronous wrapper for the local-only analyze_resume_local_async method
+        """
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(self.analyze_resume_local_async(resume_text))
+            return result.__dict__
+        finally:
+            loop.close()
+
     def extract_text_from_pdf(self, file_path: str) -> str:
         """
         Synchronous wrapper for PDF extraction
@@ -6,20 +6,24 @@ import re
 import logging
 import asyncio
 import json
-from typing import Dict, List, Any, Tuple, Optional, Set
+from typing import Callable, Dict, List, Any, Tuple, Optional, Set
 from collections import defaultdict, Counter
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import StandardScaler
 from django.apps import apps
 from django.db import transaction, models
-from django.core.cache import cache
 from django.utils import timezone
 from .enhanced_analyzer import AdvancedAIAnalyzer
+from .analysis_store import resume_content_hash
+from .match_scoring import score_candidates
+from .matching_models import get_matching_models
+from core.executors import cpu_executor, io_executor
+from core.request_timing import SCORING, stage
+from core.tiered_cache import TieredCache, register_dataclass
+from jobs.score_memo import ScoreMemo, content_hash
+from accounts.dashboard_summary import refresh_summary_on_commit
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,29 @@ logger = logging.getLogger(__name__)
 Job = apps.get_model('jobs', 'Job')
 JobMatch = apps.get_model('jobs', 'JobMatch')
 
+# Bump when _generate_match_insights changes so memoized insights are rebuilt
+MATCH_INSIGHTS_VERSION = 'insights_v1'
+
+# Tiered caches (core.tiered_cache); bump a version when what its entries hold changes
+RESUME_ANALYSIS_CACHE = TieredCache('resume_analysis', version='advanced_v2.0', timeout=3600, stale_ttl=3600)
+MATCH_INSIGHTS_CACHE = TieredCache('match_insights', version=MATCH_INSIGHTS_VERSION, timeout=3600, stale_ttl=3600)
+SKILL_FREQUENCY_CACHE = TieredCache('skill_frequency', timeout=3600)
+
+# Memoized scores are keyed by this; bump it when score_job_text changes
+MATCH_SCORER_NAME = 'advanced_matcher'
+MATCH_SCORER_VERSION = 'v1'
+
+# Analysis keys that vary between runs without affecting scores
+_UNSCORED_ANALYSIS_KEYS = ('analysis_timestamp', 'analysis_duration')
+
+
+def _analysis_hash(resume_analysis: Dict[str, Any]) -> str:
+    """Hash of what a resume analysis says, so results keyed by it go stale on re-analysis"""
+    return content_hash({
+        key: value for key, value in resume_analysis.items() if key not in _UNSCORED_ANALYSIS_KEYS
+    })
+
+@register_dataclass
 @dataclass
 class SkillMatch:
     """Data class for skill matching details"""
@@ -37,6 +64,7 @@ class SkillMatch:
     market_demand: float
     learning_priority: int
 
+@register_dataclass
 @dataclass
 class MatchInsights:
     """Data class for match insights and recommendations"""
@@ -57,149 +85,78 @@ class AdvancedJobMatcher:
         self.resume = resume
         self.analyzer = AdvancedAIAnalyzer()
         self.cache_timeout = 3600  # 1 hour cache
+        self._insights_memo: Dict[str, MatchInsights] = {}
+        # (resume analysis, its best market alignment) for the analysis being scored
+        self._max_alignment: Optional[Tuple[Dict[str, Any], float]] = None
         
-        # Initialize ML components
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=5000,
-            stop_words='english',
-            ngram_range=(1, 3),
-            min_df=2,
-            max_df=0.8
-        )
-        self.scaler = StandardScaler()
-        
-        # Advanced skill categorization with market weights
-        self.skill_taxonomy = {
-            'core_programming': {
-                'weight': 1.0,
-                'skills': ['Python', 'JavaScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'TypeScript', 'Swift', 'Kotlin'],
-                'demand_multiplier': 1.2
-            },
-            'web_frameworks': {
-                'weight': 0.95,
-                'skills': ['React', 'Angular', 'Vue.js', 'Django', 'Flask', 'FastAPI', 'Node.js', 'Express.js', 'Spring', 'ASP.NET'],
-                'demand_multiplier': 1.15
-            },
-            'data_technologies': {
-                'weight': 0.9,
-                'skills': ['pandas', 'numpy', 'scikit-learn', 'TensorFlow', 'PyTorch', 'Keras', 'Apache Spark', 'Hadoop'],
-                'demand_multiplier': 1.3
-            },
-            'cloud_platforms': {
-                'weight': 0.85,
-                'skills': ['AWS', 'Azure', 'Google Cloud', 'Kubernetes', 'Docker', 'Terraform', 'Jenkins', 'GitLab CI'],
-                'demand_multiplier': 1.25
-            },
-            'databases': {
-                'weight': 0.8,
-                'skills': ['PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'DynamoDB', 'Oracle', 'SQLite'],
-                'demand_multiplier': 1.1
-            },
-            'mobile_development': {
-                'weight': 0.75,
-                'skills': ['React Native', 'Flutter', 'Swift', 'Kotlin', 'Xamarin', 'Ionic', 'Unity'],
-                'demand_multiplier': 1.1
-            },
-            'devops_tools': {
-                'weight': 0.85,
-                'skills': ['Git', 'GitHub', 'GitLab', 'Jira', 'Confluence', 'Ansible', 'Puppet', 'Chef'],
-                'demand_multiplier': 1.2
-            },
-            'emerging_tech': {
-                'weight': 0.95,
-                'skills': ['Blockchain', 'Web3', 'AI/ML', 'IoT', 'AR/VR', 'GraphQL', 'Serverless', 'Microservices'],
-                'demand_multiplier': 1.4
-            }
-        }
-        
-        # Advanced job archetypes with skill requirements and career paths
-        self.job_archetypes = {
-            'senior_fullstack_engineer': {
-                'required_skills': ['JavaScript', 'React', 'Node.js', 'Python', 'SQL'],
-                'preferred_skills': ['TypeScript', 'AWS', 'Docker', 'GraphQL', 'Redux'],
-                'experience_range': (3, 8),
-                'salary_range': (80000, 150000),
-                'growth_potential': 0.85,
-                'keywords': ['senior full stack', 'full stack engineer', 'fullstack developer'],
-                'career_path': ['Junior Developer', 'Mid-level Developer', 'Senior Developer', 'Tech Lead', 'Engineering Manager']
-            },
-            'ml_engineer': {
-                'required_skills': ['Python', 'TensorFlow', 'PyTorch', 'scikit-learn', 'pandas'],
-                'preferred_skills': ['AWS', 'Docker', 'Kubernetes', 'MLOps', 'Apache Spark'],
-                'experience_range': (2, 6),
-                'salary_range': (90000, 170000),
-                'growth_potential': 0.95,
-                'keywords': ['machine learning engineer', 'ml engineer', 'ai engineer'],
-                'career_path': ['Data Analyst', 'ML Engineer', 'Senior ML Engineer', 'ML Architect', 'Head of AI']
-            },
-            'cloud_architect': {
-                'required_skills': ['AWS', 'Azure', 'Kubernetes', 'Docker', 'Terraform'],
-                'preferred_skills': ['Python', 'Go', 'Jenkins', 'Ansible', 'Security'],
-                'experience_range': (5, 12),
-                'salary_range': (120000, 200000),
-                'growth_potential': 0.8,
-                'keywords': ['cloud architect', 'solution architect', 'infrastructure architect'],
-                'career_path': ['DevOps Engineer', 'Cloud Engineer', 'Cloud Architect', 'Principal Architect', 'CTO']
-            },
-            'data_scientist': {
-                'required_skills': ['Python', 'R', 'SQL', 'pandas', 'numpy'],
-                'preferred_skills': ['TensorFlow', 'PyTorch', 'Tableau', 'Power BI', 'Apache Spark'],
-                'experience_range': (1, 5),
-                'salary_range': (70000, 140000),
-                'growth_potential': 0.9,
-                'keywords': ['data scientist', 'data analyst', 'research scientist'],
-                'career_path': ['Data Analyst', 'Data Scientist', 'Senior Data Scientist', 'Lead Data Scientist', 'Chief Data Officer']
-            },
-            'frontend_specialist': {
-                'required_skills': ['JavaScript', 'React', 'HTML', 'CSS', 'TypeScript'],
-                'preferred_skills': ['Next.js', 'Vue.js', 'Sass', 'Webpack', 'Jest'],
-                'experience_range': (2, 7),
-                'salary_range': (65000, 130000),
-                'growth_potential': 0.75,
-                'keywords': ['frontend developer', 'ui developer', 'react developer'],
-                'career_path': ['Junior Frontend', 'Frontend Developer', 'Senior Frontend', 'Frontend Architect', 'Head of Frontend']
-            },
-            'backend_specialist': {
-                'required_skills': ['Python', 'Java', 'SQL', 'REST API', 'Microservices'],
-                'preferred_skills': ['Django', 'Spring', 'PostgreSQL', 'Redis', 'Apache Kafka'],
-                'experience_range': (2, 8),
-                'salary_range': (70000, 140000),
-                'growth_potential': 0.8,
-                'keywords': ['backend developer', 'api developer', 'server developer'],
-                'career_path': ['Junior Backend', 'Backend Developer', 'Senior Backend', 'Backend Architect', 'Principal Engineer']
-            }
-        }
+        self._bind_models()
+
+    def _bind_models(self):
+        """Point this matcher at the shared, read-only matching resources"""
+        self.models = get_matching_models()
+        self.skill_taxonomy = self.models.matcher_skill_taxonomy
+        self.job_archetypes = self.models.job_archetypes
+
+    def __getstate__(self):
+        """
+        Only per-instance settings are pickled when the matcher is sent to
+        scoring worker processes; the user, resume and analyzer stay in the
+        parent, and each worker loads the shared models registry once.
+        """
+        state = self.__dict__.copy()
+        for name in ('user', 'resume', 'analyzer', '_insights_memo', '_max_alignment',
+                     'models', 'skill_taxonomy', 'job_archetypes'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.user = None
+        self.resume = None
+        self.analyzer = None
+        self._insights_memo = {}
+        self._max_alignment = None
+        self._bind_models()
 
     async def analyze_resume_advanced(self) -> Dict[str, Any]:
         """
         Advanced resume analysis with caching and ML-based skill extraction
         """
-        cache_key = f"resume_analysis_{self.resume.id}_{self.resume.updated_at.timestamp()}"
-        cached_analysis = cache.get(cache_key)
-        
-        if cached_analysis:
-            logger.info("Using cached resume analysis")
-            return cached_analysis
-        
         try:
             # Extract and process resume text
             raw_text = await self._extract_resume_text()
             if not raw_text:
                 return {}
             
-            # Parallel processing for different analysis components
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                # Submit all analysis tasks
-                basic_analysis_future = executor.submit(self.analyzer.analyze_resume, raw_text)
-                skills_future = executor.submit(self._extract_skills_with_confidence, raw_text)
-                experience_future = executor.submit(self._analyze_experience_depth, raw_text)
-                domain_future = executor.submit(self._identify_domain_expertise, raw_text)
-                
-                # Collect results
-                basic_analysis = basic_analysis_future.result()
-                skills_with_confidence = skills_future.result()
-                experience_analysis = experience_future.result()
-                domain_expertise = domain_future.result()
+            # Key by content so identical resumes share one analysis. One caller
+            # computes it; concurrent callers wait for it or get the previous one.
+            return await RESUME_ANALYSIS_CACHE.aget_or_compute(
+                resume_content_hash(raw_text),
+                lambda: self._compute_advanced_analysis(raw_text),
+                timeout=self.cache_timeout,
+                should_cache=bool,
+            )
+            
+        except Exception as e:
+            logger.error(f"Error in advanced resume analysis: {e}")
+            return {}
+
+    async def _compute_advanced_analysis(self, raw_text: str) -> Dict[str, Any]:
+        """Uncached analyze_resume_advanced; also updates the resume record"""
+        try:
+            # Parallel processing for different analysis components on the shared
+            # cpu pool. The basic analysis submits its own steps to that pool, so
+            # it is awaited here rather than run (and blocked on) inside a worker.
+            executor = cpu_executor()
+            skills_future = executor.submit(self._extract_skills_with_confidence, raw_text)
+            experience_future = executor.submit(self._analyze_experience_depth, raw_text)
+            domain_future = executor.submit(self._identify_domain_expertise, raw_text)
+            basic_analysis = (await self.analyzer.analyze_resume_async(raw_text)).__dict__
+            
+            # Collect results
+            skills_with_confidence = await asyncio.wrap_future(skills_future)
+            experience_analysis = await asyncio.wrap_future(experience_future)
+            domain_expertise = await asyncio.wrap_future(domain_future)
             
             # Merge all analysis results
             enhanced_analysis = {
@@ -211,9 +168,6 @@ class AdvancedJobMatcher:
                 'analysis_version': 'advanced_v2.0'
             }
             
-            # Cache the results
-            cache.set(cache_key, enhanced_analysis, self.cache_timeout)
-            
             # Update resume record
             await self._update_resume_record(enhanced_analysis)
             
@@ -230,8 +184,10 @@ class AdvancedJobMatcher:
                 return self.resume.raw_text
             
             if hasattr(self.resume, 'file') and self.resume.file:
-                return await asyncio.to_thread(
-                    self.analyzer.extract_text_from_pdf, 
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    io_executor(),
+                    self.analyzer.extract_text_from_pdf,
                     self.resume.file.path
                 )
             
@@ -267,34 +223,26 @@ class AdvancedJobMatcher:
         Calculate confidence score for a skill based on context and frequency
         """
         confidence = 0.0
+        direct_pattern, context_patterns, years_pattern, project_pattern = self.models.confidence_patterns_for(skill)
         
         # Direct mentions
-        direct_matches = len(re.findall(rf'\b{re.escape(skill)}\b', text))
+        direct_matches = len(direct_pattern.findall(text))
         confidence += min(direct_matches * 0.3, 1.0)
         
         # Context-based matches
-        context_patterns = [
-            rf'(?:experience|expertise|proficient|skilled|worked)\s+(?:with|in)\s+{re.escape(skill)}',
-            rf'{re.escape(skill)}\s+(?:development|programming|experience|expertise)',
-            rf'(?:using|utilized|implemented|developed)\s+{re.escape(skill)}',
-            rf'{re.escape(skill)}\s+(?:projects|applications|systems)'
-        ]
-        
         for pattern in context_patterns:
-            if re.search(pattern, text):
+            if pattern.search(text):
                 confidence += 0.4
                 break
         
         # Years of experience mentions
-        years_pattern = rf'(\d+)\s*(?:\+|\-)?(?:\s*years?)\s+(?:of\s+)?(?:experience\s+)?(?:with\s+)?{re.escape(skill)}'
-        years_matches = re.findall(years_pattern, text)
+        years_matches = years_pattern.findall(text)
         if years_matches:
             max_years = max(int(year) for year in years_matches)
             confidence += min(max_years * 0.1, 0.5)
         
         # Project mentions
-        project_pattern = rf'(?:project|application|system|platform).*{re.escape(skill)}'
-        if re.search(project_pattern, text):
+        if project_pattern.search(text):
             confidence += 0.2
         
         return min(confidence, 1.0)
@@ -402,34 +350,58 @@ class AdvancedJobMatcher:
 
     async def calculate_advanced_match_score(self, job: Any, resume_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Calculate advanced match score using ML algorithms and semantic analysis
+        Calculate advanced match score using ML algorithms and semantic analysis.
+        Only numeric scores are computed; match_insights is left as None and
+        built on demand with get_match_insights().
+        """
+        return self.score_job_text(self._extract_job_text(job), resume_analysis)
+
+    @stage(SCORING)
+    def score_job_text(self, job_text: str, resume_analysis: Dict[str, Any],
+                       prune_below: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Pure-CPU scoring of one job's extracted text; no I/O, so it can run in
+        a worker process (see resumes.match_scoring).
+        
+        With prune_below, returns None as soon as an upper bound on the final
+        score falls below it: first from skill overlap alone, then from the
+        cheap dimensions, before the TF-IDF similarity is computed.
         """
         try:
-            # Extract job information
-            job_text = self._extract_job_text(job)
+            # Skill overlap is cheap; bound everything else by its maximum
+            skill_score = self._calculate_weighted_skill_match(job_text, resume_analysis)
+            if prune_below is not None:
+                bound = self._combine_scores(skill_score, 100, 100, self._max_market_alignment(resume_analysis), 100)
+                if bound < prune_below:
+                    return None
+            
             job_archetype = self._identify_job_archetype(job_text)
             
             # Multi-dimensional scoring
-            scores = await self._calculate_multi_dimensional_scores(job, job_text, job_archetype, resume_analysis)
-            
-            # ML-based semantic similarity
-            semantic_score = await self._calculate_semantic_similarity(job_text, resume_analysis)
+            scores = {
+                'skill_match': skill_score,
+                'experience_match': self._calculate_experience_match(job_text, job_archetype, resume_analysis),
+                'domain_match': self._calculate_domain_match(job_text, resume_analysis)
+            }
             
             # Market alignment score
             market_score = self._calculate_market_alignment(job_archetype, resume_analysis)
             
+            if prune_below is not None:
+                bound = self._combine_scores(skill_score, scores['experience_match'], 100,
+                                             market_score, scores['domain_match'])
+                if bound < prune_below:
+                    return None
+            
+            # ML-based semantic similarity
+            semantic_score = self._semantic_similarity(job_text, resume_analysis)
+            
             # Combine all scores with weights
-            final_score = (
-                scores['skill_match'] * 0.35 +
-                scores['experience_match'] * 0.25 +
-                semantic_score * 0.20 +
-                market_score * 0.15 +
-                scores['domain_match'] * 0.05
+            final_score = self._combine_scores(
+                scores['skill_match'], scores['experience_match'], semantic_score,
+                market_score, scores['domain_match']
             )
             
-            # Generate insights and recommendations
-            insights = self._generate_match_insights(job, job_archetype, resume_analysis, scores)
-            
             return {
                 'match_score': min(max(final_score, 0), 100),
                 'score_breakdown': {
@@ -439,7 +411,8 @@ class AdvancedJobMatcher:
                     'market_alignment': market_score,
                     'domain_expertise': scores['domain_match']
                 },
-                'match_insights': insights,
+                'match_insights': None,
+                'dimension_scores': scores,
                 'archetype_match': job_archetype,
                 'confidence_level': self._calculate_confidence_level(scores, semantic_score, market_score)
             }
@@ -448,6 +421,28 @@ class AdvancedJobMatcher:
             logger.error(f"Error calculating advanced match score: {e}")
             return {'match_score': 0, 'error': str(e)}
 
+    @staticmethod
+    def _combine_scores(skill: float, experience: float, semantic: float, market: float, domain: float) -> float:
+        """Weighted final score; monotonic in every dimension, so it also gives upper bounds"""
+        return (
+            skill * 0.35 +
+            experience * 0.25 +
+            semantic * 0.20 +
+            market * 0.15 +
+            domain * 0.05
+        )
+
+    def _max_market_alignment(self, resume_analysis: Dict[str, Any]) -> float:
+        """Highest market alignment this resume can get for any archetype; computed once per analysis"""
+        cached = self._max_alignment
+        if cached is not None and cached[0] is resume_analysis:
+            return cached[1]
+        
+        archetypes = list(self.job_archetypes) + ['general_software_engineer']
+        alignment = max(self._calculate_market_alignment(archetype, resume_analysis) for archetype in archetypes)
+        self._max_alignment = (resume_analysis, alignment)
+        return alignment
+
     def _extract_job_text(self, job: Any) -> str:
         """Extract and clean job text"""
         components = []
@@ -467,22 +462,22 @@ class AdvancedJobMatcher:
         """Identify job archetype using advanced pattern matching"""
         archetype_scores = {}
         
-        for archetype, config in self.job_archetypes.items():
+        for archetype, keywords, required_skills, preferred_skills in self.models.archetype_matchers:
             score = 0
             
             # Keyword matching
-            for keyword in config['keywords']:
+            for keyword in keywords:
                 if keyword in job_text:
                     score += 3
             
             # Required skills matching
-            for skill in config['required_skills']:
-                if skill.lower() in job_text:
+            for skill in required_skills:
+                if skill in job_text:
                     score += 2
             
             # Preferred skills matching
-            for skill in config['preferred_skills']:
-                if skill.lower() in job_text:
+            for skill in preferred_skills:
+                if skill in job_text:
                     score += 1
             
             if score > 0:
@@ -495,6 +490,10 @@ class AdvancedJobMatcher:
 
     async def _calculate_multi_dimensional_scores(self, job: Any, job_text: str, archetype: str, resume_analysis: Dict[str, Any]) -> Dict[str, float]:
         """Calculate scores across multiple dimensions"""
+        return self._multi_dimensional_scores(job_text, archetype, resume_analysis)
+
+    def _multi_dimensional_scores(self, job_text: str, archetype: str, resume_analysis: Dict[str, Any]) -> Dict[str, float]:
+        """Skill, experience and domain scores for one job"""
         
         # Skill matching with confidence weights
         skill_score = self._calculate_weighted_skill_match(job_text, resume_analysis)
@@ -594,6 +593,10 @@ class AdvancedJobMatcher:
 
     async def _calculate_semantic_similarity(self, job_text: str, resume_analysis: Dict[str, Any]) -> float:
         """Calculate semantic similarity using TF-IDF and cosine similarity"""
+        return self._semantic_similarity(job_text, resume_analysis)
+
+    def _semantic_similarity(self, job_text: str, resume_analysis: Dict[str, Any]) -> float:
+        """TF-IDF cosine similarity between job text and resume text (0-100)"""
         try:
             # Get resume text
             resume_text = resume_analysis.get('raw_text', '')
@@ -602,7 +605,7 @@ class AdvancedJobMatcher:
             
             # Vectorize texts
             documents = [job_text, resume_text]
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(documents)
+            tfidf_matrix = self.models.new_vectorizer().fit_transform(documents)
             
             # Calculate cosine similarity
             similarity_matrix = cosine_similarity(tfidf_matrix)
@@ -633,6 +636,49 @@ class AdvancedJobMatcher:
         
         return (growth_potential * 50 + emerging_tech_score)
 
+    def get_match_insights(self, job: Any, resume_analysis: Dict[str, Any], archetype: str = None,
+                           scores: Dict[str, float] = None) -> MatchInsights:
+        """
+        Insights for one match, built on first use and memoized in-process and
+        in the tiered cache (versioned by MATCH_INSIGHTS_VERSION). Keyed by the
+        analysis and job text contents, so re-analysis or a job edit rebuilds them.
+        """
+        job_text = self._extract_job_text(job)
+        memo_key = f"{_analysis_hash(resume_analysis)}_{content_hash(job_text)}"
+        if memo_key in self._insights_memo:
+            return self._insights_memo[memo_key]
+        
+        def generate():
+            job_archetype = archetype if archetype is not None else self._identify_job_archetype(job_text)
+            return self._generate_match_insights(job, job_archetype, resume_analysis, scores or {})
+        
+        insights = MATCH_INSIGHTS_CACHE.get_or_compute(memo_key, generate, self.cache_timeout)
+        
+        self._insights_memo[memo_key] = insights
+        return insights
+
+    def stored_match_insights(self, job_match: Any) -> Optional[MatchInsights]:
+        """
+        Insights for a saved match, for the match detail, from the resume's
+        stored analysis and the match's score breakdown. Never re-analyzes the
+        resume or writes to it; None when the resume has no stored analysis.
+        """
+        try:
+            summary = self.resume.analysis_summary
+            resume_analysis = json.loads(summary) if isinstance(summary, str) else summary
+        except ValueError:
+            resume_analysis = None
+        if not isinstance(resume_analysis, dict) or not resume_analysis:
+            return None
+        
+        if 'skills_with_confidence' not in resume_analysis:
+            # Analyses written by the upload pipeline list skills without confidences
+            resume_analysis = {
+                **resume_analysis,
+                'skills_with_confidence': self._extract_skills_with_confidence(self.resume.raw_text or ''),
+            }
+        return self.get_match_insights(job_match.job, resume_analysis, scores=job_match.match_details or {})
+
     def _generate_match_insights(self, job: Any, archetype: str, resume_analysis: Dict[str, Any], scores: Dict[str, float]) -> MatchInsights:
         """Generate detailed insights and recommendations"""
         
@@ -664,11 +710,9 @@ class AdvancedJobMatcher:
             market_trends=market_trends
         )
 
-    def _identify_skill_gaps(self, job: Any, archetype: str, resume_analysis: Dict[str, Any]) -> List[SkillMatch]:
-        """Identify specific skill gaps with learning priorities"""
+    def _missing_archetype_skills(self, archetype: str, resume_analysis: Dict[str, Any]) -> List[Tuple[str, str, int]]:
+        """(skill, skill type, learning priority) of the archetype's skills the resume lacks, most urgent first"""
         archetype_config = self.job_archetypes.get(archetype, {})
-        required_skills = archetype_config.get('required_skills', [])
-        preferred_skills = archetype_config.get('preferred_skills', [])
         
         user_skills = set()
         skills_with_confidence = resume_analysis.get('skills_with_confidence', {})
@@ -677,45 +721,39 @@ class AdvancedJobMatcher:
             for skill_data in category_skills:
                 user_skills.add(skill_data['skill'].lower())
         
-        skill_gaps = []
-        
-        # Check required skills
-        for skill in required_skills:
-            if skill.lower() not in user_skills:
-                skill_gaps.append(SkillMatch(
-                    skill=skill,
-                    confidence=0.0,
-                    skill_type='required',
-                    frequency_in_jobs=self._get_skill_frequency(skill),
-                    market_demand=self._get_market_demand(skill),
-                    learning_priority=1
-                ))
-        
-        # Check preferred skills
-        for skill in preferred_skills:
-            if skill.lower() not in user_skills:
-                skill_gaps.append(SkillMatch(
-                    skill=skill,
-                    confidence=0.0,
-                    skill_type='preferred',
-                    frequency_in_jobs=self._get_skill_frequency(skill),
-                    market_demand=self._get_market_demand(skill),
-                    learning_priority=2
-                ))
-        
-        return sorted(skill_gaps, key=lambda x: (x.learning_priority, -x.market_demand))
+        missing = [
+            (skill, skill_type, priority)
+            for skill_type, priority in (('required', 1), ('preferred', 2))
+            for skill in archetype_config.get(f'{skill_type}_skills', [])
+            if skill.lower() not in user_skills
+        ]
+        return sorted(missing, key=lambda gap: (gap[2], -self._get_market_demand(gap[0])))
+
+    def _identify_skill_gaps(self, job: Any, archetype: str, resume_analysis: Dict[str, Any]) -> List[SkillMatch]:
+        """Identify specific skill gaps with learning priorities"""
+        return [
+            SkillMatch(
+                skill=skill,
+                confidence=0.0,
+                skill_type=skill_type,
+                frequency_in_jobs=self._get_skill_frequency(skill),
+                market_demand=self._get_market_demand(skill),
+                learning_priority=priority
+            )
+            for skill, skill_type, priority in self._missing_archetype_skills(archetype, resume_analysis)
+        ]
 
     def _get_skill_frequency(self, skill: str) -> int:
         """Get frequency of skill mentions across all jobs"""
         try:
-            cache_key = f"skill_frequency_{skill.lower()}"
-            frequency = cache.get(cache_key)
+            cache_key = skill.lower()
+            frequency = SKILL_FREQUENCY_CACHE.get(cache_key)
             
             if frequency is None:
                 # For now, return a default value to avoid sync issues
                 # In production, this should be precomputed or cached
                 frequency = 10  # Default frequency
-                cache.set(cache_key, frequency, 3600)  # Cache for 1 hour
+                SKILL_FREQUENCY_CACHE.set(cache_key, frequency)
             
             return frequency
         except Exception:
@@ -829,13 +867,16 @@ class AdvancedJobMatcher:
             self.resume.analysis_summary = json.dumps(analysis)
             self.resume.extracted_skills = analysis.get('extracted_skills', [])
             self.resume.experience_level = analysis.get('experience_level', 'junior')
-            await asyncio.to_thread(self.resume.save)
+            await asyncio.get_running_loop().run_in_executor(io_executor(), self.resume.save)
         except Exception as e:
             logger.error(f"Error updating resume record: {e}")
 
-    async def generate_advanced_job_matches(self, limit: int = 50) -> List[Dict[str, Any]]:
+    async def generate_advanced_job_matches(self, limit: int = 50,
+                                            progress_callback: Optional[Callable[[int, int], None]] = None) -> List[Dict[str, Any]]:
         """
-        Generate advanced job matches with ML-based scoring and insights
+        Generate advanced job matches with ML-based scoring. Insights are not
+        built here; the match detail asks for them with stored_match_insights().
+        progress_callback(jobs_scored, total_jobs) is called after each scored chunk.
         """
         try:
             # Get enhanced resume analysis
@@ -848,46 +889,65 @@ class AdvancedJobMatcher:
             # Get jobs with intelligent filtering
             jobs = await self._get_filtered_jobs(resume_analysis)
             
-            # Process jobs in batches for better performance
-            batch_size = 10
-            job_matches = []
+            # Score in worker processes (CPU-bound), keeping only the top `limit`
+            jobs_by_id = {job.id: job for job in jobs}
+            candidates = [(job.id, self._extract_job_text(job)) for job in jobs]
             
-            for i in range(0, len(jobs), batch_size):
-                batch = jobs[i:i + batch_size]
-                batch_tasks = [
-                    self.calculate_advanced_match_score(job, resume_analysis)
-                    for job in batch
-                ]
-                
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                
-                for job, result in zip(batch, batch_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Error processing job {job.id}: {result}")
-                        continue
-                    
-                    if result['match_score'] > 20:  # Only include reasonable matches
-                        job_matches.append({
-                            'job': job,
-                            'match_score': result['match_score'],
-                            'score_breakdown': result['score_breakdown'],
-                            'match_insights': result['match_insights'],
-                            'archetype_match': result['archetype_match'],
-                            'confidence_level': result['confidence_level']
-                        })
+            loop = asyncio.get_running_loop()
+            scored = await loop.run_in_executor(
+                cpu_executor(),
+                lambda: self._score_memoized(candidates, resume_analysis, limit, progress_callback)
+            )
             
-            # Sort by match score and confidence
-            job_matches.sort(key=lambda x: (x['match_score'], x['confidence_level'] == 'high'), reverse=True)
+            top_matches = []
+            for job_id, result in scored:
+                top_matches.append({
+                    'job': jobs_by_id[job_id],
+                    'match_score': result['match_score'],
+                    'score_breakdown': result['score_breakdown'],
+                    'match_insights': None,
+                    'dimension_scores': result['dimension_scores'],
+                    'archetype_match': result['archetype_match'],
+                    'confidence_level': result['confidence_level']
+                })
             
             # Save matches to database
-            await self._save_advanced_job_matches(job_matches[:limit], resume_analysis)
+            await self._save_advanced_job_matches(top_matches, resume_analysis)
             
-            return job_matches[:limit]
+            return top_matches
             
         except Exception as e:
             logger.error(f"Error generating advanced job matches: {e}")
             return []
 
+    def _score_memoized(self, candidates: List[Tuple[Any, str]], resume_analysis: Dict[str, Any],
+                        limit: int, progress_callback: Optional[Callable[[int, int], None]] = None
+                        ) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        score_candidates() with memoized scores: stored results for unchanged
+        (analysis, job text) pairs seed the top matches, the rest are scored
+        and stored.
+        """
+        memo = ScoreMemo(MATCH_SCORER_NAME, MATCH_SCORER_VERSION)
+        resume_hash = _analysis_hash(resume_analysis)
+        job_hashes = {job_id: content_hash(job_text) for job_id, job_text in candidates}
+        memo.prefetch(resume_hash, job_hashes.values())
+
+        known = {}
+        for job_id, job_hash in job_hashes.items():
+            cached = memo.get(resume_hash, job_hash, check_db=False)
+            if cached is not None:
+                known[job_id] = cached[1]
+
+        scored = score_candidates(
+            self, candidates, resume_analysis, limit,
+            progress_callback=progress_callback,
+            known=known,
+            record=lambda job_id, result: memo.put(resume_hash, job_hashes[job_id], result['match_score'], result),
+        )
+        memo.flush()
+        return scored
+
     async def _get_filtered_jobs(self, resume_analysis: Dict[str, Any]) -> List[Any]:
         """Get jobs filtered by user's skills and preferences"""
         try:
@@ -901,23 +961,13 @@ class AdvancedJobMatcher:
                         key_skills.append(skill_data['skill'])
             
             # Build query to find relevant jobs
-            from django.db.models import Q
             from asgiref.sync import sync_to_async
             
             if key_skills:
-                # Create Q objects for skill matching
-                skill_queries = Q()
-                for skill in key_skills[:10]:  # Limit to prevent query complexity
-                    skill_queries |= (
-                        Q(description__icontains=skill) |
-                        Q(requirements__icontains=skill) |
-                        Q(title__icontains=skill)
-                    )
-                
-                jobs = await sync_to_async(list)(Job.objects.filter(
-                    skill_queries,
-                    is_active=True
-                ).distinct().order_by('-created_at')[:300])  # Limit for performance
+                # Full-text index lookup, most relevant first
+                from jobs.search import search_jobs
+                jobs = await sync_to_async(search_jobs)(key_skills[:10], limit=300)  # Limit for performance
+                jobs += await sync_to_async(self._skill_overlap_jobs)({job.id for job in jobs})
             else:
                 # Fallback to recent jobs
                 jobs = await sync_to_async(list)(Job.objects.filter(
@@ -930,6 +980,20 @@ class AdvancedJobMatcher:
             logger.error(f"Error filtering jobs: {e}")
             return await sync_to_async(list)(Job.objects.filter(is_active=True).order_by('-created_at')[:100])
 
+    def _skill_overlap_jobs(self, exclude_ids, limit: int = 100) -> List[Any]:
+        """Jobs sharing the most normalized skills with the resume (JobSkill/ResumeSkill), beyond exclude_ids"""
+        if self.resume is None:
+            return []
+        try:
+            from jobs.skills import skill_overlap_scores
+            job_ids = [row['job_id'] for row in skill_overlap_scores(self.resume, limit=limit)
+                       if row['job_id'] not in exclude_ids]
+            jobs_by_id = Job.objects.in_bulk(job_ids)
+            return [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+        except Exception as e:
+            logger.error(f"Error finding skill overlap jobs: {e}")
+            return []
+
     async def _save_advanced_job_matches(self, matches: List[Dict[str, Any]], resume_analysis: Dict[str, Any]):
         """Save advanced job matches to database"""
         try:
@@ -949,9 +1013,9 @@ class AdvancedJobMatcher:
                             resume=self.resume,
                             job=match['job'],
                             match_score=match['match_score'],
-                            match_details=asdict(match['match_insights']) if hasattr(match['match_insights'], '__dict__') else match['match_insights'],
+                            match_details=match['score_breakdown'],
                             matching_skills=self._extract_matching_skills(match),
-                            missing_skills=self._extract_missing_skills(match),
+                            missing_skills=self._extract_missing_skills(match, resume_analysis),
                             analysis_version='advanced_v2.0',
                             confidence_level=match['confidence_level'],
                             archetype_match=match['archetype_match']
@@ -959,6 +1023,7 @@ class AdvancedJobMatcher:
                     
                     # Bulk create for better performance
                     JobMatch.objects.bulk_create(job_matches_to_create)
+                    refresh_summary_on_commit(self.user)
             
             # Run the sync function asynchronously
             await sync_to_async(save_matches)()
@@ -972,15 +1037,20 @@ class AdvancedJobMatcher:
         # This would be implemented based on your JobMatch model structure
         return []
 
-    def _extract_missing_skills(self, match: Dict[str, Any]) -> List[str]:
-        """Extract missing skills from match insights"""
+    def _extract_missing_skills(self, match: Dict[str, Any], resume_analysis: Dict[str, Any]) -> List[str]:
+        """Top 5 skill gaps, from the insights when built, else from the matched archetype"""
         insights = match.get('match_insights')
         if insights and hasattr(insights, 'skill_gaps'):
-            return [gap.skill for gap in insights.skill_gaps[:5]]  # Top 5 gaps
-        return []
+            return [gap.skill for gap in insights.skill_gaps[:5]]
+        missing = self._missing_archetype_skills(match['archetype_match'], resume_analysis)
+        return [skill for skill, _, _ in missing[:5]]
 
-    def generate_career_recommendations(self, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate comprehensive career recommendations"""
+    def generate_career_recommendations(self, matches: List[Dict[str, Any]],
+                                        resume_analysis: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Generate comprehensive career recommendations. With resume_analysis,
+        insights missing from the top matches are built for them.
+        """
         if not matches:
             return {
                 'message': 'No suitable matches found. Focus on building fundamental skills.',
@@ -997,6 +1067,10 @@ class AdvancedJobMatcher:
         
         for match in matches[:20]:  # Top 20 matches
             insights = match.get('match_insights')
+            if insights is None and resume_analysis:
+                insights = self.get_match_insights(
+                    match['job'], resume_analysis, match['archetype_match'], match['dimension_scores']
+                )
             if insights:
                 all_skill_gaps.extend(insights.skill_gaps)
                 archetype_counts[match['archetype_match']] += 1
@@ -1077,7 +1151,9 @@ class AdvancedJobMatcher:
             matches = await self.generate_advanced_job_matches(limit=50)
             
             # Step 3: Generate career recommendations
-            recommendations = self.generate_career_recommendations(matches)
+            recommendations = await asyncio.get_running_loop().run_in_executor(
+                cpu_executor(), self.generate_career_recommendations, matches, resume_analysis
+            )
             
             # Step 4: Update user's matching timestamp
             await self._update_matching_timestamp()
@@ -1105,7 +1181,9 @@ class AdvancedJobMatcher:
         try:
             if hasattr(self.resume, 'last_matched_at'):
                 self.resume.last_matched_at = timezone.now()
-                await asyncio.to_thread(self.resume.save, update_fields=['last_matched_at'])
+                await asyncio.get_running_loop().run_in_executor(
+                    io_executor(), lambda: self.resume.save(update_fields=['last_matched_at'])
+                )
         except Exception as e:
             logger.error(f"Error updating matching timestamp: {e}")
 
@@ -1123,26 +1201,43 @@ class JobMatchingService:
     @staticmethod
     async def get_user_matches(user, resume, limit=20):
         """Get existing matches for a user"""
+        page = await JobMatchingService.get_user_matches_page(user, resume, limit=limit)
+        return page['matches']
+
+    @staticmethod
+    async def get_user_matches_page(user, resume, cursor=None, limit=20):
+        """
+        Page of existing matches for a user, best first, keyset-paginated on
+        (match_score, id). Pass the returned next_cursor to get the next page.
+        """
         try:
             from asgiref.sync import sync_to_async
+            from core.pagination import keyset_page
             
-            matches = await sync_to_async(list)(JobMatch.objects.filter(
-                user=user,
-                resume=resume,
-                analysis_version='advanced_v2.0'
-            ).order_by('-match_score')[:limit])
+            page = await sync_to_async(keyset_page)(
+                JobMatch.objects.filter(
+                    user=user,
+                    resume=resume,
+                    analysis_version='advanced_v2.0'
+                ).select_related('job'),
+                cursor,
+                page_size=limit,
+            )
             
-            return [{
-                'job': match.job,
-                'match_score': match.match_score,
-                'confidence_level': match.confidence_level,
-                'archetype_match': match.archetype_match,
-                'match_details': match.match_details
-            } for match in matches]
+            return {
+                'matches': [{
+                    'job': match.job,
+                    'match_score': match.match_score,
+                    'confidence_level': getattr(match, 'confidence_level', None),
+                    'archetype_match': getattr(match, 'archetype_match', None),
+                    'match_details': match.match_details
+                } for match in page],
+                'next_cursor': page.next_cursor,
+            }
             
         except Exception as e:
             logger.error(f"Error getting user matches: {e}")
-            return []
+            return {'matches': [], 'next_cursor': None}
     
     @staticmethod
     async def refresh_matches_if_needed(user, resume):
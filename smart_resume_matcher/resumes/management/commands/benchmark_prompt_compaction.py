@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+from resumes.models import Resume
+from resumes.enhanced_analyzer import AdvancedAIAnalyzer
+from resumes.prompt_compaction import compact_resume_text
+
+
+class Command(BaseCommand):
+    help = 'Compare resume analysis on compacted vs. uncompacted prompt text'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Number of resumes to benchmark')
+        parser.add_argument('--budget', type=int, default=None, help='Token budget (defaults to RESUME_PROMPT_TOKEN_BUDGET)')
+        parser.add_argument('--llm', action='store_true', help='Call the LLM for both variants instead of the local analyzer')
+
+    def handle(self, *args, **options):
+        analyzer = AdvancedAIAnalyzer()
+        resumes = Resume.objects.exclude(raw_text='').exclude(
+            raw_text__startswith='PDF_EXTRACTION'
+        ).order_by('-created_at')[:options['limit']]
+
+        if not resumes:
+            self.stdout.write('No resumes with extracted text found.')
+            return
+
+        ratios = []
+        jaccards = []
+        recalls = []
+        level_matches = 0
+        full_time = 0.0
+        compact_time = 0.0
+
+        for resume in resumes:
+            compaction = compact_resume_text(resume.raw_text, token_budget=options['budget'])
+
+            start = time.time()
+            full = self._analyze(analyzer, resume.raw_text, use_llm=options['llm'])
+            full_time += time.time() - start
+
+            start = time.time()
+            compacted = self._analyze(analyzer, compaction.text, use_llm=options['llm'])
+            compact_time += time.time() - start
+
+            full_skills = {s.lower() for s in full.extracted_skills}
+            compact_skills = {s.lower() for s in compacted.extracted_skills}
+            union = full_skills | compact_skills
+            jaccard = len(full_skills & compact_skills) / len(union) if union else 1.0
+            recall = len(full_skills & compact_skills) / len(full_skills) if full_skills else 1.0
+
+            ratios.append(compaction.compression_ratio)
+            jaccards.append(jaccard)
+            recalls.append(recall)
+            if full.experience_level == compacted.experience_level:
+                level_matches += 1
+
+            self.stdout.write(
+                f'Resume {resume.id}: ~{compaction.original_tokens} -> ~{compaction.compacted_tokens} tokens '
+                f'(ratio {compaction.compression_ratio:.2f}), skill jaccard {jaccard:.2f}, '
+                f'recall {recall:.2f}, level {full.experience_level}/{compacted.experience_level}'
+            )
+
+        count = len(ratios)
+        self.stdout.write(
+            f'\nBenchmarked {count} resumes: '
+            f'avg ratio {sum(ratios) / count:.2f}, '
+            f'avg skill jaccard {sum(jaccards) / count:.2f}, '
+            f'avg skill recall {sum(recalls) / count:.2f}, '
+            f'experience level agreement {level_matches}/{count}, '
+            f'time full {full_time:.2f}s vs compacted {compact_time:.2f}s'
+        )
+
+    def _analyze(self, analyzer, text, use_llm):
+        """
+        Run one analysis variant as given, bypassing the analysis store. The
+        compacted variant is already compacted (to --budget), so the analyzer
+        must not compact it again.
+        """
+        if use_llm:
+            return asyncio.run(analyzer._advanced_ai_analysis(text, compact=False))
+        return asyncio.run(analyzer._advanced_fallback_analysis(text))
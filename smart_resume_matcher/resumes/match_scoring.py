@@ -0,0 +1,261 @@
+"""
+Process-pool scoring for AdvancedJobMatcher.
+
+Job scoring is pure-Python CPU work (regex scans, set arithmetic, TF-IDF), so
+asyncio.gather over it runs serially on one core. With MATCH_SCORING_WORKERS
+above 1, candidates are split into chunks and scored on one process pool per
+process, created on first use with spawned (not forked) workers, so it is safe
+to start from threaded servers. Each call pickles the matcher's scoring state
+and the resume analysis once; every worker unpickles them once per call and
+returns only each chunk's local top-k, which the parent merges with a heap.
+
+Each scorer keeps its top k in a core.ranking.TopK and passes the current k-th
+score to AdvancedJobMatcher.score_job_text as prune_below, so jobs whose upper
+bound cannot beat it skip the TF-IDF stage. Serial scoring shares one TopK
+across all chunks; pool workers prune against their own chunk's top k.
+
+Results already known (memoized scores) can be passed in as `known`: they seed
+the top k without being rescored. Every fully computed result is reported to
+`record` in the parent process so callers can memoize it.
+
+Scoring is serial by default (MATCH_SCORING_WORKERS=1), for small candidate
+sets, and inside daemonic processes (Celery prefork children), which cannot
+start their own pools. A broken pool is dropped and the call scored serially.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from core.ranking import TopK
+from core.request_timing import SCORING, stage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_MIN_SCORE = 20
+
+# Calls whose (matcher, resume analysis) a worker has unpickled, most recent last
+_WORKER_STATE_SIZE = 4
+_worker_state: 'OrderedDict[str, Tuple[Any, Dict[str, Any]]]' = OrderedDict()
+
+# (job_id, job_text) pairs
+Candidate = Tuple[Any, str]
+ScoredJob = Tuple[Any, Dict[str, Any]]
+
+
+def _rank_key(item: Tuple[int, Any, Dict[str, Any]]) -> Tuple[float, bool, int]:
+    """Score, then high confidence, then original order"""
+    index, _, result = item
+    return result['match_score'], result['confidence_level'] == 'high', -index
+
+
+def _score_into(matcher, chunk: Sequence[Tuple[int, Any, str]], resume_analysis: Dict[str, Any],
+                top: TopK, min_score: float, scored: Optional[List[ScoredJob]] = None) -> int:
+    """
+    Score a chunk into top, keeping results above min_score, and append every
+    fully computed result to scored. Returns the number pruned.
+    """
+    pruned = 0
+    for index, job_id, job_text in chunk:
+        prune_below = max(min_score, top.floor or 0)
+        try:
+            result = matcher.score_job_text(job_text, resume_analysis, prune_below=prune_below)
+        except Exception as e:
+            logger.error(f"Error scoring job {job_id}: {e}")
+            continue
+        if result is None:
+            pruned += 1
+            continue
+        if scored is not None:
+            scored.append((job_id, result))
+        if result['match_score'] > min_score:
+            item = (index, job_id, result)
+            top.push(_rank_key(item), item)
+    return pruned
+
+
+def _top_k(matcher, chunk: Sequence[Tuple[int, Any, str]], resume_analysis: Dict[str, Any],
+           k: int, min_score: float, collect: bool = False):
+    """
+    Score a chunk; returns its k best results above min_score, the number
+    pruned, and (with collect) every fully computed result
+    """
+    top = TopK(k)
+    scored: List[ScoredJob] = []
+    pruned = _score_into(matcher, chunk, resume_analysis, top, min_score, scored if collect else None)
+    return top.items(), pruned, scored
+
+
+def _init_worker() -> None:
+    # Spawned workers start from a fresh interpreter; matchers need the app registry
+    import django
+    django.setup()
+
+
+def _score_chunk(call_id: str, payload: bytes, chunk: Sequence[Tuple[int, Any, str]],
+                 k: int, min_score: float, collect: bool):
+    state = _worker_state.get(call_id)
+    if state is None:
+        state = pickle.loads(payload)
+        _worker_state[call_id] = state
+        while len(_worker_state) > _WORKER_STATE_SIZE:
+            _worker_state.popitem(last=False)
+    matcher, resume_analysis = state
+    return _top_k(matcher, chunk, resume_analysis, k, min_score, collect)
+
+
+def scoring_workers() -> int:
+    """Configured worker count; 0 means one per CPU, 1 scores in the calling thread"""
+    workers = getattr(settings, 'MATCH_SCORING_WORKERS', 1)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _can_use_pool() -> bool:
+    # Daemonic processes (e.g. Celery prefork children) may not have children
+    return not multiprocessing.current_process().daemon
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """This process's scoring pool, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=scoring_workers(), initializer=_init_worker,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def shutdown_scoring_pool(wait: bool = True) -> None:
+    """Shut down the scoring pool; the next pooled call starts a new one"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _reset_after_fork() -> None:
+    # The parent's pool belongs to the parent; a forked child starts its own
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+@stage(SCORING)
+def score_candidates(matcher, candidates: Sequence[Candidate], resume_analysis: Dict[str, Any],
+                     k: int, min_score: float = DEFAULT_MIN_SCORE, workers: Optional[int] = None,
+                     chunk_size: Optional[int] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     known: Optional[Dict[Any, Dict[str, Any]]] = None,
+                     record: Optional[Callable[[Any, Dict[str, Any]], None]] = None) -> List[ScoredJob]:
+    """
+    Score (job_id, job_text) candidates and return the k best as
+    (job_id, score_result) pairs, best first. Blocking; call it from an
+    executor when on an event loop.
+    """
+    workers = workers or scoring_workers()
+    chunk_size = chunk_size or getattr(settings, 'MATCH_SCORING_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    known = known or {}
+    total = len(candidates)
+
+    # Known results seed the top k; only the rest are scored
+    top = _seeded(k, candidates, known, min_score)
+    pending = [
+        (index, job_id, job_text)
+        for index, (job_id, job_text) in enumerate(candidates) if job_id not in known
+    ]
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    progress = _Progress(total, len(candidates) - len(pending), progress_callback)
+    if workers <= 1 or len(chunks) <= 1 or not _can_use_pool():
+        pruned = _score_serial(matcher, chunks, resume_analysis, top, min_score, progress, record)
+    else:
+        try:
+            pruned = _score_in_pool(matcher, chunks, resume_analysis, top, min_score, progress, record)
+        except Exception as e:
+            logger.warning(f"Process pool scoring failed, scoring serially: {e}")
+            shutdown_scoring_pool(wait=False)
+            top = _seeded(k, candidates, known, min_score)
+            progress = _Progress(total, len(candidates) - len(pending), progress_callback)
+            pruned = _score_serial(matcher, chunks, resume_analysis, top, min_score, progress, record)
+
+    logger.debug(f"Top {k} of {total} candidates: {len(known)} known, {len(pending)} scored, "
+                 f"{pruned} pruned before the semantic stage")
+    return [(job_id, result) for _, job_id, result in top.items()]
+
+
+def _seeded(k: int, candidates: Sequence[Candidate], known: Dict[Any, Dict[str, Any]],
+            min_score: float) -> TopK:
+    """A TopK holding the known results above min_score"""
+    top = TopK(k)
+    for index, (job_id, _) in enumerate(candidates):
+        if job_id in known and known[job_id]['match_score'] > min_score:
+            item = (index, job_id, known[job_id])
+            top.push(_rank_key(item), item)
+    return top
+
+
+class _Progress:
+    def __init__(self, total: int, done: int, callback: Optional[Callable[[int, int], None]]):
+        self.total = total
+        self.done = done
+        self.callback = callback
+
+    def advance(self, count: int) -> None:
+        self.done += count
+        if self.callback:
+            self.callback(self.done, self.total)
+
+
+def _record_all(record, scored: List[ScoredJob]) -> None:
+    if record:
+        for job_id, result in scored:
+            record(job_id, result)
+
+
+def _score_serial(matcher, chunks, resume_analysis, top, min_score, progress, record):
+    pruned = 0
+    for chunk in chunks:
+        scored: List[ScoredJob] = []
+        pruned += _score_into(matcher, chunk, resume_analysis, top, min_score, scored if record else None)
+        _record_all(record, scored)
+        progress.advance(len(chunk))
+    return pruned
+
+
+def _score_in_pool(matcher, chunks, resume_analysis, top, min_score, progress, record):
+    call_id = uuid.uuid4().hex
+    payload = pickle.dumps((matcher, resume_analysis))
+    pool = _get_pool()
+    futures = {
+        pool.submit(_score_chunk, call_id, payload, chunk, top.k, min_score, record is not None): len(chunk)
+        for chunk in chunks
+    }
+    pruned = 0
+    for future in as_completed(futures):
+        chunk_best, chunk_pruned, scored = future.result()
+        for item in chunk_best:
+            top.push(_rank_key(item), item)
+        pruned += chunk_pruned
+        _record_all(record, scored)
+        progress.advance(futures[future])
+    return pruned
+
+
+atexit.register(shutdown_scoring_pool)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,514 @@
+"""
+Process-wide registry of compiled matching resources.
+
+The skill taxonomies, job archetypes, precompiled regex patterns and the TF-IDF
+vectorizer configuration used by AdvancedAIAnalyzer and AdvancedJobMatcher are
+built once per process by get_matching_models() and shared by every analyzer
+and matcher instance. They are read-only after loading; code that needs a
+fitted vectorizer gets a fresh unfitted copy from MatchingModels.new_vectorizer().
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+# ---------------------------------------------------------------------------
+# Resume analyzer taxonomy (AdvancedAIAnalyzer)
+# ---------------------------------------------------------------------------
+
+# Enhanced skill taxonomy with weighted importance
+ANALYZER_SKILL_TAXONOMY = {
+    'programming_languages': {
+        'skills': [
+            'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'Ruby',
+            'PHP', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'C', 'Objective-C', 'Dart',
+            'Perl', 'Shell', 'Bash', 'PowerShell', 'Assembly', 'Clojure', 'F#', 'Haskell',
+            'Erlang', 'Elixir', 'Lua', 'Julia', 'Groovy', 'VBA', 'COBOL', 'Fortran'
+        ],
+        'weight': 1.0,
+        'aliases': {
+            'js': 'JavaScript',
+            'ts': 'TypeScript',
+            'py': 'Python',
+            'cpp': 'C++',
+            'c++': 'C++',
+            'csharp': 'C#',
+            'c#': 'C#',
+            'golang': 'Go'
+        }
+    },
+    'web_frameworks': {
+        'skills': [
+            'React', 'Angular', 'Vue.js', 'Django', 'Flask', 'FastAPI', 'Express.js',
+            'Node.js', 'Next.js', 'Nuxt.js', 'Laravel', 'Spring Boot', 'ASP.NET',
+            'Ruby on Rails', 'Symfony', 'CodeIgniter', 'Svelte', 'Ember.js', 'Blazor',
+            'Phoenix', 'Gin', 'Echo', 'Fiber', 'Nest.js', 'Koa.js', 'Hapi.js',
+            'Meteor', 'Backbone.js', 'Knockout.js', 'Alpine.js', 'Solid.js'
+        ],
+        'weight': 0.9,
+        'aliases': {
+            'reactjs': 'React',
+            'angularjs': 'Angular',
+            'vuejs': 'Vue.js',
+            'nodejs': 'Node.js',
+            'nextjs': 'Next.js',
+            'nuxtjs': 'Nuxt.js',
+            'rails': 'Ruby on Rails',
+            'ror': 'Ruby on Rails'
+        }
+    },
+    'databases': {
+        'skills': [
+            'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server',
+            'MariaDB', 'DynamoDB', 'Cassandra', 'Elasticsearch', 'Neo4j', 'InfluxDB',
+            'CouchDB', 'Firebase', 'Supabase', 'PlanetScale', 'Snowflake', 'BigQuery',
+            'Amazon RDS', 'Azure SQL', 'Google Cloud SQL', 'TimescaleDB', 'ClickHouse',
+            'Apache Drill', 'Apache Hive', 'Apache Impala', 'Presto', 'Trino'
+        ],
+        'weight': 0.8,
+        'aliases': {
+            'postgres': 'PostgreSQL',
+            'mysql': 'MySQL',
+            'mongo': 'MongoDB',
+            'elasticsearch': 'Elasticsearch',
+            'elastic': 'Elasticsearch',
+            'sqlserver': 'SQL Server',
+            'mssql': 'SQL Server'
+        }
+    },
+    'cloud_platforms': {
+        'skills': [
+            'AWS', 'Google Cloud', 'Azure', 'DigitalOcean', 'Heroku', 'Vercel', 'Netlify',
+            'Firebase', 'Cloudflare', 'Linode', 'Vultr', 'IBM Cloud', 'Oracle Cloud',
+            'Alibaba Cloud', 'Scaleway', 'OVH', 'Hetzner', 'Railway', 'Render',
+            'PlanetScale', 'Supabase', 'Neon', 'Upstash', 'Fly.io'
+        ],
+        'weight': 0.85,
+        'aliases': {
+            'amazon web services': 'AWS',
+            'gcp': 'Google Cloud',
+            'google cloud platform': 'Google Cloud',
+            'microsoft azure': 'Azure',
+            'amazon aws': 'AWS'
+        }
+    },
+    'devops_tools': {
+        'skills': [
+            'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions', 'Terraform',
+            'Ansible', 'Chef', 'Puppet', 'Vagrant', 'Nginx', 'Apache', 'Git', 'SVN',
+            'CircleCI', 'Travis CI', 'Helm', 'Prometheus', 'Grafana', 'ELK Stack',
+            'Istio', 'Linkerd', 'Consul', 'Vault', 'Nomad', 'Packer', 'Pulumi',
+            'ArgoCD', 'Flux', 'Tekton', 'Spinnaker', 'Bamboo', 'TeamCity'
+        ],
+        'weight': 0.75,
+        'aliases': {
+            'k8s': 'Kubernetes',
+            'gitlab-ci': 'GitLab CI',
+            'github-actions': 'GitHub Actions',
+            'travisci': 'Travis CI',
+            'circleci': 'CircleCI'
+        }
+    },
+    'mobile_development': {
+        'skills': [
+            'React Native', 'Flutter', 'Ionic', 'Xamarin', 'Swift', 'Kotlin', 'Cordova',
+            'PhoneGap', 'NativeScript', 'Unity', 'Unreal Engine', 'SwiftUI', 'Jetpack Compose',
+            'Expo', 'Capacitor', 'Titanium', 'Corona SDK', 'Cocos2d', 'Godot'
+        ],
+        'weight': 0.8,
+        'aliases': {
+            'react-native': 'React Native',
+            'rn': 'React Native',
+            'xamarin.forms': 'Xamarin',
+            'phonegap': 'PhoneGap'
+        }
+    },
+    'data_science': {
+        'skills': [
+            'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib',
+            'Seaborn', 'Jupyter', 'Apache Spark', 'Hadoop', 'Kafka', 'Airflow',
+            'MLflow', 'Kubeflow', 'SageMaker', 'BigQuery', 'Tableau', 'Power BI',
+            'Plotly', 'Bokeh', 'Altair', 'Streamlit', 'Gradio', 'Weights & Biases',
+            'Neptune', 'Comet', 'DataRobot', 'H2O.ai', 'Databricks', 'Snowflake',
+            'dbt', 'Great Expectations', 'Prefect', 'Kedro', 'DVC', 'ClearML'
+        ],
+        'weight': 0.9,
+        'aliases': {
+            'tensorflow': 'TensorFlow',
+            'pytorch': 'PyTorch',
+            'sklearn': 'Scikit-learn',
+            'scikit-learn': 'Scikit-learn',
+            'numpy': 'NumPy',
+            'pandas': 'Pandas',
+            'jupyter notebook': 'Jupyter',
+            'powerbi': 'Power BI'
+        }
+    },
+    'testing_frameworks': {
+        'skills': [
+            'Jest', 'Mocha', 'Jasmine', 'Cypress', 'Selenium', 'Playwright', 'TestCafe',
+            'PyTest', 'Unittest', 'JUnit', 'TestNG', 'RSpec', 'Capybara', 'Karma',
+            'Protractor', 'WebDriver', 'Appium', 'Postman', 'Newman', 'Artillery',
+            'K6', 'Locust', 'JMeter', 'Gatling', 'SoapUI', 'REST Assured'
+        ],
+        'weight': 0.6,
+        'aliases': {
+            'pytest': 'PyTest',
+            'junit': 'JUnit',
+            'testng': 'TestNG',
+            'webdriver': 'WebDriver'
+        }
+    },
+    'design_tools': {
+        'skills': [
+            'Figma', 'Adobe XD', 'Sketch', 'InVision', 'Photoshop', 'Illustrator',
+            'After Effects', 'Premiere Pro', 'Canva', 'Framer', 'Principle',
+            'Zeplin', 'Abstract', 'Marvel', 'Balsamiq', 'Axure', 'Miro', 'Whimsical'
+        ],
+        'weight': 0.5,
+        'aliases': {
+            'adobexd': 'Adobe XD',
+            'adobe-xd': 'Adobe XD',
+            'photoshop': 'Photoshop',
+            'illustrator': 'Illustrator'
+        }
+    },
+    'project_management': {
+        'skills': [
+            'Jira', 'Trello', 'Asana', 'Monday.com', 'Notion', 'Confluence', 'Slack',
+            'Microsoft Teams', 'Zoom', 'Linear', 'ClickUp', 'Basecamp', 'Airtable',
+            'Smartsheet', 'Wrike', 'Teamwork', 'Podio', 'Zoho Projects'
+        ],
+        'weight': 0.4,
+        'aliases': {
+            'monday': 'Monday.com',
+            'ms teams': 'Microsoft Teams',
+            'teams': 'Microsoft Teams',
+            'clickup': 'ClickUp'
+        }
+    }
+}
+
+# Advanced tech stack definitions with scoring
+TECH_STACKS = {
+    'Full Stack Web Development': {
+        'core_skills': ['React', 'Node.js', 'Express.js', 'MongoDB', 'PostgreSQL'],
+        'bonus_skills': ['TypeScript', 'Next.js', 'GraphQL', 'Redis', 'AWS'],
+        'weight': 1.0
+    },
+    'Python Backend Development': {
+        'core_skills': ['Python', 'Django', 'Flask', 'FastAPI', 'PostgreSQL'],
+        'bonus_skills': ['Redis', 'Celery', 'Docker', 'AWS', 'Kubernetes'],
+        'weight': 0.9
+    },
+    'Frontend Development': {
+        'core_skills': ['React', 'TypeScript', 'HTML', 'CSS', 'JavaScript'],
+        'bonus_skills': ['Next.js', 'Vue.js', 'Angular', 'Tailwind CSS', 'Webpack'],
+        'weight': 0.8
+    },
+    'Data Science & ML': {
+        'core_skills': ['Python', 'Pandas', 'NumPy', 'TensorFlow', 'PyTorch'],
+        'bonus_skills': ['Jupyter', 'Scikit-learn', 'Apache Spark', 'MLflow', 'Kubeflow'],
+        'weight': 1.0
+    },
+    'DevOps Engineering': {
+        'core_skills': ['Docker', 'Kubernetes', 'AWS', 'Jenkins', 'Terraform'],
+        'bonus_skills': ['Ansible', 'Prometheus', 'Grafana', 'Helm', 'GitLab CI'],
+        'weight': 0.95
+    },
+    'Mobile Development': {
+        'core_skills': ['React Native', 'Flutter', 'Swift', 'Kotlin'],
+        'bonus_skills': ['Expo', 'Firebase', 'Redux', 'MobX', 'Realm'],
+        'weight': 0.85
+    },
+    'Java Enterprise': {
+        'core_skills': ['Java', 'Spring Boot', 'Maven', 'PostgreSQL', 'Docker'],
+        'bonus_skills': ['Spring Security', 'JPA', 'Hibernate', 'Kafka', 'Microservices'],
+        'weight': 0.8
+    },
+    'Cloud Architecture': {
+        'core_skills': ['AWS', 'Docker', 'Kubernetes', 'Terraform', 'Microservices'],
+        'bonus_skills': ['Istio', 'Prometheus', 'Grafana', 'ArgoCD', 'Helm'],
+        'weight': 1.0
+    }
+}
+
+# Role mapping for career recommendations
+ROLE_MAPPINGS = {
+    'Full Stack Web Development': ['Full Stack Developer', 'Web Developer', 'Software Engineer'],
+    'Python Backend Development': ['Backend Developer', 'Python Developer', 'API Developer'],
+    'Frontend Development': ['Frontend Developer', 'React Developer', 'UI Developer'],
+    'Data Science & ML': ['Data Scientist', 'ML Engineer', 'Data Analyst'],
+    'DevOps Engineering': ['DevOps Engineer', 'Site Reliability Engineer', 'Platform Engineer'],
+    'Mobile Development': ['Mobile Developer', 'React Native Developer', 'iOS/Android Developer'],
+    'Java Enterprise': ['Java Developer', 'Backend Developer', 'Enterprise Developer'],
+    'Cloud Architecture': ['Cloud Architect', 'Solutions Architect', 'Cloud Engineer']
+}
+
+
+# ---------------------------------------------------------------------------
+# Job matcher taxonomy (AdvancedJobMatcher)
+# ---------------------------------------------------------------------------
+
+# Advanced skill categorization with market weights
+MATCHER_SKILL_TAXONOMY = {
+    'core_programming': {
+        'weight': 1.0,
+        'skills': ['Python', 'JavaScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'TypeScript', 'Swift', 'Kotlin'],
+        'demand_multiplier': 1.2
+    },
+    'web_frameworks': {
+        'weight': 0.95,
+        'skills': ['React', 'Angular', 'Vue.js', 'Django', 'Flask', 'FastAPI', 'Node.js', 'Express.js', 'Spring', 'ASP.NET'],
+        'demand_multiplier': 1.15
+    },
+    'data_technologies': {
+        'weight': 0.9,
+        'skills': ['pandas', 'numpy', 'scikit-learn', 'TensorFlow', 'PyTorch', 'Keras', 'Apache Spark', 'Hadoop'],
+        'demand_multiplier': 1.3
+    },
+    'cloud_platforms': {
+        'weight': 0.85,
+        'skills': ['AWS', 'Azure', 'Google Cloud', 'Kubernetes', 'Docker', 'Terraform', 'Jenkins', 'GitLab CI'],
+        'demand_multiplier': 1.25
+    },
+    'databases': {
+        'weight': 0.8,
+        'skills': ['PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'DynamoDB', 'Oracle', 'SQLite'],
+        'demand_multiplier': 1.1
+    },
+    'mobile_development': {
+        'weight': 0.75,
+        'skills': ['React Native', 'Flutter', 'Swift', 'Kotlin', 'Xamarin', 'Ionic', 'Unity'],
+        'demand_multiplier': 1.1
+    },
+    'devops_tools': {
+        'weight': 0.85,
+        'skills': ['Git', 'GitHub', 'GitLab', 'Jira', 'Confluence', 'Ansible', 'Puppet', 'Chef'],
+        'demand_multiplier': 1.2
+    },
+    'emerging_tech': {
+        'weight': 0.95,
+        'skills': ['Blockchain', 'Web3', 'AI/ML', 'IoT', 'AR/VR', 'GraphQL', 'Serverless', 'Microservices'],
+        'demand_multiplier': 1.4
+    }
+}
+
+# Advanced job archetypes with skill requirements and career paths
+JOB_ARCHETYPES = {
+    'senior_fullstack_engineer': {
+        'required_skills': ['JavaScript', 'React', 'Node.js', 'Python', 'SQL'],
+        'preferred_skills': ['TypeScript', 'AWS', 'Docker', 'GraphQL', 'Redux'],
+        'experience_range': (3, 8),
+        'salary_range': (80000, 150000),
+        'growth_potential': 0.85,
+        'keywords': ['senior full stack', 'full stack engineer', 'fullstack developer'],
+        'career_path': ['Junior Developer', 'Mid-level Developer', 'Senior Developer', 'Tech Lead', 'Engineering Manager']
+    },
+    'ml_engineer': {
+        'required_skills': ['Python', 'TensorFlow', 'PyTorch', 'scikit-learn', 'pandas'],
+        'preferred_skills': ['AWS', 'Docker', 'Kubernetes', 'MLOps', 'Apache Spark'],
+        'experience_range': (2, 6),
+        'salary_range': (90000, 170000),
+        'growth_potential': 0.95,
+        'keywords': ['machine learning engineer', 'ml engineer', 'ai engineer'],
+        'career_path': ['Data Analyst', 'ML Engineer', 'Senior ML Engineer', 'ML Architect', 'Head of AI']
+    },
+    'cloud_architect': {
+        'required_skills': ['AWS', 'Azure', 'Kubernetes', 'Docker', 'Terraform'],
+        'preferred_skills': ['Python', 'Go', 'Jenkins', 'Ansible', 'Security'],
+        'experience_range': (5, 12),
+        'salary_range': (120000, 200000),
+        'growth_potential': 0.8,
+        'keywords': ['cloud architect', 'solution architect', 'infrastructure architect'],
+        'career_path': ['DevOps Engineer', 'Cloud Engineer', 'Cloud Architect', 'Principal Architect', 'CTO']
+    },
+    'data_scientist': {
+        'required_skills': ['Python', 'R', 'SQL', 'pandas', 'numpy'],
+        'preferred_skills': ['TensorFlow', 'PyTorch', 'Tableau', 'Power BI', 'Apache Spark'],
+        'experience_range': (1, 5),
+        'salary_range': (70000, 140000),
+        'growth_potential': 0.9,
+        'keywords': ['data scientist', 'data analyst', 'research scientist'],
+        'career_path': ['Data Analyst', 'Data Scientist', 'Senior Data Scientist', 'Lead Data Scientist', 'Chief Data Officer']
+    },
+    'frontend_specialist': {
+        'required_skills': ['JavaScript', 'React', 'HTML', 'CSS', 'TypeScript'],
+        'preferred_skills': ['Next.js', 'Vue.js', 'Sass', 'Webpack', 'Jest'],
+        'experience_range': (2, 7),
+        'salary_range': (65000, 130000),
+        'growth_potential': 0.75,
+        'keywords': ['frontend developer', 'ui developer', 'react developer'],
+        'career_path': ['Junior Frontend', 'Frontend Developer', 'Senior Frontend', 'Frontend Architect', 'Head of Frontend']
+    },
+    'backend_specialist': {
+        'required_skills': ['Python', 'Java', 'SQL', 'REST API', 'Microservices'],
+        'preferred_skills': ['Django', 'Spring', 'PostgreSQL', 'Redis', 'Apache Kafka'],
+        'experience_range': (2, 8),
+        'salary_range': (70000, 140000),
+        'growth_potential': 0.8,
+        'keywords': ['backend developer', 'api developer', 'server developer'],
+        'career_path': ['Junior Backend', 'Backend Developer', 'Senior Backend', 'Backend Architect', 'Principal Engineer']
+    }
+}
+
+
+EXPERIENCE_PATTERNS = {
+    'years_experience': [
+        r'(\d+)\+?\s*years?\s*(?:of)?\s*experience',
+        r'experience\s*(?:of|:)?\s*(\d+)\+?\s*years?',
+        r'(\d+)\+?\s*years?\s*(?:in|with|of)',
+    ],
+    'seniority': {
+        'senior': r'senior|sr\.|lead|principal|staff|architect|tech lead|team lead',
+        'middle': r'mid-level|intermediate|associate|mid level',
+        'junior': r'junior|jr\.|entry|intern|graduate|trainee|junior level',
+    },
+    'leadership': [
+        r'team lead|tech lead|engineering manager|cto|vp|director|head of',
+        r'managed\s+\d+\s+(?:people|developers|engineers|team members)',
+        r'mentored|guided|supervised|coaching|leading',
+    ],
+}
+
+# Context patterns scored by AdvancedAIAnalyzer for each skill variant, with weights
+SKILL_CONTEXT_TEMPLATES = [
+    # Exact word boundary matches
+    (r'\b{skill}\b', 1.0),
+    # Technology with version numbers
+    (r'{skill}\s*(?:\d+|\d+\.\d+|v\d+)', 1.2),
+    # Technology with common suffixes
+    (r'{skill}(?:js|\.js|\.py|\.rb|\.java|\.go)?', 0.9),
+    # Technology in lists or bullets
+    (r'(?:•|[\-\*])\s*{skill}\b', 1.1),
+    # Technology with context words
+    (r'(?:using|with|in|built with|developed with|worked with|experience with|proficient in|skilled in|expert in)\s+{skill}\b', 1.3),
+    (r'{skill}\s+(?:development|programming|framework|library|database|platform|tool|stack|ecosystem)', 1.2),
+    # Years of experience patterns
+    (r'(?:\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience\s+)?(?:in\s+|with\s+)?{skill}\b', 1.5),
+    # Certification or course patterns
+    (r'(?:certified|certification|course|training|bootcamp|specialization)\s+(?:in\s+)?{skill}\b', 1.1),
+    # Project context
+    (r'(?:project|built|created|developed|implemented)\s+(?:using|with|in)\s+{skill}\b', 1.4),
+]
+
+# Patterns scored by AdvancedJobMatcher against lowercased resume text
+SKILL_CONFIDENCE_CONTEXT_TEMPLATES = [
+    r'(?:experience|expertise|proficient|skilled|worked)\s+(?:with|in)\s+{skill}',
+    r'{skill}\s+(?:development|programming|experience|expertise)',
+    r'(?:using|utilized|implemented|developed)\s+{skill}',
+    r'{skill}\s+(?:projects|applications|systems)',
+]
+SKILL_CONFIDENCE_YEARS_TEMPLATE = r'(\d+)\s*(?:\+|\-)?(?:\s*years?)\s+(?:of\s+)?(?:experience\s+)?(?:with\s+)?{skill}'
+SKILL_CONFIDENCE_PROJECT_TEMPLATE = r'(?:project|application|system|platform).*{skill}'
+
+TFIDF_PARAMS = {
+    'max_features': 5000,
+    'stop_words': 'english',
+    'ngram_range': (1, 3),
+    'min_df': 2,
+    'max_df': 0.8,
+}
+
+
+# (compiled pattern, weight) pairs plus the mention-count pattern for one skill variant
+SkillContextPatterns = Tuple[Tuple[Tuple[Pattern, float], ...], Pattern]
+# Direct-mention, context, years and project patterns for one skill
+SkillConfidencePatterns = Tuple[Pattern, Tuple[Pattern, ...], Pattern, Pattern]
+
+
+def compile_skill_context_patterns(variant: str) -> SkillContextPatterns:
+    skill = re.escape(variant)
+    patterns = tuple(
+        (re.compile(template.replace('{skill}', skill), re.IGNORECASE), weight)
+        for template, weight in SKILL_CONTEXT_TEMPLATES
+    )
+    return patterns, re.compile(rf'\b{skill}\b', re.IGNORECASE)
+
+
+def compile_skill_confidence_patterns(skill_lower: str) -> SkillConfidencePatterns:
+    skill = re.escape(skill_lower)
+    return (
+        re.compile(rf'\b{skill}\b'),
+        tuple(re.compile(template.replace('{skill}', skill)) for template in SKILL_CONFIDENCE_CONTEXT_TEMPLATES),
+        re.compile(SKILL_CONFIDENCE_YEARS_TEMPLATE.replace('{skill}', skill)),
+        re.compile(SKILL_CONFIDENCE_PROJECT_TEMPLATE.replace('{skill}', skill)),
+    )
+
+
+class MatchingModels:
+    """Compiled, read-only matching resources shared across the process"""
+
+    def __init__(self):
+        self.analyzer_skill_taxonomy = ANALYZER_SKILL_TAXONOMY
+        self.tech_stacks = TECH_STACKS
+        self.role_mappings = ROLE_MAPPINGS
+        self.matcher_skill_taxonomy = MATCHER_SKILL_TAXONOMY
+        self.job_archetypes = JOB_ARCHETYPES
+
+        self.experience_patterns = {
+            'years_experience': [re.compile(p, re.IGNORECASE) for p in EXPERIENCE_PATTERNS['years_experience']],
+            'seniority': {level: re.compile(p, re.IGNORECASE) for level, p in EXPERIENCE_PATTERNS['seniority'].items()},
+            'leadership': [re.compile(p, re.IGNORECASE) for p in EXPERIENCE_PATTERNS['leadership']],
+        }
+
+        # (category, skill, category weight, lowercased variants incl. aliases)
+        self.analyzer_skills: List[Tuple[str, str, float, Tuple[str, ...]]] = []
+        self.skill_context_patterns: Dict[str, SkillContextPatterns] = {}
+        for category, category_data in ANALYZER_SKILL_TAXONOMY.items():
+            aliases = category_data.get('aliases', {})
+            for skill in category_data['skills']:
+                variants = (skill.lower(),) + tuple(alias.lower() for alias, target in aliases.items() if target == skill)
+                self.analyzer_skills.append((category, skill, category_data['weight'], variants))
+                for variant in variants:
+                    if variant not in self.skill_context_patterns:
+                        self.skill_context_patterns[variant] = compile_skill_context_patterns(variant)
+
+        self.skill_confidence_patterns: Dict[str, SkillConfidencePatterns] = {
+            skill.lower(): compile_skill_confidence_patterns(skill.lower())
+            for category_data in MATCHER_SKILL_TAXONOMY.values()
+            for skill in category_data['skills']
+        }
+
+        # (archetype, keywords, required skills, preferred skills), skills lowercased
+        self.archetype_matchers: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]], ...] = tuple(
+            (
+                archetype,
+                tuple(config['keywords']),
+                tuple(skill.lower() for skill in config['required_skills']),
+                tuple(skill.lower() for skill in config['preferred_skills']),
+            )
+            for archetype, config in JOB_ARCHETYPES.items()
+        )
+
+        self._tfidf_prototype = TfidfVectorizer(**TFIDF_PARAMS)
+
+    def context_patterns_for(self, variant: str) -> SkillContextPatterns:
+        patterns = self.skill_context_patterns.get(variant)
+        return patterns if patterns is not None else compile_skill_context_patterns(variant)
+
+    def confidence_patterns_for(self, skill_lower: str) -> SkillConfidencePatterns:
+        patterns = self.skill_confidence_patterns.get(skill_lower)
+        return patterns if patterns is not None else compile_skill_confidence_patterns(skill_lower)
+
+    def new_vectorizer(self) -> TfidfVectorizer:
+        """Unfitted copy of the configured TF-IDF vectorizer"""
+        return clone(self._tfidf_prototype)
+
+
+_models: Optional[MatchingModels] = None
+_models_lock = threading.Lock()
+
+
+def get_matching_models() -> MatchingModels:
+    """Load the registry on first use; every later call returns the same object"""
+    global _models
+    if _models is None:
+        with _models_lock:
+            if _models is None:
+                _models = MatchingModels()
+    return _models
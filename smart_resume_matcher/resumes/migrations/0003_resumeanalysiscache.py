@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0002_resume_error_message_resume_error_type_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeAnalysisCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('prompt_version', models.CharField(max_length=50)),
+                ('model_name', models.CharField(max_length=100)),
+                ('result', models.JSONField(default=dict)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('last_hit_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Resume Analysis Cache Entry',
+                'verbose_name_plural': 'Resume Analysis Cache',
+                'ordering': ['-created_at'],
+                'unique_together': {('content_hash', 'prompt_version', 'model_name')},
+            },
+        ),
+    ]
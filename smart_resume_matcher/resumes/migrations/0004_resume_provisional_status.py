@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0003_resumeanalysiscache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='resume',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending Analysis'), ('processing', 'Processing'), ('provisional', 'Provisional Analysis'), ('completed', 'Analysis Completed'), ('completed_with_warnings', 'Completed with Warnings'), ('failed', 'Analysis Failed')], default='pending', max_length=30),
+        ),
+    ]
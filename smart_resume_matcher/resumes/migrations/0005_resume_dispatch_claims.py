@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0004_resume_provisional_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='analysis_dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='enrichment_dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='matching_dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -12,10 +12,13 @@ class Resume(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending Analysis'),
         ('processing', 'Processing'),
+        ('provisional', 'Provisional Analysis'),
         ('completed', 'Analysis Completed'),
         ('completed_with_warnings', 'Completed with Warnings'),
         ('failed', 'Analysis Failed'),
     ]
+    # Statuses with a usable analysis; provisional ones are refined in the background
+    ANALYZED_STATUSES = ('completed', 'completed_with_warnings', 'provisional')
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resumes')
     file = models.FileField(
@@ -29,6 +32,10 @@ class Resume(models.Model):
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='pending')
     analysis_started_at = models.DateTimeField(null=True, blank=True)
     analysis_completed_at = models.DateTimeField(null=True, blank=True)
+    # Set while a Celery task of that kind is queued or running (resumes.dispatcher)
+    analysis_dispatched_at = models.DateTimeField(null=True, blank=True)
+    enrichment_dispatched_at = models.DateTimeField(null=True, blank=True)
+    matching_dispatched_at = models.DateTimeField(null=True, blank=True)
     
     # Error handling
     has_extraction_issues = models.BooleanField(default=False)
@@ -62,6 +69,10 @@ class Resume(models.Model):
         verbose_name = 'Resume'
         verbose_name_plural = 'Resumes'
         
+    @property
+    def is_analyzed(self):
+        return self.status in self.ANALYZED_STATUSES
+
     def __str__(self):
         user_email = getattr(self.user, 'email', str(self.user))
         return f"{user_email} - {self.original_filename}"
@@ -78,4 +89,31 @@ class Resume(models.Model):
     def analysis_duration(self):
         if self.analysis_started_at and self.analysis_completed_at:
             return self.analysis_completed_at - self.analysis_started_at
-        return None
\ No newline at end of file
+        return None
+
+class ResumeAnalysisCache(models.Model):
+    """
+    Durable store of LLM resume analyses keyed by normalized resume content.
+    Shared by all processes so identical resumes are only analyzed once.
+    """
+    content_hash = models.CharField(max_length=64)
+    prompt_version = models.CharField(max_length=50)
+    model_name = models.CharField(max_length=100)
+    
+    # Serialized ResumeAnalysis fields
+    result = models.JSONField(default=dict)
+    
+    # Hit tracking
+    hit_count = models.PositiveIntegerField(default=0)
+    last_hit_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Resume Analysis Cache Entry'
+        verbose_name_plural = 'Resume Analysis Cache'
+        unique_together = ('content_hash', 'prompt_version', 'model_name')
+    
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.model_name}, {self.prompt_version})"
@@ -0,0 +1,170 @@
+"""
+Progress events for resume analysis and job matching.
+
+The pipeline publishes stage events per resume into the Django cache (Redis
+when REDIS_URL is configured, so web and worker processes share them). Each
+event gets a sequence number from an atomic cache counter and is stored under
+its own key; the SSE endpoint reads new events by sequence number, so a
+reconnecting client can resume from its Last-Event-ID.
+
+A per-process cache (LocMem) only works while the process serving the stream
+is the one publishing: no broker and a single web worker. Otherwise
+progress_shared() is false, the stream endpoint refuses, and clients poll
+resume_status_api instead.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROGRESS_TTL = 60 * 60
+DEFAULT_STREAM_TIMEOUT = 5 * 60
+
+# Seconds between cache reads while streaming, and between keepalive comments
+POLL_INTERVAL = 0.5
+KEEPALIVE_INTERVAL = 15
+STREAM_RETRY_MS = 3000
+
+# Pipeline stages, in the order they are normally published
+STAGES = [
+    'uploaded',
+    'extracted',
+    'analyzed',
+    'jobs_scored',
+    'matches_saved',
+    'enriched',
+    'completed',
+    'failed',
+]
+
+# The stream closes after one of these
+TERMINAL_STAGES = {'completed', 'failed'}
+
+
+def _seq_key(resume_id: int) -> str:
+    return f"resume_progress_{resume_id}_seq"
+
+
+def _event_key(resume_id: int, seq: int) -> str:
+    return f"resume_progress_{resume_id}_{seq}"
+
+
+# Cache backends whose entries other processes cannot see
+_PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def progress_shared() -> bool:
+    """Whether every event reaches whichever process serves the stream"""
+    from .dispatcher import broker_configured
+
+    if settings.CACHES['default']['BACKEND'] not in _PROCESS_LOCAL_BACKENDS:
+        return True
+    return not broker_configured() and getattr(settings, 'WEB_CONCURRENCY', 1) <= 1
+
+
+def _ttl() -> int:
+    return getattr(settings, 'RESUME_PROGRESS_TTL', DEFAULT_PROGRESS_TTL)
+
+
+def publish_progress(resume_id: int, stage: str, **data) -> None:
+    """Publish a stage event for a resume. Never raises."""
+    try:
+        seq_key = _seq_key(resume_id)
+        cache.add(seq_key, 0, _ttl())
+        try:
+            seq = cache.incr(seq_key)
+        except ValueError:
+            # Counter expired between add() and incr()
+            cache.set(seq_key, 1, _ttl())
+            seq = 1
+
+        cache.set(_event_key(resume_id, seq), {
+            'seq': seq,
+            'stage': stage,
+            'timestamp': time.time(),
+            'data': data,
+        }, _ttl())
+    except Exception as e:
+        logger.warning(f"Failed to publish progress for resume {resume_id}: {e}")
+
+
+def current_seq(resume_id: int) -> int:
+    """Sequence number of the latest published event (0 if none)"""
+    return cache.get(_seq_key(resume_id)) or 0
+
+
+def read_events(resume_id: int, since: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Events published after sequence number `since`, oldest first.
+    Returns (events, last_seq).
+    """
+    latest = current_seq(resume_id)
+    if latest <= since:
+        return [], since
+
+    keys = [_event_key(resume_id, seq) for seq in range(since + 1, latest + 1)]
+    found = cache.get_many(keys)
+    events = [found[key] for key in keys if key in found]
+    return events, latest
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Serialize an event in text/event-stream format"""
+    payload = json.dumps({'stage': event['stage'], 'timestamp': event['timestamp'], **event['data']})
+    return f"id: {event['seq']}\nevent: {event['stage']}\ndata: {payload}\n\n"
+
+
+def stream_events(resume_id: int, since: int = 0, until: str = 'completed') -> Iterator[str]:
+    """
+    Blocking SSE generator (WSGI). Ends after the `until` stage or 'failed',
+    or after RESUME_PROGRESS_STREAM_TIMEOUT seconds.
+    """
+    terminal = {until, 'failed'}
+    deadline = time.monotonic() + getattr(settings, 'RESUME_PROGRESS_STREAM_TIMEOUT', DEFAULT_STREAM_TIMEOUT)
+    last_sent = time.monotonic()
+
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        events, since = read_events(resume_id, since)
+        for event in events:
+            yield format_sse(event)
+            if event['stage'] in terminal:
+                return
+        if events:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent > KEEPALIVE_INTERVAL:
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+        time.sleep(POLL_INTERVAL)
+
+
+async def astream_events(resume_id: int, since: int = 0, until: str = 'completed') -> AsyncIterator[str]:
+    """Async version of stream_events for ASGI; does not hold a thread while idle"""
+    terminal = {until, 'failed'}
+    deadline = time.monotonic() + getattr(settings, 'RESUME_PROGRESS_STREAM_TIMEOUT', DEFAULT_STREAM_TIMEOUT)
+    last_sent = time.monotonic()
+
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        events, since = await sync_to_async(read_events)(resume_id, since)
+        for event in events:
+            yield format_sse(event)
+            if event['stage'] in terminal:
+                return
+        if events:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent > KEEPALIVE_INTERVAL:
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(POLL_INTERVAL)
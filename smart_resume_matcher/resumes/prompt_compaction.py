@@ -0,0 +1,212 @@
+"""
+Prompt compaction for LLM resume analysis.
+
+Extracted resume text carries a lot of noise from PDFProcessor: "--- Page N ---"
+markers, pipe-joined table dumps and, for scanned files, the whole document a
+second time after "--- OCR Enhancement ---". This module strips that noise,
+splits the text into sections and keeps only a token budget's worth of the
+highest-priority sections before the text is pasted into a prompt.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 1500
+
+# Rough average for mixed English/Russian resume text
+CHARS_PER_TOKEN = 4
+
+# Lower number = kept first when the budget is tight
+SECTION_PRIORITIES = {
+    'skills': 1,
+    'experience': 2,
+    'summary': 3,
+    'projects': 4,
+    'education': 5,
+    'certifications': 6,
+    'other': 7,
+}
+
+SECTION_HEADINGS = {
+    'skills': [
+        'skills', 'technical skills', 'core skills', 'key skills', 'technologies',
+        'tech stack', 'competencies', 'core competencies', 'навыки', 'ключевые навыки',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history', 'опыт работы', 'опыт',
+    ],
+    'education': [
+        'education', 'academic background', 'qualifications', 'образование',
+    ],
+    'summary': [
+        'summary', 'profile', 'professional summary', 'about me', 'about', 'objective',
+        'career objective', 'о себе',
+    ],
+    'projects': [
+        'projects', 'personal projects', 'key projects', 'проекты',
+    ],
+    'certifications': [
+        'certifications', 'certificates', 'courses', 'training', 'licenses', 'сертификаты', 'курсы',
+    ],
+}
+
+_PAGE_MARKER_RE = re.compile(r'^-{2,}\s*Page\s+\d+(?:\s*\(OCR\))?\s*-{2,}$', re.IGNORECASE)
+_OCR_MARKER_RE = re.compile(r'^-{2,}\s*OCR Enhancement\s*-{2,}$', re.IGNORECASE)
+_TABLE_LABEL_RE = re.compile(r'^Table:$', re.IGNORECASE)
+_PIPE_RE = re.compile(r'\s*\|\s*')
+_HEADING_LOOKUP = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+
+@dataclass
+class CompactionResult:
+    """Compacted prompt text plus size statistics"""
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    sections_included: List[str] = field(default_factory=list)
+    sections_dropped: List[str] = field(default_factory=list)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Compacted size as a fraction of the original (lower is smaller)"""
+        if not self.original_tokens:
+            return 1.0
+        return self.compacted_tokens / self.original_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clean_extraction_noise(text: str) -> List[str]:
+    """
+    Strip page/OCR markers, collapse table pipes and drop repeated lines.
+    Returns the surviving lines in document order.
+    """
+    seen = set()
+    lines = []
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if _PAGE_MARKER_RE.match(line) or _OCR_MARKER_RE.match(line) or _TABLE_LABEL_RE.match(line):
+            continue
+
+        if '|' in line:
+            cells = [cell for cell in _PIPE_RE.split(line) if cell]
+            line = ', '.join(cells)
+            if not line:
+                continue
+
+        line = ' '.join(line.split())
+
+        # OCR enhancement repeats the whole document; keep the first copy only
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    return lines
+
+
+def _match_heading(line: str) -> str:
+    """Return the section name if the line is a section heading, else ''"""
+    if len(line) > 40:
+        return ''
+    candidate = line.rstrip(':').strip().lower()
+    return _HEADING_LOOKUP.get(candidate, '')
+
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """Group lines into (section, lines) blocks in document order"""
+    sections: List[Tuple[str, List[str]]] = []
+    current_name = 'other'
+    current_lines: List[str] = []
+
+    for line in lines:
+        heading = _match_heading(line)
+        if heading:
+            if current_lines:
+                sections.append((current_name, current_lines))
+            current_name = heading
+            current_lines = []
+            continue
+        current_lines.append(line)
+
+    if current_lines:
+        sections.append((current_name, current_lines))
+
+    return sections
+
+
+def compact_resume_text(text: str, token_budget: int = None) -> CompactionResult:
+    """
+    Compact extracted resume text for an LLM prompt.
+
+    Sections are admitted in SECTION_PRIORITIES order until the token budget is
+    spent; the section that crosses the budget is truncated at a line boundary.
+    """
+    if token_budget is None:
+        token_budget = getattr(settings, 'RESUME_PROMPT_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+
+    original_tokens = estimate_tokens(text or '')
+    sections = split_sections(clean_extraction_noise(text or ''))
+
+    # Merge repeated headings (e.g. "Experience" on two pages) into one block
+    merged: Dict[str, List[str]] = {}
+    for name, lines in sections:
+        merged.setdefault(name, []).extend(lines)
+
+    remaining = token_budget
+    included: List[str] = []
+    dropped: List[str] = []
+    blocks: List[str] = []
+
+    for name in sorted(merged, key=lambda n: SECTION_PRIORITIES.get(n, len(SECTION_PRIORITIES))):
+        header = f"{name.upper()}:"
+        kept = []
+        cost = estimate_tokens(header) + 1
+
+        for line in merged[name]:
+            line_cost = estimate_tokens(line) + 1
+            if cost + line_cost > remaining:
+                break
+            kept.append(line)
+            cost += line_cost
+
+        if not kept:
+            dropped.append(name)
+            continue
+
+        blocks.append('\n'.join([header] + kept))
+        included.append(name)
+        remaining -= cost
+
+    compacted = '\n\n'.join(blocks)
+    result = CompactionResult(
+        text=compacted,
+        original_tokens=original_tokens,
+        compacted_tokens=estimate_tokens(compacted),
+        sections_included=included,
+        sections_dropped=dropped,
+    )
+
+    logger.info(
+        f"Compacted resume prompt from ~{result.original_tokens} to ~{result.compacted_tokens} tokens "
+        f"(ratio {result.compression_ratio:.2f}, dropped: {', '.join(dropped) or 'none'})"
+    )
+    return result
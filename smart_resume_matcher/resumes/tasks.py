@@ -76,3 +76,56 @@ def analyze_resume_task(self, resume_id):
             raise self.retry(countdown=60 * (2 ** self.request.retries), exc=exc)
 
         return {'status': 'error', 'message': str(exc)}
+
+
+@shared_task
+def run_resume_analysis_task(resume_id):
+    """Run the full resume analysis pipeline dispatched by resumes.dispatcher"""
+    from .dispatcher import release_dispatch_lock
+    from .views import analyze_resume
+
+    try:
+        return analyze_resume(resume_id)
+    finally:
+        release_dispatch_lock('analysis', resume_id)
+
+
+@shared_task
+def enrich_resume_analysis_task(resume_id):
+    """Run LLM enrichment of a provisional analysis dispatched by resumes.dispatcher"""
+    from .dispatcher import release_dispatch_lock
+    from .views import enrich_resume_analysis
+
+    try:
+        return enrich_resume_analysis(resume_id)
+    finally:
+        release_dispatch_lock('enrichment', resume_id)
+
+
+@shared_task
+def finalize_stale_provisional_task():
+    """Promote provisional analyses whose enrichment missed RESUME_PROVISIONAL_DEADLINE"""
+    from .views import finalize_stale_provisional_analyses
+
+    return {'status': 'success', 'promoted': finalize_stale_provisional_analyses()}
+
+
+@shared_task
+def rematch_resume_jobs_task(resume_id, changed_skills=None):
+    """Re-match a resume against stored jobs after its analysis changed"""
+    from .views import rematch_resume_jobs
+
+    rematch_resume_jobs(resume_id, changed_skills)
+    return {'status': 'success', 'resume_id': resume_id}
+
+
+@shared_task
+def generate_job_matches_task(resume_id):
+    """Generate enhanced job matches dispatched by resumes.dispatcher"""
+    from .dispatcher import release_dispatch_lock
+    from .views import generate_job_matches
+
+    try:
+        generate_job_matches(resume_id)
+    finally:
+        release_dispatch_lock('matching', resume_id)
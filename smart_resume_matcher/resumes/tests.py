@@ -1,3 +1,402 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
 
-# Create your tests here.
+from core.testing import LOCMEM_CACHES
+from resumes.analysis_store import get_cached_analysis, resume_content_hash, store_analysis
+
+
+class _ScoreFromText:
+    """Matcher stand-in scoring a job by the number in its text; pickles like a real one"""
+
+    def score_job_text(self, job_text, resume_analysis, prune_below=None):
+        score = float(job_text)
+        if prune_below is not None and score < prune_below:
+            return None
+        return {'match_score': score, 'confidence_level': 'high' if score >= 80 else 'medium'}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AnalysisStoreTests(TestCase):
+    """Analyses are stored once per normalized content and their hit rate is visible to staff"""
+
+    def test_hits_are_reported_to_staff(self):
+        content_hash = resume_content_hash('Python  developer\n')
+        self.assertEqual(content_hash, resume_content_hash('Python developer'))
+        self.assertIsNone(get_cached_analysis(content_hash, 'model'))
+
+        store_analysis(content_hash, 'model', {'skills': ['python']})
+        self.assertEqual(get_cached_analysis(content_hash, 'model'), {'skills': ['python']})
+
+        staff = get_user_model().objects.create_user(
+            username='staff', email='staff@example.com', password='secret-pass-123', is_staff=True
+        )
+        self.client.force_login(staff)
+        stats = self.client.get(reverse('api_analysis_store_stats')).json()['analysis_store']
+        self.assertEqual((stats['entries'], stats['hits'], stats['hit_rate']), (1, 1, 0.5))
+
+    def test_compaction_budget_is_part_of_the_key(self):
+        content_hash = resume_content_hash('Python developer')
+        store_analysis(content_hash, 'model', {'skills': ['python']})
+
+        with override_settings(RESUME_PROMPT_TOKEN_BUDGET=500):
+            self.assertIsNone(get_cached_analysis(content_hash, 'model'))
+
+    def test_stats_are_staff_only(self):
+        user = get_user_model().objects.create_user(
+            username='user', email='user@example.com', password='secret-pass-123'
+        )
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse('api_analysis_store_stats')).status_code, 403)
+
+
+class PartialRematchTests(TestCase):
+    """Re-matching after enrichment must reach every job whose score can change"""
+
+    def test_hyphenated_and_joined_spellings_are_found(self):
+        from jobs.models import Job
+        from resumes.views import _jobs_mentioning_skills
+
+        for i, text in enumerate(['Machine-learning engineer', 'machinelearning', 'Machine learning', 'Cooking']):
+            Job.objects.create(hh_id=f'hh-{i}', title='Engineer', company_name='Acme',
+                               description=text, location='Almaty')
+
+        found = _jobs_mentioning_skills(['machine learning'])
+        self.assertEqual(sorted(found.values_list('hh_id', flat=True)), ['hh-0', 'hh-1', 'hh-2'])
+
+    def test_titles_and_skill_links_are_found(self):
+        from jobs.models import Job, JobSkill, Skill
+        from resumes.views import _jobs_mentioning_skills
+
+        titled = Job.objects.create(hh_id='hh-title', title='Kotlin developer', company_name='Acme',
+                                    description='Mobile apps', location='Almaty')
+        linked = Job.objects.create(hh_id='hh-linked', title='Engineer', company_name='Acme',
+                                    description='Android', location='Almaty')
+        JobSkill.objects.create(job=linked, skill=Skill.objects.create(name='kotlin', display_name='Kotlin'))
+        Job.objects.create(hh_id='hh-closed', title='Kotlin developer', company_name='Acme',
+                           description='Closed', location='Almaty', is_active=False)
+
+        found = _jobs_mentioning_skills(['Kotlin'])
+        self.assertEqual(sorted(found.values_list('id', flat=True)), [titled.id, linked.id])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProvisionalAnalysisTests(TestCase):
+    """Provisional analyses count as analyzed and are promoted if enrichment never finishes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        from resumes.models import Resume
+
+        cls.user = get_user_model().objects.create_user(
+            username='provisional', email='provisional@example.com', password='secret-pass-123'
+        )
+        cls.resume = Resume.objects.create(user=cls.user, original_filename='cv.pdf', status='provisional',
+                                           analysis_completed_at=timezone.now())
+
+    def test_provisional_resume_is_used(self):
+        from accounts.serializers import UserProfileSerializer
+        from jobs.tasks import weekly_job_search_pairs
+
+        self.assertEqual(UserProfileSerializer(self.user).data['latest_resume']['id'], self.resume.id)
+        self.assertEqual(list(weekly_job_search_pairs()), [(self.user.id, self.resume.id)])
+
+    def test_stale_provisional_is_promoted_on_poll(self):
+        from datetime import timedelta
+
+        from accounts.serializers import CustomTokenObtainPairSerializer
+        from resumes.models import Resume
+        from resumes.views import finalize_stale_provisional_analyses
+
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        url = reverse('api_resume_status', args=[self.resume.id])
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}').json()['status'], 'provisional')
+        self.assertEqual(finalize_stale_provisional_analyses(), 0)
+
+        Resume.objects.filter(id=self.resume.id).update(analysis_completed_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}').json()['status'], 'completed')
+        self.assertEqual(finalize_stale_provisional_analyses(), 0)
+
+
+@override_settings(CELERY_BROKER_URL='memory://', CACHES=LOCMEM_CACHES)
+class BrokerDispatchTests(TestCase):
+    """With a broker, a resume's task is enqueued once until the task releases its claim"""
+
+    def test_second_dispatch_is_skipped_until_released(self):
+        from unittest import mock
+
+        from resumes.dispatcher import dispatch_resume_analysis, release_dispatch_lock
+        from resumes.models import Resume
+
+        user = get_user_model().objects.create_user(
+            username='uploader', email='uploader@example.com', password='secret-pass-123'
+        )
+        resume = Resume.objects.create(user=user, original_filename='cv.pdf')
+
+        with mock.patch('config.celery.app.send_task') as send_task:
+            self.assertTrue(dispatch_resume_analysis(resume.id))
+            self.assertFalse(dispatch_resume_analysis(resume.id))
+            release_dispatch_lock('analysis', resume.id)
+            self.assertTrue(dispatch_resume_analysis(resume.id))
+
+        self.assertEqual(send_task.call_count, 2)
+
+    @override_settings(RESUME_ANALYSIS_QUEUE_LIMIT=2)
+    def test_abandoned_pending_uploads_do_not_fill_the_queue(self):
+        from datetime import timedelta
+        from unittest import mock
+
+        from resumes.dispatcher import dispatch_resume_analysis, get_queue_position, has_capacity
+        from resumes.models import Resume
+
+        user = get_user_model().objects.create_user(
+            username='crowd', email='crowd@example.com', password='secret-pass-123'
+        )
+        # Crashed uploads: pending forever, never or long ago dispatched
+        Resume.objects.create(user=user, original_filename='lost.pdf')
+        Resume.objects.create(user=user, original_filename='crashed.pdf',
+                              analysis_dispatched_at=timezone.now() - timedelta(days=1))
+        self.assertTrue(has_capacity())
+
+        queued = [Resume.objects.create(user=user, original_filename=f'cv-{i}.pdf') for i in range(2)]
+        with mock.patch('config.celery.app.send_task'):
+            for resume in queued:
+                dispatch_resume_analysis(resume.id)
+        self.assertFalse(has_capacity())
+
+        positions = [get_queue_position(Resume.objects.get(id=resume.id)) for resume in queued]
+        self.assertEqual(positions, [1, 2])
+        self.assertIsNone(get_queue_position(Resume.objects.get(original_filename='lost.pdf')))
+
+
+@override_settings(CELERY_BROKER_URL='memory://', CACHES=LOCMEM_CACHES)
+class ProgressFallbackTests(TestCase):
+    """Without a shared cache, progress is not streamed from other processes; clients poll status"""
+
+    def test_stream_is_refused_and_status_reports_matching(self):
+        from accounts.serializers import CustomTokenObtainPairSerializer
+        from resumes.checks import check_progress_cache
+        from resumes.models import Resume
+
+        self.assertEqual([warning.id for warning in check_progress_cache(None)], ['resumes.W001'])
+
+        user = get_user_model().objects.create_user(
+            username='watcher', email='watcher@example.com', password='secret-pass-123'
+        )
+        resume = Resume.objects.create(user=user, original_filename='cv.pdf')
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('api_resume_progress', args=[resume.id]))
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(response.json()['poll'])
+
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        status = self.client.get(
+            reverse('api_resume_status', args=[resume.id]), HTTP_AUTHORIZATION=f'Bearer {token}'
+        ).json()
+        self.assertEqual((status['job_matches_count'], status['matching_pending']), (0, False))
+
+        Resume.objects.filter(id=resume.id).update(matching_dispatched_at='2026-01-01T00:00:00Z')
+        status = self.client.get(
+            reverse('api_resume_status', args=[resume.id]), HTTP_AUTHORIZATION=f'Bearer {token}'
+        ).json()
+        self.assertTrue(status['matching_pending'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MatchInsightsTests(TestCase):
+    """Match insights are built on demand and follow the resume analysis they describe"""
+
+    ANALYSIS = {'skills_with_confidence': {'programming': [
+        {'skill': 'Python', 'confidence': 0.9, 'demand_multiplier': 1.2},
+    ]}}
+
+    @classmethod
+    def setUpTestData(cls):
+        from jobs.models import Job
+        from resumes.models import Resume
+
+        cls.user = get_user_model().objects.create_user(
+            username='learner', email='learner@example.com', password='secret-pass-123'
+        )
+        cls.resume = Resume.objects.create(user=cls.user, original_filename='cv.pdf', raw_text='Python developer')
+        cls.job = Job.objects.create(hh_id='hh-insights', title='Backend developer', company_name='Acme',
+                                     description='Python, Django and PostgreSQL', location='Almaty')
+
+    def test_re_analysis_rebuilds_insights(self):
+        from unittest import mock
+
+        from resumes.enhanced_job_matcher import AdvancedJobMatcher
+
+        matcher = AdvancedJobMatcher(self.user, self.resume)
+        analysis = {'skills_with_confidence': {'programming': [
+            {'skill': 'Go', 'confidence': 0.9, 'demand_multiplier': 1.2},
+        ]}}
+        reanalyzed = {'skills_with_confidence': {'programming': [
+            *analysis['skills_with_confidence']['programming'],
+            {'skill': 'Django', 'confidence': 0.8, 'demand_multiplier': 1.1},
+        ]}}
+
+        with mock.patch.object(matcher, '_generate_match_insights', wraps=matcher._generate_match_insights) as generate:
+            first = matcher.get_match_insights(self.job, analysis)
+            self.assertIs(matcher.get_match_insights(self.job, analysis), first)
+            self.assertEqual(generate.call_count, 1)
+
+            matcher.get_match_insights(self.job, reanalyzed)
+            self.assertEqual(generate.call_count, 2)
+
+    def test_detail_api_builds_insights_from_the_stored_analysis(self):
+        import json
+        from unittest import mock
+
+        from jobs.models import JobMatch
+        from resumes.models import Resume
+
+        self.client.force_login(self.user)
+        url = reverse('api_job_match_insights', args=[self.job.id])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        JobMatch.objects.create(user=self.user, job=self.job, resume=self.resume, match_score=70,
+                                match_details={'skill_alignment': 60.0})
+        self.assertEqual(self.client.get(url).status_code, 409)
+
+        Resume.objects.filter(id=self.resume.id).update(
+            analysis_summary=json.dumps({'extracted_skills': ['Python']})
+        )
+        updated_at = Resume.objects.get(id=self.resume.id).updated_at
+        with mock.patch('resumes.enhanced_job_matcher.AdvancedJobMatcher.analyze_resume_advanced') as analyze:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('learning_path', response.json()['insights'])
+        analyze.assert_not_called()
+        self.assertEqual(Resume.objects.get(id=self.resume.id).updated_at, updated_at)
+
+
+class MatchScoringTests(TestCase):
+    """Chunked and pooled scoring keep the same top k as one serial pass"""
+
+    # Every score appears twice, so ties are broken by original order
+    CANDIDATES = [(f'job-{i}', str((i * 37) % 100)) for i in range(200)]
+
+    def _score(self, **kwargs):
+        from resumes.match_scoring import score_candidates
+        recorded = {}
+        top = score_candidates(_ScoreFromText(), self.CANDIDATES, {}, 15,
+                               record=lambda job_id, result: recorded.setdefault(job_id, result), **kwargs)
+        return [job_id for job_id, _ in top], recorded
+
+    def test_chunked_pool_merge_matches_serial(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest import mock
+
+        serial, _ = self._score(workers=1, chunk_size=1000)
+        self.assertEqual(serial[:2], ['job-27', 'job-127'])
+
+        self.assertEqual(self._score(workers=1, chunk_size=7)[0], serial)
+
+        with ThreadPoolExecutor(max_workers=3) as pool, \
+                mock.patch('resumes.match_scoring._get_pool', return_value=pool):
+            pooled, recorded = self._score(workers=3, chunk_size=7)
+        self.assertEqual(pooled, serial)
+        self.assertTrue(set(serial) <= set(recorded))
+
+    def test_known_results_seed_the_top_k(self):
+        known = {'job-0': {'match_score': 99.5, 'confidence_level': 'high'}}
+        top, recorded = self._score(workers=1, chunk_size=7, known=known)
+        self.assertEqual(top[0], 'job-0')
+        self.assertNotIn('job-0', recorded)
+
+    def test_broken_pool_falls_back_to_serial(self):
+        from unittest import mock
+
+        serial, _ = self._score(workers=1)
+        with mock.patch('resumes.match_scoring._get_pool', side_effect=OSError('no processes')):
+            self.assertEqual(self._score(workers=3, chunk_size=7)[0], serial)
+
+
+class PrunedScoringTests(TestCase):
+    """Pruning against the running k-th score never changes the top k"""
+
+    RESUME = ('Senior Python developer: Django, FastAPI, PostgreSQL, Docker, Kubernetes, AWS. '
+              '6 years of experience building REST APIs and machine learning pipelines with pandas.')
+    JOBS = [
+        'Senior Python developer, Django and PostgreSQL, REST APIs',
+        'Frontend engineer: React, TypeScript, CSS',
+        'Data scientist with Python, pandas, machine learning',
+        'DevOps engineer: Docker, Kubernetes, AWS, Terraform',
+        'Java backend developer, Spring Boot, Kafka',
+        'Accountant, 1C, financial reporting',
+        'Python FastAPI developer, Docker, async',
+        'Sales manager, B2B, CRM',
+        'Machine learning engineer, PyTorch, Python, AWS',
+        'iOS developer, Swift, UIKit',
+        'Full stack developer: Django, React, PostgreSQL',
+        'QA engineer, Selenium, Python test automation',
+    ]
+
+    def test_pruned_top_k_equals_unpruned(self):
+        from unittest import mock
+
+        from resumes.enhanced_job_matcher import AdvancedJobMatcher
+        from resumes.match_scoring import _rank_key, score_candidates
+
+        matcher = AdvancedJobMatcher(None, None)
+        text = self.RESUME.lower()
+        analysis = {
+            'raw_text': self.RESUME,
+            'skills_with_confidence': {'programming_languages': [
+                {'skill': skill, 'confidence': 0.9, 'demand_multiplier': 1.2}
+                for skill in ('Python', 'Django', 'Docker', 'PostgreSQL')
+            ]},
+            'experience_depth': matcher._analyze_experience_depth(text),
+            'domain_expertise': matcher._identify_domain_expertise(text),
+        }
+        candidates = [(index, job.lower()) for index, job in enumerate(self.JOBS)]
+
+        unpruned = sorted(
+            ((index, job_id, matcher.score_job_text(job_text, analysis)) for index, (job_id, job_text) in enumerate(candidates)),
+            key=_rank_key, reverse=True,
+        )
+        expected = [job_id for _, job_id, result in unpruned if result['match_score'] > 0][:4]
+
+        with mock.patch.object(matcher, '_semantic_similarity', wraps=matcher._semantic_similarity) as semantic:
+            pruned = score_candidates(matcher, candidates, analysis, 4, min_score=0, workers=1, chunk_size=3)
+        self.assertEqual([job_id for job_id, _ in pruned], expected)
+        # Jobs that could not reach the top 4 skipped the TF-IDF stage
+        self.assertLess(semantic.call_count, len(self.JOBS))
+
+        # The bound's market alignment was computed once for the run
+        with mock.patch.object(matcher, '_calculate_market_alignment') as alignment:
+            matcher._max_market_alignment(analysis)
+        alignment.assert_not_called()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProgressReplayTests(TestCase):
+    """Reconnecting after the events expired still reports how the analysis ended"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def _stages_after_connect(self, status):
+        from resumes.models import Resume
+        from resumes.progress import read_events
+
+        user = get_user_model().objects.create_user(
+            username=f'replay-{status}', email=f'replay-{status}@example.com', password='secret-pass-123'
+        )
+        resume = Resume.objects.create(user=user, original_filename='cv.pdf', status=status,
+                                       extracted_skills=['python'])
+        self.client.force_login(user)
+        response = self.client.get(reverse('api_resume_progress', args=[resume.id]))
+        self.assertEqual(response.status_code, 200)
+        return [event['stage'] for event in read_events(resume.id)[0]]
+
+    def test_outcomes_are_replayed(self):
+        self.assertEqual(self._stages_after_connect('provisional'), ['analyzed'])
+        self.assertEqual(self._stages_after_connect('completed_with_warnings'), ['analyzed', 'completed'])
+        self.assertEqual(self._stages_after_connect('failed'), ['failed'])
+        self.assertEqual(self._stages_after_connect('processing'), [])
@@ -5,9 +5,12 @@ import os
 from django.conf import settings
 from typing import Dict, Any
 from .universal_skills import get_all_skills
+from .prompt_compaction import compact_resume_text
+from core.request_timing import LLM, PDF, stage
 
 class PDFProcessor:
     @staticmethod
+    @stage(PDF)
     def extract_text_from_pdf(file_path: str) -> str:
         """
         Enhanced PDF text extraction using multiple methods with improved error handling
@@ -271,13 +274,16 @@ class AIAnalyzer:
             logger.info("Using local resume analysis (AI not configured)")
             return self._fallback_analysis(resume_text, "AI analysis not enabled")
         
+        # Strip extraction noise and keep only the budgeted, highest-priority sections
+        compacted = compact_resume_text(resume_text)
+        
         prompt = f"""
         Analyze the following resume and extract structured information in JSON format.
         This resume could be from ANY profession including healthcare, legal, education, finance, marketing, 
         sales, operations, customer service, creative fields, research, or technology.
 
         Resume Text:
-        {resume_text}
+        {compacted.text}
 
         Please extract and return ONLY a valid JSON object with these fields:
         {{
@@ -344,7 +350,8 @@ class AIAnalyzer:
         
         ai_response = ""
         try:
-            response = requests.post(self.api_url, headers=headers, json=data, timeout=30)
+            with stage(LLM):
+                response = requests.post(self.api_url, headers=headers, json=data, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -3,14 +3,21 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
 from .forms import ResumeUploadForm
 from .enhanced_analyzer import AdvancedAIAnalyzer
 from .enhanced_job_matcher import AdvancedJobMatcher
+from .progress import publish_progress
+from accounts.dashboard_summary import refresh_summary_on_commit
 
 # Dynamically load models to avoid circular imports
 Resume = apps.get_model('resumes', 'Resume')
 Job = apps.get_model('jobs', 'Job')
 
+# Publish a jobs_scored progress event after this many jobs
+PROGRESS_EVERY_N_JOBS = 50
+
 def resume_upload_view(request):
     """
     Legacy resume upload view - redirects to JWT-compatible version
@@ -61,46 +68,22 @@ def analyze_resume(resume_id):
         
         # Save the raw text first
         resume.save(update_fields=['raw_text', 'has_extraction_issues'])
-            
-        # Analyze the resume using the enhanced analyzer
-        analysis_results = analyzer.analyze_resume(resume.raw_text)
+        publish_progress(resume.id, 'extracted',
+                         characters=len(resume.raw_text),
+                         has_extraction_issues=resume.has_extraction_issues)
         
-        # Update resume with enhanced analysis results in a single transaction
-        with transaction.atomic():
-            resume.refresh_from_db()
-            
-            # Check if analysis detected errors
-            if analysis_results.get('error', False):
-                logger.warning(f"Analysis failed for resume {resume_id}: {analysis_results.get('error_message', 'Unknown error')}")
-                resume.status = 'failed'
-                resume.error_message = analysis_results.get('error_message', 'Analysis failed')
-                resume.error_type = analysis_results.get('error_type', 'analysis_error')
-                resume.suggestions = analysis_results.get('suggestions', [])
-                resume.analysis_completed_at = timezone.now()
-                resume.save()
-                return False
-            
-            # Store the new enhanced analysis format
-            resume.extracted_skills = analysis_results.get('extracted_skills', [])
-            resume.experience_level = analysis_results.get('experience_level', '')
-            resume.job_titles = analysis_results.get('job_titles', [])
-            resume.education = analysis_results.get('education', [])
-            resume.work_experience = analysis_results.get('work_experience', [])
-            
-            # Store the full enhanced analysis as JSON for the profile page
-            import json
-            resume.analysis_summary = json.dumps(analysis_results) if isinstance(analysis_results, dict) else analysis_results
-            resume.confidence_score = analysis_results.get('confidence_score', 0.0)
-            
-            # Update status based on extraction issues
-            if resume.has_extraction_issues:
-                resume.status = 'completed_with_warnings'
-                resume.warning_message = "Resume analysis completed, but some text may not have been extracted properly from the PDF."
-            else:
-                resume.status = 'completed'
-                
-            resume.analysis_completed_at = timezone.now()
-            resume.save()
+        two_phase = getattr(settings, 'RESUME_TWO_PHASE_ANALYSIS', True) and analyzer.llm_available()
+        
+        if two_phase:
+            # Phase 1: local analysis only, so matching is not held up by the LLM
+            analysis_results = analyzer.analyze_resume_local(resume.raw_text)
+        else:
+            # Analyze the resume using the enhanced analyzer
+            analysis_results = analyzer.analyze_resume(resume.raw_text)
+        
+        if not _apply_analysis_results(resume, analysis_results, provisional=two_phase):
+            publish_progress(resume.id, 'failed', status=resume.status, error_message=resume.error_message)
+            return False
         
         # Find matching jobs using enhanced matcher
         try:
@@ -109,6 +92,12 @@ def analyze_resume(resume_id):
             logger.error(f"Error finding matching jobs: {e}")
             # Don't fail the whole process if job matching fails
         
+        if two_phase:
+            # Phase 2: LLM enrichment in the background
+            start_resume_enrichment(resume.id)
+        else:
+            publish_progress(resume.id, 'completed', status=resume.status)
+        
         return True
     except Exception as e:
         logger.error(f"Resume analysis failed: {e}")
@@ -116,11 +105,284 @@ def analyze_resume(resume_id):
             resume.refresh_from_db()
             resume.status = 'failed'
             resume.save()
+        publish_progress(resume_id, 'failed', status='failed')
         raise e
 
-def find_matching_jobs(resume):
+def _apply_analysis_results(resume, analysis_results, provisional=False):
+    """
+    Write analysis results onto the resume.
+    Returns False if the analysis reported an error (resume is marked failed).
+    """
+    import json
+    import logging
+    from django.db import transaction
+    logger = logging.getLogger(__name__)
+    
+    # Update resume with enhanced analysis results in a single transaction
+    with transaction.atomic():
+        resume.refresh_from_db()
+        
+        # Check if analysis detected errors
+        if analysis_results.get('error', False):
+            logger.warning(f"Analysis failed for resume {resume.id}: {analysis_results.get('error_message', 'Unknown error')}")
+            resume.status = 'failed'
+            resume.error_message = analysis_results.get('error_message', 'Analysis failed')
+            resume.error_type = analysis_results.get('error_type', 'analysis_error')
+            resume.suggestions = analysis_results.get('suggestions', [])
+            resume.analysis_completed_at = timezone.now()
+            resume.save()
+            return False
+        
+        # Store the new enhanced analysis format
+        resume.extracted_skills = analysis_results.get('extracted_skills', [])
+        resume.experience_level = analysis_results.get('experience_level', '')
+        resume.job_titles = analysis_results.get('job_titles', [])
+        resume.education = analysis_results.get('education', [])
+        resume.work_experience = analysis_results.get('work_experience', [])
+        
+        # Store the full enhanced analysis as JSON for the profile page
+        resume.analysis_summary = json.dumps(analysis_results) if isinstance(analysis_results, dict) else analysis_results
+        resume.confidence_score = analysis_results.get('confidence_score', 0.0)
+        
+        # Update status based on extraction issues
+        if provisional:
+            resume.status = 'provisional'
+        elif resume.has_extraction_issues:
+            resume.status = 'completed_with_warnings'
+            resume.warning_message = "Resume analysis completed, but some text may not have been extracted properly from the PDF."
+        else:
+            resume.status = 'completed'
+            
+        resume.analysis_completed_at = timezone.now()
+        resume.save()
+    
+    publish_progress(resume.id, 'analyzed',
+                     status=resume.status,
+                     provisional=provisional,
+                     skills_count=len(resume.extracted_skills),
+                     experience_level=resume.experience_level)
+    return True
+
+def enrich_resume_analysis(resume_id):
+    """
+    Phase 2 of two-phase analysis: replace the provisional local analysis with
+    the LLM analysis and re-match only the jobs affected by changed skills.
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    try:
+        resume = Resume.objects.get(id=resume_id)
+    except Resume.DoesNotExist:
+        logger.error(f"Resume with ID {resume_id} not found")
+        return False
+    
+    if resume.status != 'provisional':
+        logger.info(f"Resume {resume_id} is no longer provisional, skipping enrichment")
+        return False
+    
+    provisional_skills = {skill.lower() for skill in resume.extracted_skills or []}
+    provisional_level = resume.experience_level
+    
+    try:
+        analysis_results = AdvancedAIAnalyzer().analyze_resume(resume.raw_text)
+    except Exception as e:
+        logger.error(f"LLM enrichment failed for resume {resume_id}: {e}")
+        analysis_results = None
+    
+    if not analysis_results or analysis_results.get('error', False):
+        # Keep the local analysis as the final result
+        _finalize_provisional_analysis(resume_id)
+        return False
+    
+    _apply_analysis_results(resume, analysis_results)
+    
+    enriched_skills = {skill.lower() for skill in resume.extracted_skills or []}
+    changed_skills = provisional_skills ^ enriched_skills
+    
+    try:
+        from .dispatcher import dispatch_resume_rematch
+        if resume.experience_level != provisional_level:
+            # Experience score applies to every job
+            dispatch_resume_rematch(resume_id)
+        elif changed_skills:
+            dispatch_resume_rematch(resume_id, sorted(changed_skills))
+        else:
+            logger.info(f"Skill set unchanged after enrichment for resume {resume_id}, keeping matches")
+    except Exception as e:
+        logger.error(f"Error re-matching jobs after enrichment: {e}")
+    
+    publish_progress(resume_id, 'enriched', skills_changed=len(changed_skills))
+    publish_progress(resume_id, 'completed', status=resume.status)
+    return True
+
+def _finalize_provisional_analysis(resume_id):
+    """Promote a provisional analysis to final when LLM enrichment is not available"""
+    from django.db import transaction
+    
+    with transaction.atomic():
+        resume = Resume.objects.select_for_update().get(id=resume_id)
+        if resume.status != 'provisional':
+            return False
+        resume.status = 'completed_with_warnings' if resume.has_extraction_issues else 'completed'
+        resume.save(update_fields=['status', 'updated_at'])
+    publish_progress(resume_id, 'completed', status=resume.status)
+    return True
+
+def finalize_stale_provisional_analyses(resumes=None):
+    """
+    Promote provisional analyses older than RESUME_PROVISIONAL_DEADLINE whose
+    enrichment was lost or is still running; returns the number promoted.
+    """
+    import logging
+    from datetime import timedelta
+    logger = logging.getLogger(__name__)
+    
+    deadline = timezone.now() - timedelta(seconds=settings.RESUME_PROVISIONAL_DEADLINE)
+    stale = (Resume.objects.all() if resumes is None else resumes).filter(
+        status='provisional', analysis_completed_at__lt=deadline
+    )
+    promoted = 0
+    for resume_id in stale.values_list('id', flat=True):
+        try:
+            promoted += _finalize_provisional_analysis(resume_id)
+        except Exception as e:
+            logger.error(f"Could not finalize provisional analysis of resume {resume_id}: {e}")
+    if promoted:
+        logger.info(f"Promoted {promoted} provisional analyses past their enrichment deadline")
+    return promoted
+
+def rematch_resume_jobs(resume_id, changed_skills=None):
+    """
+    Re-run matching for a resume: all active jobs, or only the jobs
+    mentioning changed_skills when given.
+    """
+    resume = Resume.objects.get(id=resume_id)
+    if changed_skills:
+        find_matching_jobs(resume, jobs=_jobs_mentioning_skills(changed_skills))
+    else:
+        find_matching_jobs(resume)
+
+def start_resume_enrichment(resume_id):
+    """
+    Queue LLM enrichment on the analysis dispatcher.
+    If the queue is full the provisional analysis becomes final.
+    """
+    import logging
+    from .dispatcher import AnalysisQueueFull, dispatch_resume_enrichment
+    logger = logging.getLogger(__name__)
+    
+    try:
+        dispatch_resume_enrichment(resume_id)
+    except AnalysisQueueFull as e:
+        logger.warning(f"Skipping LLM enrichment for resume {resume_id}: {e}")
+        _finalize_provisional_analysis(resume_id)
+
+def _skill_spellings(skill):
+    """
+    Every spelling JobMatcher's skill regex accepts: each space between words
+    may be a space, a hyphen or nothing ("machine learning", "machine-learning").
+    """
+    words = skill.split()
+    spellings = [words[0]] if words else []
+    for word in words[1:]:
+        spellings = [spelling + separator + word for spelling in spellings for separator in (' ', '-', '')]
+    return spellings
+
+def _jobs_mentioning_skills(skills):
+    """
+    Active jobs linked to any of the given skills (JobSkill, by canonical
+    name) or whose text mentions one in any spelling JobMatcher accepts,
+    through the full-text index (jobs.search); the text lookup covers jobs
+    whose links are not synced yet. A superset of the jobs whose match score
+    can change with these skills.
+    """
+    from jobs.search import ANY, filter_jobs
+    from jobs.skills import canonical_skill_name
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    
+    names = {canonical_skill_name(skill) for skill in skills}
+    spellings = [spelling for skill in skills for spelling in _skill_spellings(skill)]
+    linked = JobSkill.objects.filter(skill__name__in=names).values('job_id')
+    mentioned = filter_jobs(Job.objects.all(), spellings, mode=ANY).values('id')
+    return Job.objects.filter(Q(id__in=linked) | Q(id__in=mentioned), is_active=True)
+
+def generate_job_matches(resume_id):
+    """
+    Generate enhanced job matches for a resume that has none yet.
+    Runs in the background so the job list page does not wait on it.
+    """
+    import asyncio
+    import logging
+    logger = logging.getLogger(__name__)
+    JobMatch = apps.get_model('jobs', 'JobMatch')
+    
+    resume = Resume.objects.select_related('user').get(id=resume_id)
+    enhanced_matcher = AdvancedJobMatcher(user=resume.user, resume=resume)
+    
+    def report(jobs_scored, total_jobs):
+        publish_progress(resume_id, 'jobs_scored', jobs_scored=jobs_scored, total_jobs=total_jobs)
+    
+    try:
+        enhanced_matches = asyncio.run(
+            enhanced_matcher.generate_advanced_job_matches(limit=20, progress_callback=report)
+        )
+        
+        # Create JobMatch objects from enhanced matches
+        matches_created = 0
+        for match_data in enhanced_matches:
+            if match_data.get('job'):
+                job = match_data['job']
+                _, created = JobMatch.objects.get_or_create(
+                    job=job,
+                    resume=resume,
+                    defaults={
+                        'user': resume.user,
+                        'match_score': match_data.get('match_score', 0),
+                        'match_details': match_data.get('match_details', {}),
+                        'matching_skills': match_data.get('matching_skills', []),
+                        'missing_skills': match_data.get('missing_skills', [])
+                    }
+                )
+                matches_created += int(created)
+        refresh_summary_on_commit(resume.user_id)
+        
+        publish_progress(resume_id, 'matches_saved',
+                         matches_created=matches_created,
+                         total_matches=JobMatch.objects.filter(resume=resume).count())
+    except Exception as e:
+        logger.error(f"Could not generate enhanced matches for resume {resume_id}: {e}")
+        publish_progress(resume_id, 'failed', error_message=str(e))
+
+def _job_match_data(job):
+    """A stored Job in the HH API item format JobMatcher scores"""
+    return {
+        'name': job.title,
+        'snippet': {
+            'requirement': job.requirements or '',
+            'responsibility': job.responsibilities or ''
+        },
+        'description': job.description,
+        'employer': {
+            'name': job.company_name
+        },
+        'salary': {
+            'from': job.salary_from,
+            'to': job.salary_to,
+            'currency': job.salary_currency
+        },
+        'area': {
+            'name': job.location
+        },
+        'experience': {
+            'name': job.experience_required or ''
+        }
+    }
+
+def find_matching_jobs(resume, jobs=None):
     """
     Find jobs matching the resume.
+    Pass a jobs queryset to re-match only that subset.
     In a production app, this would be a Celery task.
     """
     import logging
@@ -131,10 +393,11 @@ def find_matching_jobs(resume):
     
     try:
         # Get active jobs
-        active_jobs = Job.objects.filter(is_active=True)
+        active_jobs = jobs if jobs is not None else Job.objects.filter(is_active=True)
         
         if not active_jobs.exists():
             logger.info("No active jobs found in database")
+            publish_progress(resume.id, 'matches_saved', matches_created=0, total_matches=0)
             return
         
         # Initialize job matcher with user and resume
@@ -143,34 +406,23 @@ def find_matching_jobs(resume):
         # Dynamically import JobMatch model to avoid circular imports
         JobMatch = apps.get_model('jobs', 'JobMatch')
         
+        # Prepare job data in the format expected by JobMatcher
+        jobs_with_data = [(job, _job_match_data(job)) for job in active_jobs]
+        
+        # Load memoized scores for unchanged (resume, job) pairs in one query
+        matcher.score_memo.prefetch(
+            matcher.resume_score_hash(),
+            [matcher.job_score_hash(job_data) for _, job_data in jobs_with_data]
+        )
+        
         # Match jobs
         matches_created = 0
-        for job in active_jobs:
+        jobs_scored = 0
+        for job, job_data in jobs_with_data:
+            jobs_scored += 1
+            if jobs_scored % PROGRESS_EVERY_N_JOBS == 0:
+                publish_progress(resume.id, 'jobs_scored', jobs_scored=jobs_scored)
             try:
-                # Prepare job data in the format expected by JobMatcher
-                job_data = {
-                    'name': job.title,
-                    'snippet': {
-                        'requirement': job.requirements or '',
-                        'responsibility': job.responsibilities or ''
-                    },
-                    'description': job.description,
-                    'employer': {
-                        'name': job.company_name
-                    },
-                    'salary': {
-                        'from': job.salary_from,
-                        'to': job.salary_to,
-                        'currency': job.salary_currency
-                    },
-                    'area': {
-                        'name': job.location
-                    },
-                    'experience': {
-                        'name': job.experience_required or ''
-                    }
-                }
-                
                 # Calculate match score using the JobMatcher
                 match_score, match_details = matcher.calculate_match_score(job_data)
                 
@@ -186,7 +438,8 @@ def find_matching_jobs(resume):
                                 'match_score': match_score,
                                 'matching_skills': match_details.get('matching_skills', []),
                                 'missing_skills': match_details.get('missing_skills', []),
-                                'match_details': match_details
+                                'match_details': match_details,
+                                'analysis_version': matcher.SCORER_VERSION
                             }
                         )
                         
@@ -195,12 +448,24 @@ def find_matching_jobs(resume):
                             logger.debug(f"Created job match: {job.title} ({match_score:.1f}%)")
                         else:
                             logger.debug(f"Updated job match: {job.title} ({match_score:.1f}%)")
+                else:
+                    # Drop this scorer's match left over from an earlier analysis;
+                    # rows written by other scorers (AdvancedJobMatcher) stay
+                    JobMatch.objects.filter(
+                        job=job, resume=resume, analysis_version=matcher.SCORER_VERSION
+                    ).delete()
                             
             except Exception as e:
                 logger.error(f"Error matching job {job.id} ({job.title}): {e}")
                 continue
         
+        matcher.score_memo.flush()
+        refresh_summary_on_commit(resume.user_id)
         logger.info(f"Job matching completed. Created {matches_created} new matches for resume {resume.id}")
+        publish_progress(resume.id, 'jobs_scored', jobs_scored=jobs_scored)
+        publish_progress(resume.id, 'matches_saved',
+                         matches_created=matches_created,
+                         total_matches=JobMatch.objects.filter(resume=resume).count())
         
     except Exception as e:
         logger.error(f"Error in find_matching_jobs for resume {resume.id}: {e}")
@@ -0,0 +1,93 @@
+// Resume progress stream (Server-Sent Events)
+// Uses fetch() instead of EventSource so the JWT can go in the Authorization header.
+// Returns false if the browser cannot stream responses, so callers can fall back to polling.
+function progressHeaders(accept) {
+    const headers = { 'Accept': accept };
+    const token = localStorage.getItem('smart_resume_access_token');
+    if (token) {
+        headers['Authorization'] = `Bearer ${token}`;
+    }
+    return headers;
+}
+
+function streamResumeProgress(resumeId, options) {
+    options = options || {};
+    if (!window.ReadableStream || !window.TextDecoder) {
+        return false;
+    }
+
+    const params = new URLSearchParams();
+    if (options.since) params.set('since', options.since);
+    if (options.until) params.set('until', options.until);
+
+    const headers = progressHeaders('text/event-stream');
+
+    const handleBlock = (block) => {
+        let stage = 'message';
+        let data = '';
+        block.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                stage = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                data += line.slice(5).trim();
+            }
+        });
+        if (data && options.onEvent) {
+            options.onEvent(stage, JSON.parse(data));
+        }
+    };
+
+    fetch(`/api/resume/progress/${resumeId}/?${params.toString()}`, {
+        headers: headers,
+        credentials: 'same-origin'
+    }).then(async response => {
+        if (!response.ok || !response.body) {
+            throw new Error(`Progress stream failed (${response.status})`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                handleBlock(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+            }
+        }
+
+        if (options.onClose) options.onClose();
+    }).catch(error => {
+        console.error('❌ Progress stream error:', error);
+        if (options.onError) options.onError(error);
+    });
+
+    return true;
+}
+
+// Polling fallback, for browsers that cannot stream and servers that cannot share progress.
+// Calls options.onStatus with each resume status response until it returns true.
+function pollResumeStatus(resumeId, options) {
+    const interval = options.interval || 3000;
+
+    const poll = () => {
+        fetch(`/api/resume/status/${resumeId}/`, {
+            headers: progressHeaders('application/json'),
+            credentials: 'same-origin'
+        }).then(response => response.json()).then(status => {
+            if (!options.onStatus(status)) {
+                setTimeout(poll, interval);
+            }
+        }).catch(error => {
+            console.error('❌ Status poll error:', error);
+            setTimeout(poll, interval);
+        });
+    };
+
+    poll();
+}